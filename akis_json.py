@@ -0,0 +1,157 @@
+"""Akışlı (personel personel) JSON okuma ve yazma
+
+puantaj_kayitlari.json dosyası {calisan_id: [ay kaydı, ...], ...} yapısındadır.
+Dosya tek seferde json.load ile okunmak yerine parça parça okunur ve her
+personel ayrı ayrı çözülür; bellekte aynı anda yalnızca bir personelin
+kayıtları ve okuma tamponu bulunur.
+
+Yazıcı iki biçim üretir. Sıkışık biçimde her personel girintisiz olarak kendi
+satırındadır; okuyucu bu dosyaları satır satır, serilestirme katmanının hızlı
+çözücüsüyle okur:
+
+    {
+    "100":[{"id":"100",...},...],
+    "200":[...]
+    }
+
+Girintili biçim json.dump(indent=2) ile aynıdır ve dışa aktarım içindir; bu
+ve elle düzenlenmiş diğer dosyalar genel (raw_decode) okuyucuyla okunur.
+"""
+import json
+
+import olcum
+import serilestirme
+from guvenli_yazim import atomik_yaz
+
+OKUMA_PARCASI = 1 << 20  # Dosyadan tek seferde okunan karakter sayısı
+
+_BOSLUK = " \t\n\r"
+_cozucu = json.JSONDecoder()
+
+
+class _Okuyucu:
+    """Dosya üzerinde tamponlu karakter okuyucu"""
+
+    def __init__(self, dosya, parca_boyutu):
+        self.dosya = dosya
+        self.parca_boyutu = parca_boyutu
+        self.tampon = ""
+        self.konum = 0
+        self.bitti = False
+
+    def doldur(self, en_az=0):
+        """Tampona yeni parça ekle; dosya bittiyse False döndür"""
+        if self.bitti:
+            return False
+        parca = self.dosya.read(max(self.parca_boyutu, en_az))
+        if not parca:
+            self.bitti = True
+            return False
+        # Tüketilmiş kısım atılır; tampon bir personelin kayıtlarından büyümez
+        self.tampon = self.tampon[self.konum:] + parca
+        self.konum = 0
+        return True
+
+    def karakter(self):
+        """Boşlukları atlayıp sıradaki karakteri getir (tüketmeden); dosya sonunda ''"""
+        while True:
+            while self.konum < len(self.tampon) and self.tampon[self.konum] in _BOSLUK:
+                self.konum += 1
+            if self.konum < len(self.tampon):
+                return self.tampon[self.konum]
+            if not self.doldur():
+                return ""
+
+    def bekle(self, beklenen):
+        """Sıradaki karakter beklenen değilse hata ver, ise tüket"""
+        karakter = self.karakter()
+        if karakter != beklenen:
+            raise ValueError(f"Geçersiz JSON: '{beklenen}' bekleniyordu, '{karakter}' bulundu")
+        self.konum += 1
+
+    def deger(self):
+        """Sıradaki JSON değerini çöz; tampondaki veri yetmezse yeni parça okuyup tekrar dene"""
+        self.karakter()
+        while True:
+            try:
+                deger, son = _cozucu.raw_decode(self.tampon, self.konum)
+            except json.JSONDecodeError:
+                # Tampon ikiye katlanarak büyütülür; uzun değerler tekrar tekrar çözülmez
+                if not self.doldur(len(self.tampon) - self.konum):
+                    raise
+                continue
+            # Tamponun sonunda biten sayı gibi değerler yarım olabilir
+            if son == len(self.tampon) and self.doldur():
+                continue
+            self.konum = son
+            return deger
+
+
+def _satir_satir_oku(f, satir):
+    """Sıkışık biçimdeki dosyayı (ilk personel satırından itibaren) oku"""
+    while satir:
+        satir = satir.rstrip(b"\r\n")
+        if satir == b"}":
+            return
+        # '"id":[...],' satırı tek elemanlı bir nesne olarak çözülür
+        personel = serilestirme.loads(b"{" + (satir[:-1] if satir.endswith(b",") else satir) + b"}")
+        yield from personel.items()
+        satir = f.readline()
+    raise ValueError("Geçersiz JSON: dosya yarım kalmış ('}' bulunamadı)")
+
+
+def oku(dosya_yolu, parca_boyutu=OKUMA_PARCASI):
+    """Dosyadaki (calisan_id, kayitlar) çiftlerini sırayla üret"""
+    olcum.okundu(dosya_yolu)
+    with open(dosya_yolu, "rb") as f:
+        ilk = f.readline()
+        ikinci = f.readline()
+        if ilk.rstrip(b"\r\n") == b"{" and ikinci.startswith(b'"'):
+            yield from _satir_satir_oku(f, ikinci)
+            return
+
+    with open(dosya_yolu, "r", encoding="utf-8") as f:
+        okuyucu = _Okuyucu(f, parca_boyutu)
+        okuyucu.bekle("{")
+        if okuyucu.karakter() == "}":
+            return
+        while True:
+            calisan_id = okuyucu.deger()
+            if not isinstance(calisan_id, str):
+                raise ValueError("Geçersiz JSON: personel anahtarı metin olmalı")
+            okuyucu.bekle(":")
+            yield calisan_id, okuyucu.deger()
+
+            if okuyucu.karakter() == "}":
+                return
+            okuyucu.bekle(",")
+
+
+def yaz(ogeler, dosya_yolu, default=None, girintili=False):
+    """(calisan_id, kayitlar) çiftlerini dosyaya yaz
+
+    Varsayılan sıkışık biçimdir; girintili ise json.dump(indent=2) ile aynı
+    çıktı üretilir. Yazım geçici dosyaya yapılır, fsync edilir ve tamamlanınca
+    asıl dosyanın yerine konur; ogeler aynı dosyadan okunan bir akış olabilir.
+    Yazılan personel sayısını döndürür.
+    """
+    adet = 0
+    with atomik_yaz(dosya_yolu, "wb") as f:
+        for calisan_id, kayitlar in ogeler:
+            anahtar = serilestirme.dumps(calisan_id)
+            if girintili:
+                f.write(b",\n  " if adet else b"{\n  ")
+                f.write(anahtar)
+                f.write(b": ")
+                f.write(serilestirme.dumps(kayitlar, girintili=True, default=default).replace(b"\n", b"\n  "))
+            else:
+                f.write(b",\n" if adet else b"{\n")
+                f.write(anahtar)
+                f.write(b":")
+                f.write(serilestirme.dumps(kayitlar, default=default))
+            adet += 1
+        if not adet:
+            f.write(b"{}")
+        else:
+            f.write(b"\n}")
+    return adet
@@ -0,0 +1,5 @@
+"""Performans ölçümleri
+
+Betikler doğrudan çalıştırılır (python benchmarks/sicak_yollar.py); ortak
+sentetik veri üreticisi sentetik modülündedir.
+"""
@@ -0,0 +1,170 @@
+"""HTTP servisinin yük altında gecikme ve verimini ölç
+
+Geçici bir klasörde sentetik personel verisiyle servisi başlatır (veya --url
+ile çalışan bir servise bağlanır), eşzamanlı istemcilerle puantaj girişi,
+kayıt görüntüleme ve rapor isteklerini karışık gönderir; istemci tarafında
+ölçülen gecikme yüzdeliklerini ve saniyedeki istek sayısını yazdırır.
+
+Kullanım:
+    python benchmarks/http_yuk_testi.py [--personel 500] [--istemci 16] [--istek 5000] [--isci 8]
+                                        [--grup-ms 10] [--bicim json|sqlite] [--url http://...] [--json]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_servisi  # noqa: E402
+import maas  # noqa: E402
+
+AY = "2025-03"
+# İstek karışımı: (tür, ağırlık)
+KARISIM = (("puantaj", 50), ("personel", 35), ("rapor", 10), ("metrikler", 5))
+
+
+def sentetik_veri(personel_sayisi, tohum=42):
+    """AY ayı açık, puantajı boş personel kayıtları"""
+    rastgele = random.Random(tohum)
+    return {str(calisan): [{
+        "id": str(calisan),
+        "ad_soyad": f"Personel {calisan}",
+        "ay": AY,
+        "brut_maas": rastgele.randint(17000, 120000),
+        "ay_gun": maas.get_month_days(AY),
+        "puantaj": [],
+        "hesaplama": {},
+        "durum": "KAPATILMAMIŞ",
+        "aktif": True,
+        "isten_cikma_tarihi": None,
+    }] for calisan in range(personel_sayisi)}
+
+
+def istemci(adres, istekler, gecikmeler, hatalar):
+    """İstekleri tek bağlantı üzerinden sırayla gönder"""
+    baglanti = http.client.HTTPConnection(*adres, timeout=60)
+    for yontem, yol, govde in istekler:
+        baslangic = time.perf_counter()
+        try:
+            baglanti.request(yontem, yol, body=json.dumps(govde) if govde is not None else None,
+                             headers={"Content-Type": "application/json"})
+            yanit = baglanti.getresponse()
+            yanit.read()
+            basarili = yanit.status < 400
+        except (OSError, http.client.HTTPException):
+            baglanti.close()
+            baglanti = http.client.HTTPConnection(*adres, timeout=60)
+            basarili = False
+        gecikmeler.setdefault(yontem + " " + yol.split("/")[1], []).append(time.perf_counter() - baslangic)
+        hatalar[0] += not basarili
+    baglanti.close()
+
+
+def istekleri_olustur(istek_sayisi, personel_sayisi, tohum=42):
+    """Tekrarlanabilir istek listesi; puantaj girişleri her personelin sıradaki gününe yapılır"""
+    rastgele = random.Random(tohum)
+    siradaki_gun = {}
+    ay_gun = maas.get_month_days(AY)
+    turler, agirliklar = zip(*KARISIM)
+    istekler = []
+    for tur in rastgele.choices(turler, agirliklar, k=istek_sayisi):
+        calisan_id = str(rastgele.randrange(personel_sayisi))
+        if tur == "puantaj":
+            gun = siradaki_gun.get(calisan_id, 1)
+            siradaki_gun[calisan_id] = gun % ay_gun + 1
+            istekler.append(("POST", "/puantaj", {"id": calisan_id, "ay": AY, "gun": gun, "kod": "C"}))
+        elif tur == "personel":
+            istekler.append(("GET", f"/personel/{calisan_id}?ay={AY}", None))
+        elif tur == "rapor":
+            istekler.append(("GET", f"/rapor/{AY}", None))
+        else:
+            istekler.append(("GET", "/metrikler", None))
+    return istekler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--personel", type=int, default=500)
+    parser.add_argument("--istemci", type=int, default=16, help="eşzamanlı istemci sayısı")
+    parser.add_argument("--istek", type=int, default=5000, help="toplam istek sayısı")
+    parser.add_argument("--isci", type=int, default=8, help="servisin iş parçacığı sayısı")
+    parser.add_argument("--grup-ms", type=float, default=10, help="günlük grup kaydı penceresi")
+    parser.add_argument("--bicim", choices=("json", "sqlite"), default="json", help="depolama biçimi")
+    parser.add_argument("--url", help="çalışan servisin adresi (verilmezse geçici servis başlatılır)")
+    parser.add_argument("--json", action="store_true", help="sonucu JSON olarak yazdır")
+    args = parser.parse_args()
+
+    sunucu = None
+    if args.url:
+        url = urlsplit(args.url)
+        adres = (url.hostname, url.port or 80)
+    else:
+        os.chdir(tempfile.mkdtemp(prefix="maas_yuk_"))
+        maas.STORAGE_FORMAT = args.bicim
+        maas.get_depo().hepsini_yaz(sentetik_veri(args.personel))
+        sunucu = http_servisi.sunucu_olustur(port=0, isci_sayisi=args.isci, grup_ms=args.grup_ms)
+        threading.Thread(target=sunucu.serve_forever, daemon=True).start()
+        adres = sunucu.server_address[:2]
+
+    istekler = istekleri_olustur(args.istek, args.personel)
+    gruplar = [istekler[i::args.istemci] for i in range(args.istemci)]
+    gecikmeler = [{} for _ in gruplar]
+    hatalar = [[0] for _ in gruplar]
+    iplikler = [threading.Thread(target=istemci, args=(adres, grup, gecikme, hata))
+                for grup, gecikme, hata in zip(gruplar, gecikmeler, hatalar)]
+
+    baslangic = time.perf_counter()
+    for iplik in iplikler:
+        iplik.start()
+    for iplik in iplikler:
+        iplik.join()
+    sure = time.perf_counter() - baslangic
+
+    birlesik = {}
+    for gecikme in gecikmeler:
+        for tur, olcumler in gecikme.items():
+            birlesik.setdefault(tur, []).extend(olcumler)
+    tumu = sorted(olcum for olcumler in birlesik.values() for olcum in olcumler)
+
+    def ozet(olcumler):
+        olcumler = sorted(olcumler)
+        return {"adet": len(olcumler),
+                **{f"p{int(oran * 100)}_ms": round(http_servisi.yuzdelik(olcumler, oran) * 1000, 3)
+                   for oran in (0.5, 0.95, 0.99)},
+                "maks_ms": round(olcumler[-1] * 1000, 3)}
+
+    sonuc = {
+        "istek": len(tumu),
+        "hata": sum(hata[0] for hata in hatalar),
+        "sure_sn": round(sure, 3),
+        "istek_per_sn": round(len(tumu) / sure, 2),
+        "istemci": args.istemci,
+        "isci": args.isci,
+        "grup_ms": args.grup_ms,
+        "genel": ozet(tumu),
+        "turler": {tur: ozet(olcumler) for tur, olcumler in sorted(birlesik.items())},
+    }
+    if sunucu is not None:
+        sunucu.shutdown()
+        sunucu.server_close()
+
+    if args.json:
+        print(json.dumps(sonuc, ensure_ascii=False, indent=2))
+        return
+    print(f"{sonuc['istek']} istek, {sonuc['hata']} hata, {sonuc['sure_sn']} sn, "
+          f"{sonuc['istek_per_sn']} istek/sn ({args.istemci} istemci, {args.isci} işçi, grup {args.grup_ms:g} ms)")
+    print(f"{'tür':<16}{'adet':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'maks ms':>10}")
+    for tur, olcum in [("genel", sonuc["genel"])] + list(sonuc["turler"].items()):
+        print(f"{tur:<16}{olcum['adet']:>8}{olcum['p50_ms']:>10.2f}{olcum['p95_ms']:>10.2f}"
+              f"{olcum['p99_ms']:>10.2f}{olcum['maks_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
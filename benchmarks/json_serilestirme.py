@@ -0,0 +1,96 @@
+"""JSON kütüphanelerinin ve biçimlerinin kayıt/yükleme süresini ve dosya boyutunu karşılaştır
+
+Her boyut (personel-ay kaydı sayısı) için kurulu her kütüphaneyle (orjson,
+msgspec, json) ana dosya girintili ve sıkışık biçimde akis_json ile yazılıp
+tekrar okunur.
+
+Kullanım:
+    python benchmarks/json_serilestirme.py [--boyut 1000 10000 100000] [--tekrar 3] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import akis_json  # noqa: E402
+import hesaplama  # noqa: E402
+import serilestirme  # noqa: E402
+from paralel_hesaplama import sentetik_kayitlar  # noqa: E402
+
+AY_SAYISI = 12
+
+
+def sentetik_veri(kayit_sayisi):
+    """kayit_sayisi personel-ay kaydından oluşan, kapatılmış ve hesaplanmış veri"""
+    kayitlar = sentetik_kayitlar(max(1, kayit_sayisi // AY_SAYISI), AY_SAYISI)[:kayit_sayisi]
+    data = {}
+    for kayit, sonuc in zip(kayitlar, hesaplama.toplu_hesapla(kayitlar)):
+        kayit.update(ad_soyad=f"Personel {kayit['id']}", hesaplama=sonuc, durum="KAPATILDI", aktif=True,
+                     kapatma_tarihi="2021-01-05 09:00:00", surum=1)
+        data.setdefault(kayit["id"], []).append(kayit)
+    return data
+
+
+def olc(fonksiyon, tekrar):
+    """En iyi süre (sn)"""
+    en_iyi = float("inf")
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        fonksiyon()
+        en_iyi = min(en_iyi, time.perf_counter() - baslangic)
+    return en_iyi
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--boyut", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="personel-ay kaydı sayıları")
+    parser.add_argument("--tekrar", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="sonucu JSON olarak yazdır")
+    args = parser.parse_args()
+
+    kutuphaneler = []
+    for ad in serilestirme.KUTUPHANELER:
+        try:
+            serilestirme.kutuphane_sec(ad)
+            kutuphaneler.append(ad)
+        except ImportError:
+            pass
+
+    sonuclar = []
+    dosya = os.path.join(tempfile.mkdtemp(prefix="maas_json_"), "veri.json")
+    for boyut in args.boyut:
+        data = sentetik_veri(boyut)
+        for ad in kutuphaneler:
+            serilestirme.kutuphane_sec(ad)
+            for girintili in (True, False):
+                kayit_suresi = olc(lambda: akis_json.yaz(data.items(), dosya, girintili=girintili), args.tekrar)
+                yukleme_suresi = olc(lambda: dict(akis_json.oku(dosya)), args.tekrar)
+                if dict(akis_json.oku(dosya)) != data:
+                    print(f"HATA: {ad} ({'girintili' if girintili else 'sıkışık'}) okunan veri yazılandan farklı!")
+                    sys.exit(1)
+                sonuclar.append({
+                    "kayit": boyut,
+                    "kutuphane": ad,
+                    "bicim": "girintili" if girintili else "sikisik",
+                    "kayit_sn": round(kayit_suresi, 4),
+                    "yukleme_sn": round(yukleme_suresi, 4),
+                    "boyut_bayt": os.path.getsize(dosya),
+                })
+    os.remove(dosya)
+
+    if args.json:
+        print(json.dumps(sonuclar, ensure_ascii=False, indent=2))
+        return
+    print(f"{'kayıt':>8}  {'kütüphane':<10}{'biçim':<11}{'kayıt sn':>10}{'yükleme sn':>12}{'boyut MB':>10}")
+    for s in sonuclar:
+        print(f"{s['kayit']:>8}  {s['kutuphane']:<10}{s['bicim']:<11}{s['kayit_sn']:>10.3f}"
+              f"{s['yukleme_sn']:>12.3f}{s['boyut_bayt'] / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Paralel maaş hesaplamasının çekirdek sayısına göre ölçeklenmesini ölç
+
+Kullanım:
+    python benchmarks/paralel_hesaplama.py [--personel 20000] [--ay 12] [--isci 8] [--kolon]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hesaplama  # noqa: E402
+import kolon_depo  # noqa: E402
+
+
+def sentetik_kayitlar(personel_sayisi, ay_sayisi, kolon=False, tohum=42):
+    """Rastgele ama tekrarlanabilir kapatılmış ay kayıtları üret"""
+    rastgele = random.Random(tohum)
+    kayitlar = []
+    for calisan in range(personel_sayisi):
+        brut_maas = rastgele.randint(17000, 120000)
+        for ay in range(ay_sayisi):
+            yil, ay_no = 2020 + ay // 12, ay % 12 + 1
+            ay_gun = 28 if ay_no == 2 else (30 if ay_no in (4, 6, 9, 11) else 31)
+            puantaj = []
+            for gun in range(1, ay_gun + 1):
+                kod = rastgele.choices("CIDYSR", weights=(80, 6, 2, 4, 4, 4))[0]
+                puantaj.append({'gun': gun, 'durum': kod, 'saat': rastgele.randint(1, 12) if kod == 'S' else 0})
+            kayitlar.append({
+                "id": str(calisan),
+                "ay": f"{yil}-{ay_no:02d}",
+                "brut_maas": brut_maas,
+                "ay_gun": ay_gun,
+                "puantaj": kolon_depo.PuantajDizisi(puantaj) if kolon else puantaj,
+                "isten_cikma_tarihi": None,
+            })
+    return kayitlar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--personel", type=int, default=20000)
+    parser.add_argument("--ay", type=int, default=12)
+    parser.add_argument("--isci", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--kolon", action="store_true", help="puantajı kolon biçiminde tut")
+    args = parser.parse_args()
+
+    kayitlar = sentetik_kayitlar(args.personel, args.ay, args.kolon)
+    print(f"{len(kayitlar)} ay kaydı, {os.cpu_count()} çekirdek")
+
+    baslangic = time.perf_counter()
+    beklenen = [hesaplama.hesapla(kayit) for kayit in kayitlar]
+    sirali_sure = time.perf_counter() - baslangic
+    print(f"{'mod':<14}{'süre (sn)':>12}{'hızlanma':>10}")
+    print(f"{'sıralı':<14}{sirali_sure:>12.3f}{1:>10.2f}")
+
+    isci = 1
+    while True:
+        baslangic = time.perf_counter()
+        sonuc = hesaplama.paralel_hesapla(kayitlar, isci_sayisi=isci)
+        sure = time.perf_counter() - baslangic
+        if sonuc != beklenen:
+            print(f"HATA: {isci} işçi ile sonuçlar sıralı hesaplamadan farklı!")
+            sys.exit(1)
+        print(f"{f'{isci} işçi':<14}{sure:>12.3f}{sirali_sure / sure:>10.2f}")
+        if isci >= args.isci:
+            break
+        isci = min(isci * 2, args.isci)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Tekrarlanabilir sentetik puantaj verisi
+
+personel_sayisi x ay_sayisi boyutunda, gerçeğe yakın bir veri seti üretir:
+
+- Hafta sonları politikadaki kodla (C), resmi tatiller R ile, iş günleri
+  personelin profiline göre ağırlıklı kodlarla (çoğunlukla C; I, Y, S, D) doldurulur.
+- Personelin bir kısmı aralığın ortasında işe başlar, bir kısmı işten çıkar;
+  çıkış ayında puantaj çıkış gününde biter, sonraki aylarda kayıt yoktur.
+- Son ay hariç tüm aylar kapatılmış ve hesaplanmıştır. Son ay açıktır;
+  personelin çoğunun puantajı tamdır (kapatılabilir), kalanınki ayın
+  ortasında kesilir.
+
+Aynı parametreler ve tohum her zaman aynı veriyi üretir.
+
+    data = sentetik.veri_seti(1000, 12)
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hesaplama  # noqa: E402
+import takvim  # noqa: E402
+from raporlama import ay_araligi  # noqa: E402
+
+BAS_AY = "2024-01"
+ISE_GIRIS_ORANI = 0.10  # Aralığın ortasında işe başlayanlar
+CIKIS_ORANI = 0.08  # Aralık içinde işten çıkanlar
+EKSIK_ORANI = 0.30  # Son (açık) ayda puantajı yarım kalanlar
+
+# İş günü kodları ve personel profillerine göre ağırlıkları (C, I, Y, S, D)
+IS_GUNU_KODLARI = "CIYSD"
+PROFILLER = (
+    ((94, 2, 1, 2, 1), 70),  # düzenli
+    ((84, 6, 3, 5, 2), 22),  # ara sıra izinli / saatlik kesintili
+    ((70, 10, 5, 7, 8), 8),  # sık devamsız
+)
+
+
+def _puantaj(rastgele, ay_takvimi, agirliklar, son):
+    """1..son günlerinin puantajı"""
+    puantaj = []
+    for gun in range(1, son + 1):
+        kod = ay_takvimi.doldurma_kodlari[gun - 1]
+        if kod is None:
+            kod = rastgele.choices(IS_GUNU_KODLARI, weights=agirliklar)[0]
+        puantaj.append({'gun': gun, 'durum': kod, 'saat': rastgele.randint(1, 4) if kod == 'S' else 0})
+    return puantaj
+
+
+def veri_seti(personel_sayisi, ay_sayisi, tohum=42, bas_ay=BAS_AY):
+    """{calisan_id: [ay kaydı, ...]} biçiminde veri seti"""
+    rastgele = random.Random(tohum)
+    aylar = ay_araligi(bas_ay, _ay_ekle(bas_ay, ay_sayisi - 1))
+    profiller, profil_agirliklari = zip(*PROFILLER)
+
+    data = {}
+    kapatilacaklar = []
+    for numara in range(personel_sayisi):
+        calisan_id = str(1000 + numara)
+        agirliklar = rastgele.choices(profiller, profil_agirliklari)[0]
+        brut_maas = rastgele.randint(17000, 120000)
+        ilk = rastgele.randrange(ay_sayisi) if rastgele.random() < ISE_GIRIS_ORANI else 0
+        cikis = None  # (ay sırası, gün)
+        if rastgele.random() < CIKIS_ORANI:
+            cikis_sirasi = rastgele.randrange(ilk, ay_sayisi)
+            cikis = cikis_sirasi, rastgele.randint(1, takvim.ay_gun_sayisi(aylar[cikis_sirasi]))
+        isten_cikma_tarihi = f"{aylar[cikis[0]]}-{cikis[1]:02d}" if cikis else None
+
+        kayitlar = []
+        for sira in range(ilk, cikis[0] + 1 if cikis else ay_sayisi):
+            ay = aylar[sira]
+            ay_takvimi = takvim.ay_takvimi(ay)
+            acik = sira == ay_sayisi - 1
+            son = ay_takvimi.gun_sayisi
+            if cikis and sira == cikis[0]:
+                son = cikis[1]
+            elif acik and rastgele.random() < EKSIK_ORANI:
+                son = rastgele.randint(1, son - 1)
+            kayit = {
+                "id": calisan_id,
+                "ad_soyad": f"Personel {calisan_id}",
+                "ay": ay,
+                "brut_maas": brut_maas,
+                "ay_gun": ay_takvimi.gun_sayisi,
+                "puantaj": _puantaj(rastgele, ay_takvimi, agirliklar, son),
+                "hesaplama": {},
+                "durum": "KAPATILMAMIŞ",
+                "aktif": cikis is None,
+                "isten_cikma_tarihi": isten_cikma_tarihi,
+                "surum": 1,
+            }
+            if not acik:
+                kapatilacaklar.append(kayit)
+            kayitlar.append(kayit)
+        if kayitlar:
+            data[calisan_id] = kayitlar
+
+    for kayit, sonuc in zip(kapatilacaklar, hesaplama.toplu_hesapla(kapatilacaklar)):
+        kayit.update(hesaplama=sonuc, durum="KAPATILDI", kapatma_tarihi=f"{_ay_ekle(kayit['ay'], 1)}-05 09:00:00")
+    return data
+
+
+def _ay_ekle(ay, adet):
+    yil, ay_no = takvim.ay_coz(ay)
+    yil, ay_no = divmod(yil * 12 + ay_no - 1 + adet, 12)
+    return f"{yil:04d}-{ay_no + 1:02d}"
+
+
+def kayit_sayisi(data):
+    """Personel-ay kaydı sayısı"""
+    return sum(len(kayitlar) for kayitlar in data.values())
@@ -0,0 +1,202 @@
+"""Depolama, yedekleme, ay kapatma ve raporun süresini ve bellek kullanımını ölç
+
+Her depolama biçimi için geçici bir klasörde sentetik.veri_seti ile oluşturulan
+veri üzerinde şu senaryolar çalıştırılır:
+
+    load_data      ana dosya ve günlükten tüm verileri yükle
+    save_data      tüm verileri kaydet (yedekle birlikte; önceki yedek mevcut)
+    create_backup  boş yedek klasörüne ana dosyanın yedeğini al
+    ay_kapat       açık son ayı toplu kapat (ay_hesapla_ve_kapat'taki hesaplama)
+    aylik_rapor    açık son ayın raporu (aylik_rapor_al'daki tarama, önizleme önbelleği boş)
+
+Süre her tekrarda ayrı ölçülür (en iyi ve ortalama); bellek ayrı bir çalıştırmada
+tracemalloc tepe değeri olarak ölçülür. Hazırlık (veriyi yeniden yazma, yedek
+klasörünü boşaltma) süreye dahil değildir. --json / --cikti ile sonuç, sürümler
+arasında karşılaştırılabilmesi için ortam bilgisiyle birlikte JSON olarak verilir.
+
+Kullanım:
+    python benchmarks/sicak_yollar.py [--personel 1000] [--ay 12] [--bicim json kolon sqlite]
+                                      [--senaryo load_data ...] [--tekrar 3] [--json] [--cikti sonuc.json]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hesaplama  # noqa: E402
+import maas  # noqa: E402
+import serilestirme  # noqa: E402
+from sentetik import kayit_sayisi, veri_seti  # noqa: E402
+
+BICIMLER = ("json", "kolon", "sqlite")
+
+
+class Senaryo:
+    """Ölçülecek işlem; hazirla her tekrardan önce süre dışında çalışır ve calistir'e verilecek durumu döndürür"""
+
+    def __init__(self, ad, calistir, hazirla=None):
+        self.ad = ad
+        self.calistir = calistir
+        self.hazirla = hazirla or (lambda ortam: None)
+
+
+def _veriyi_yaz(ortam):
+    maas.clear_journal()
+    maas.write_snapshot(ortam["data"])
+
+
+def _yedekleri_sil(ortam):
+    shutil.rmtree(maas.BACKUP_FOLDER, ignore_errors=True)
+
+
+def _ilk_yedek(ortam):
+    if not maas.list_backups():
+        maas.create_backup()
+    return ortam["data"]
+
+
+def _depo_ac(ortam):
+    """Veriyi yeniden yazıp yüklenmiş (indeksli) bir depo ve son ayı döndür"""
+    _veriyi_yaz(ortam)
+    depo = maas.get_depo()
+    depo.personel_listesi()
+    return depo, ortam["son_ay"]
+
+
+def _depoyu_kapat(depo):
+    if hasattr(depo, "kapat"):
+        depo.kapat()
+
+
+def _kapat(durum):
+    depo, ay = durum
+    try:
+        kapatilanlar, _ = maas.ay_toplu_kapat(ay, depo)
+        if kapatilanlar is None:
+            raise RuntimeError("Kapatılan kayıtlar yazılamadı")
+    finally:
+        _depoyu_kapat(depo)
+
+
+def _rapor_deposu(ortam):
+    # Açık ay satırlarındaki önizlemeler her tekrarda yeniden hesaplanır
+    hesaplama._onizlemeler.clear()
+    if ortam.get("rapor") is None:
+        ortam["rapor"] = _depo_ac(ortam)
+    return ortam["rapor"]
+
+
+def _rapor(durum):
+    depo, ay = durum
+    return [maas.rapor_satiri(ay_kaydi) for ay_kaydi in depo.ay_kayitlari(ay)], depo.ay_ozeti(ay)
+
+
+SENARYOLAR = (
+    Senaryo("load_data", lambda _: maas.load_data(), _veriyi_yaz),
+    Senaryo("save_data", maas.save_data, _ilk_yedek),
+    Senaryo("create_backup", lambda _: maas.create_backup(), _yedekleri_sil),
+    Senaryo("ay_kapat", _kapat, _depo_ac),
+    Senaryo("aylik_rapor", _rapor, _rapor_deposu),
+)
+
+
+def olc(senaryo, ortam, tekrar):
+    """Senaryonun süre ve bellek ölçümü"""
+    sureler = []
+    for _ in range(tekrar):
+        durum = senaryo.hazirla(ortam)
+        baslangic = time.perf_counter()
+        senaryo.calistir(durum)
+        sureler.append(time.perf_counter() - baslangic)
+
+    durum = senaryo.hazirla(ortam)
+    tracemalloc.start()
+    try:
+        senaryo.calistir(durum)
+        tepe = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"en_iyi_sn": round(min(sureler), 4), "ortalama_sn": round(sum(sureler) / len(sureler), 4),
+            "tepe_bellek_bayt": tepe}
+
+
+def ortam_bilgisi():
+    """Sonuçları karşılaştırmak için sürüm ve ortam bilgisi"""
+    try:
+        surum = subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        surum = None
+    return {
+        "surum": surum,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "json_kutuphanesi": serilestirme.KUTUPHANE,
+        "numpy": hesaplama.np is not None,
+        "zaman": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--personel", type=int, default=1000)
+    parser.add_argument("--ay", type=int, default=12)
+    parser.add_argument("--tohum", type=int, default=42)
+    parser.add_argument("--bicim", nargs="+", choices=BICIMLER, default=list(BICIMLER), help="depolama biçimleri")
+    parser.add_argument("--senaryo", nargs="+", choices=[s.ad for s in SENARYOLAR],
+                        default=[s.ad for s in SENARYOLAR])
+    parser.add_argument("--tekrar", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="sonucu JSON olarak yazdır")
+    parser.add_argument("--cikti", help="sonucu JSON olarak bu dosyaya da yaz")
+    args = parser.parse_args()
+    if args.cikti:
+        args.cikti = os.path.abspath(args.cikti)
+
+    data = veri_seti(args.personel, args.ay, args.tohum)
+    son_ay = max(kayit["ay"] for kayitlar in data.values() for kayit in kayitlar)
+    kayit = kayit_sayisi(data)
+
+    sonuclar = []
+    for bicim in args.bicim:
+        klasor = tempfile.mkdtemp(prefix="maas_sicak_")
+        os.chdir(klasor)
+        maas.STORAGE_FORMAT = bicim
+        ortam = {"data": data, "son_ay": son_ay}
+        try:
+            for senaryo in SENARYOLAR:
+                if senaryo.ad in args.senaryo:
+                    sonuclar.append({"senaryo": senaryo.ad, "bicim": bicim, "personel": len(data), "kayit": kayit,
+                                     **olc(senaryo, ortam, args.tekrar)})
+        finally:
+            if ortam.get("rapor") is not None:
+                _depoyu_kapat(ortam["rapor"][0])
+            maas.clear_journal()
+            os.chdir(os.path.dirname(klasor))
+            shutil.rmtree(klasor, ignore_errors=True)
+
+    belge = {"ortam": ortam_bilgisi(), "parametreler": {"personel": args.personel, "ay": args.ay,
+                                                         "tohum": args.tohum, "tekrar": args.tekrar},
+             "sonuclar": sonuclar}
+    if args.cikti:
+        with open(args.cikti, "w", encoding="utf-8") as f:
+            json.dump(belge, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(belge, ensure_ascii=False, indent=2))
+        return
+    print(f"{len(data)} personel, {kayit} ay kaydı")
+    print(f"{'senaryo':<15}{'biçim':<8}{'en iyi sn':>11}{'ortalama sn':>13}{'tepe MB':>10}")
+    for s in sonuclar:
+        print(f"{s['senaryo']:<15}{s['bicim']:<8}{s['en_iyi_sn']:>11.3f}{s['ortalama_sn']:>13.3f}"
+              f"{s['tepe_bellek_bayt'] / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
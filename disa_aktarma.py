@@ -0,0 +1,243 @@
+"""Bordro ve puantaj dışa aktarma (CSV, XLSX, Parquet)
+
+Muhasebe sistemine aktarım için ay başına bordro satırları (kimlik bilgileri ve
+hesaplama alanları) veya günlük puantaj satırları dosyaya yazılır:
+
+    python maas.py export bordro.xlsx [--icerik bordro|puantaj] [--bas 2024-01 --son 2025-12]
+
+Biçim dosya uzantısından bulunur. Veriler maas.personel_akisi ile personel
+personel okunur ve PARCA_BOYUTU satırlık parçalar halinde yazılır; bellekte
+aynı anda bir parça bulunur. XLSX dosyası ek kütüphane olmadan zipfile ile,
+satır içi metin hücreleriyle akış halinde üretilir; bir sayfanın satır sınırı
+aşılırsa yeni sayfaya geçilir. Parquet için pyarrow kurulu olmalıdır.
+"""
+import csv
+import io
+import itertools
+import os
+import zipfile
+from xml.sax.saxutils import escape
+
+import olcum
+from guvenli_yazim import atomik_yaz
+from hesaplama import HESAPLAMA_ALANLARI
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow yoksa Parquet dışa aktarımı kullanılamaz
+    pa = pq = None
+
+PARCA_BOYUTU = 10000  # Tek seferde biçimlendirilip yazılan satır sayısı
+XLSX_SATIR_SINIRI = 1048575  # Bir sayfadaki en fazla veri satırı (başlık hariç)
+
+# Gün sayıları tamsayı, tutarlar ondalıklıdır (SQLite deposu hepsini REAL olarak döndürür)
+_TAMSAYI_ALANLARI = frozenset(("calisilan_gun", "yarim_gun", "izinli_gun", "devamsiz_gun", "resmi_tatil_gun",
+                               "saatlik_kesinti_toplam"))
+
+# (sütun adı, tür); tür: metin, tamsayi, ondalik veya mantiksal
+BORDRO_SUTUNLARI = (
+    ("id", "metin"), ("ad_soyad", "metin"), ("ay", "metin"), ("durum", "metin"), ("aktif", "mantiksal"),
+    ("isten_cikma_tarihi", "metin"), ("brut_maas", "ondalik"), ("ay_gun", "tamsayi"),
+    ("kapatma_tarihi", "metin"),
+) + tuple((alan, "tamsayi" if alan in _TAMSAYI_ALANLARI else "ondalik") for alan in HESAPLAMA_ALANLARI)
+
+PUANTAJ_SUTUNLARI = (
+    ("id", "metin"), ("ad_soyad", "metin"), ("ay", "metin"), ("gun", "tamsayi"), ("durum", "metin"),
+    ("saat", "tamsayi"),
+)
+
+ICERIKLER = ("bordro", "puantaj")
+BICIMLER = ("csv", "xlsx", "parquet")
+
+
+# --- Satır üreticileri ---
+
+def _ay_kayitlari(ogeler, aylar):
+    for _, kayitlar in ogeler:
+        for kayit in kayitlar:
+            if aylar is None or kayit["ay"] in aylar:
+                yield kayit
+
+
+def bordro_satirlari(ogeler, aylar=None):
+    """(calisan_id, kayitlar) akışından BORDRO_SUTUNLARI sırasıyla ay başına satır üret
+
+    aylar verilirse sadece o aylar; kapatılmamış ayların hesaplama alanları boştur.
+    """
+    for kayit in _ay_kayitlari(ogeler, aylar):
+        hesap = kayit.get("hesaplama") or {}
+        yield (kayit.get("id"), kayit.get("ad_soyad"), kayit["ay"], kayit.get("durum", "KAPATILMAMIŞ"),
+               bool(kayit.get("aktif", True)), kayit.get("isten_cikma_tarihi"), kayit["brut_maas"],
+               kayit["ay_gun"], kayit.get("kapatma_tarihi")) + tuple(
+            None if hesap.get(alan) is None else int(hesap[alan]) if alan in _TAMSAYI_ALANLARI else hesap[alan]
+            for alan in HESAPLAMA_ALANLARI)
+
+
+def puantaj_satirlari(ogeler, aylar=None):
+    """(calisan_id, kayitlar) akışından PUANTAJ_SUTUNLARI sırasıyla gün başına satır üret"""
+    for kayit in _ay_kayitlari(ogeler, aylar):
+        kimlik = (kayit.get("id"), kayit.get("ad_soyad"), kayit["ay"])
+        for p in sorted(kayit["puantaj"], key=lambda p: p["gun"]):
+            yield kimlik + (p["gun"], p["durum"], p["saat"])
+
+
+def _parcala(satirlar, boyut=PARCA_BOYUTU):
+    """Satırları en fazla boyut uzunluğunda listeler halinde üret"""
+    satirlar = iter(satirlar)
+    while True:
+        parca = list(itertools.islice(satirlar, boyut))
+        if not parca:
+            return
+        yield parca
+
+
+# --- Yazıcılar: (sutunlar, satirlar, yol) alır, yazılan satır sayısını döndürür ---
+
+def csv_yaz(sutunlar, satirlar, yol):
+    """CSV (Excel'in tanıması için BOM'lu UTF-8)"""
+    adet = 0
+    with atomik_yaz(yol, "wb") as f:
+        metin = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+        yazici = csv.writer(metin, lineterminator="\r\n")
+        yazici.writerow([ad for ad, _ in sutunlar])
+        for parca in _parcala(satirlar):
+            yazici.writerows(parca)
+            adet += len(parca)
+        metin.flush()
+        # Dosya atomik_yaz tarafından fsync edilip kapatılır
+        metin.detach()
+    return adet
+
+
+def _xlsx_hucre(deger):
+    if deger is None:
+        return "<c/>"
+    if deger is True or deger is False:
+        return f'<c t="b"><v>{int(deger)}</v></c>'
+    if isinstance(deger, (int, float)):
+        return f"<c><v>{deger!r}</v></c>"
+    return f'<c t="inlineStr"><is><t>{escape(str(deger))}</t></is></c>'
+
+
+def _xlsx_satiri(degerler):
+    return "<row>" + "".join(map(_xlsx_hucre, degerler)) + "</row>"
+
+
+_XLSX_SAYFA_BASI = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    '<sheetData>')
+_XLSX_SAYFA_SONU = "</sheetData></worksheet>"
+
+
+def _xlsx_ekleri(sayfa_sayisi, sayfa_adi):
+    """Sayfalar dışındaki sabit XLSX parçaları: {arşivdeki ad: içerik}"""
+    adlar = [sayfa_adi if sayfa_sayisi == 1 else f"{sayfa_adi} {i}" for i in range(1, sayfa_sayisi + 1)]
+    return {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                      'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                      for i in range(1, sayfa_sayisi + 1))
+            + "</Types>"),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="xl/workbook.xml" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+            "</Relationships>"),
+        "xl/workbook.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(f'<sheet name="{escape(ad)}" sheetId="{i}" r:id="rId{i}"/>' for i, ad in enumerate(adlar, 1))
+            + "</sheets></workbook>"),
+        "xl/_rels/workbook.xml.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(f'<Relationship Id="rId{i}" Target="worksheets/sheet{i}.xml" '
+                      'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+                      for i in range(1, sayfa_sayisi + 1))
+            + "</Relationships>"),
+    }
+
+
+def xlsx_yaz(sutunlar, satirlar, yol, sayfa_adi="Veri"):
+    """Excel (XLSX) çalışma kitabı; her sayfada en fazla XLSX_SATIR_SINIRI veri satırı"""
+    baslik = _xlsx_satiri(ad for ad, _ in sutunlar)
+    satirlar = iter(satirlar)
+    adet = 0
+    sayfa_sayisi = 0
+    with atomik_yaz(yol, "wb") as f, zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as arsiv:
+        while True:
+            ilk = list(itertools.islice(satirlar, 1))
+            # Veri yoksa da başlıklı tek bir sayfa yazılır
+            if not ilk and sayfa_sayisi:
+                break
+            sayfa_sayisi += 1
+            with arsiv.open(f"xl/worksheets/sheet{sayfa_sayisi}.xml", "w", force_zip64=True) as sayfa:
+                sayfa.write((_XLSX_SAYFA_BASI + baslik).encode("utf-8"))
+                for parca in _parcala(itertools.chain(ilk, itertools.islice(satirlar, XLSX_SATIR_SINIRI - 1))):
+                    sayfa.write("".join(map(_xlsx_satiri, parca)).encode("utf-8"))
+                    adet += len(parca)
+                sayfa.write(_XLSX_SAYFA_SONU.encode("utf-8"))
+            if not ilk:
+                break
+        for ad, icerik in _xlsx_ekleri(sayfa_sayisi, sayfa_adi).items():
+            arsiv.writestr(ad, icerik)
+    return adet
+
+
+def parquet_yaz(sutunlar, satirlar, yol):
+    """Parquet; her parça ayrı bir satır grubu olarak yazılır"""
+    if pa is None:
+        raise ImportError("Parquet dışa aktarımı için pyarrow kurulu olmalı (pip install pyarrow)")
+    turler = {"metin": pa.string(), "tamsayi": pa.int64(), "ondalik": pa.float64(), "mantiksal": pa.bool_()}
+    sema = pa.schema([(ad, turler[tur]) for ad, tur in sutunlar])
+    adet = 0
+    with atomik_yaz(yol, "wb") as f:
+        yazici = pq.ParquetWriter(f, sema)
+        try:
+            for parca in _parcala(satirlar):
+                kolonlar = [pa.array(degerler, type=tur) for degerler, tur in zip(zip(*parca), sema.types)]
+                yazici.write_table(pa.Table.from_arrays(kolonlar, schema=sema))
+                adet += len(parca)
+        finally:
+            yazici.close()
+    return adet
+
+
+_YAZICILAR = {"csv": csv_yaz, "xlsx": xlsx_yaz, "parquet": parquet_yaz}
+
+
+def bicim_bul(yol):
+    """Dosya uzantısından biçimi bul (desteklenmiyorsa None)"""
+    uzanti = os.path.splitext(yol)[1].lower().lstrip(".")
+    return "parquet" if uzanti in ("parquet", "pq") else uzanti if uzanti in _YAZICILAR else None
+
+
+@olcum.olc(kayit=lambda adet: adet)
+def disa_aktar(ogeler, yol, icerik="bordro", bicim=None, aylar=None):
+    """(calisan_id, kayitlar) akışını dosyaya aktar, yazılan satır sayısını döndür
+
+    icerik: "bordro" (ay başına) veya "puantaj" (gün başına); bicim verilmezse
+    uzantıdan bulunur. aylar verilirse sadece o aylar aktarılır.
+    """
+    bicim = bicim or bicim_bul(yol)
+    if bicim not in _YAZICILAR:
+        raise ValueError(f"Desteklenmeyen biçim: {bicim or yol} ({', '.join(BICIMLER)})")
+    if icerik not in ICERIKLER:
+        raise ValueError(f"Geçersiz içerik: {icerik} ({', '.join(ICERIKLER)})")
+    aylar = set(aylar) if aylar is not None else None
+    if icerik == "bordro":
+        sutunlar, satirlar = BORDRO_SUTUNLARI, bordro_satirlari(ogeler, aylar)
+    else:
+        sutunlar, satirlar = PUANTAJ_SUTUNLARI, puantaj_satirlari(ogeler, aylar)
+    if bicim == "xlsx":
+        return xlsx_yaz(sutunlar, satirlar, yol, sayfa_adi=icerik.capitalize())
+    return _YAZICILAR[bicim](sutunlar, satirlar, yol)
@@ -0,0 +1,273 @@
+"""Çökmeye dayanıklı dosya yazımı
+
+Tam dosya yazımları geçici dosyaya yapılır, fsync ile diske indirilir ve
+os.replace ile asıl dosyanın yerine konur; yazım ortasında kesilse bile eski
+dosya bozulmadan kalır. Ekleme yapılan dosyalar (günlük) için grup kaydı
+desteklenir: kısa bir pencere içinde gelen eklemeler tek fsync ile diske
+indirilir.
+
+Aynı dosyaları birden çok süreç (ör. ortak diskteki birkaç kullanıcı)
+değiştirebildiğinden, kayıt anı dosya_kilidi ile danışma kilidi altında yapılır.
+"""
+import asyncio
+import atexit
+import errno
+import os
+import tempfile
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+
+import olcum
+
+try:
+    import fcntl
+except ImportError:  # Windows'ta danışma kilidi yok; sadece süreç içi kilit kullanılır
+    fcntl = None
+
+_kilitler = {}  # mutlak yol -> _Kilit
+_kilitler_kilidi = threading.Lock()
+_gunlukler = weakref.WeakSet()  # Süreç kapanırken kapatılacak GrupGunluk nesneleri
+
+# Yeni dosyaların izinleri için süreç umask'ı (mkstemp geçici dosyayı 0600 açar)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def dizini_senkronize(yol):
+    """Dosyanın bulunduğu dizini fsync et (yeniden adlandırmanın kalıcı olması için)"""
+    if os.name == "nt":
+        return  # Windows'ta dizin fsync edilemez
+    fd = os.open(os.path.dirname(os.path.abspath(yol)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _Kilit:
+    """Bir kilit dosyası için süreç içi durum"""
+    __slots__ = ("rlock", "derinlik", "dosya")
+
+    def __init__(self):
+        self.rlock = threading.RLock()
+        self.derinlik = 0
+        self.dosya = None
+
+
+@contextmanager
+def dosya_kilidi(yol):
+    """Kilit dosyası üzerinde süreçler arası özel (exclusive) kilit tut
+
+    fcntl.lockf (POSIX kayıt kilidi) ağ disklerinde de çalışır. Kilit aynı
+    süreç içinde iç içe alınabilir; iş parçacıkları arasında da geçerlidir.
+    """
+    yol = os.path.abspath(yol)
+    with _kilitler_kilidi:
+        kilit = _kilitler.setdefault(yol, _Kilit())
+
+    with kilit.rlock:
+        if kilit.derinlik == 0:
+            kilit.dosya = open(yol, "a+b")
+            if fcntl is not None:
+                fcntl.lockf(kilit.dosya.fileno(), fcntl.LOCK_EX)
+        kilit.derinlik += 1
+        try:
+            yield
+        finally:
+            kilit.derinlik -= 1
+            if kilit.derinlik == 0:
+                if fcntl is not None:
+                    fcntl.lockf(kilit.dosya.fileno(), fcntl.LOCK_UN)
+                kilit.dosya.close()
+                kilit.dosya = None
+
+
+@asynccontextmanager
+async def dosya_kilidi_async(yol, aralik=0.005):
+    """dosya_kilidi'nin olay döngüsünü bloklamayan sürümü
+
+    Kilit boşalana kadar bloklayarak beklemek yerine kısa aralıklarla denenir.
+    Süreç içi kilit olay döngüsünün iş parçacığında tutulur; aynı döngüdeki
+    eşyordamlar arasında ayrıca asyncio.Lock ile sıralama yapılmalıdır.
+    """
+    yol = os.path.abspath(yol)
+    with _kilitler_kilidi:
+        kilit = _kilitler.setdefault(yol, _Kilit())
+
+    bekleme = aralik
+    while not kilit.rlock.acquire(blocking=False):
+        await asyncio.sleep(bekleme)
+        bekleme = min(bekleme * 2, 0.1)
+    try:
+        if kilit.derinlik == 0:
+            kilit.dosya = open(yol, "a+b")
+            bekleme = aralik
+            while fcntl is not None:
+                try:
+                    fcntl.lockf(kilit.dosya.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except OSError as e:
+                    if e.errno not in (errno.EACCES, errno.EAGAIN):
+                        kilit.dosya.close()
+                        kilit.dosya = None
+                        raise
+                await asyncio.sleep(bekleme)
+                bekleme = min(bekleme * 2, 0.1)
+        kilit.derinlik += 1
+        try:
+            yield
+        finally:
+            kilit.derinlik -= 1
+            if kilit.derinlik == 0:
+                if fcntl is not None:
+                    fcntl.lockf(kilit.dosya.fileno(), fcntl.LOCK_UN)
+                kilit.dosya.close()
+                kilit.dosya = None
+    finally:
+        kilit.rlock.release()
+
+
+@contextmanager
+def atomik_yaz(yol, kip="w", encoding="utf-8"):
+    """Dosyayı geçici dosya + fsync + yeniden adlandırma ile yaz
+
+        with atomik_yaz("veri.json") as f:
+            f.write(...)
+
+    Blok hata ile biterse asıl dosyaya dokunulmaz, geçici dosya silinir.
+    Geçici dosyanın adı her yazımda farklıdır; aynı dosyayı aynı anda yazan
+    iki yazıcı birbirinin geçici dosyasını ezmez. Asıl dosyanın izinleri korunur.
+    """
+    dizin, ad = os.path.split(os.path.abspath(yol))
+    fd, gecici = tempfile.mkstemp(prefix=ad + ".", suffix=".tmp", dir=dizin)
+    try:
+        izin = os.stat(yol).st_mode & 0o7777
+    except OSError:
+        izin = 0o666 & ~_UMASK
+    try:
+        os.chmod(gecici, izin)
+        f = os.fdopen(fd, kip, encoding=None if "b" in kip else encoding)
+    except BaseException:
+        os.close(fd)
+        os.remove(gecici)
+        raise
+    try:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+        if olcum.ACIK:
+            olcum.say("dosya.yazilan_bayt", os.fstat(f.fileno()).st_size)
+    except BaseException:
+        f.close()
+        os.remove(gecici)
+        raise
+    f.close()
+    os.replace(gecici, yol)
+    dizini_senkronize(yol)
+
+
+class GrupGunluk:
+    """Satır eklenen dosya; eklemeler grup halinde fsync edilir
+
+    pencere 0 ise her ekleme hemen fsync edilir. Daha büyükse ilk eklemeden
+    pencere kadar sonra, o ana kadar eklenen tüm satırlar tek fsync ile diske
+    indirilir. senkronize() bekleyen eklemeleri hemen kalıcı yapar; süreç
+    kapanırken de çağrılır. ekle() eklemenin sıra numarasını döndürür;
+    kalici_bekle(sira) o eklemenin fsync edilmesini bekler.
+    """
+
+    def __init__(self, yol, pencere=0.0):
+        self.yol = yol
+        self.pencere = pencere
+        self._dosya = None
+        self._bekleyen = False
+        self._zamanlayici = None
+        self._kilit = threading.Lock()
+        self._kalici_oldu = threading.Condition(self._kilit)
+        self.eklenen = 0  # Eklenen satır sayısı (sıra numarası)
+        self.kalici = 0  # fsync edilmiş son satırın sıra numarası
+        _gunlukler.add(self)
+
+    def ekle(self, satir):
+        """Satırı dosyaya ekle (işletim sistemine yazılır, fsync pencereye göre yapılır), sırasını döndür"""
+        with self._kilit:
+            # Dosya başka bir işlem tarafından silindi veya değiştirildiyse yeniden açılır
+            if self._dosya is not None and not self._ayni_dosya():
+                self._dosyayi_kapat()
+            if self._dosya is None:
+                yeni = not os.path.exists(self.yol)
+                self._dosya = open(self.yol, "a", encoding="utf-8")
+                if yeni:
+                    dizini_senkronize(self.yol)
+            self._dosya.write(satir)
+            self._dosya.flush()
+            self.eklenen += 1
+            if olcum.ACIK:
+                olcum.say("dosya.yazilan_bayt", len(satir.encode("utf-8")))
+
+            if self.pencere <= 0:
+                os.fsync(self._dosya.fileno())
+                self._kalici_yap()
+                return self.eklenen
+            self._bekleyen = True
+            if self._zamanlayici is None:
+                self._zamanlayici = threading.Timer(self.pencere, self.senkronize)
+                self._zamanlayici.daemon = True
+                self._zamanlayici.start()
+            return self.eklenen
+
+    def _kalici_yap(self):
+        """Şimdiye kadarki eklemeler fsync edildi (kilit tutulurken çağrılır)"""
+        self.kalici = self.eklenen
+        self._kalici_oldu.notify_all()
+
+    def kalici_bekle(self, sira=None):
+        """sira numaralı (verilmezse şimdiye kadarki son) ekleme fsync edilene kadar bekle"""
+        with self._kilit:
+            if sira is None:
+                sira = self.eklenen
+            while self.kalici < sira:
+                self._kalici_oldu.wait()
+
+    def _ayni_dosya(self):
+        """Açık dosya hâlâ yoldaki dosya mı"""
+        try:
+            return os.path.samestat(os.fstat(self._dosya.fileno()), os.stat(self.yol))
+        except OSError:
+            return False
+
+    def _dosyayi_kapat(self):
+        """Bekleyen eklemeleri diske indirip dosyayı kapat (kilit tutulurken çağrılır)"""
+        if self._dosya is None:
+            return
+        if self._bekleyen:
+            os.fsync(self._dosya.fileno())
+            self._bekleyen = False
+        self._kalici_yap()
+        self._dosya.close()
+        self._dosya = None
+
+    def senkronize(self):
+        """Bekleyen eklemeleri fsync ile diske indir"""
+        with self._kilit:
+            self._zamanlayici = None
+            if self._bekleyen and self._dosya is not None:
+                os.fsync(self._dosya.fileno())
+            self._bekleyen = False
+            self._kalici_yap()
+
+    def kapat(self):
+        """Bekleyenleri diske indirip dosyayı kapat (dosya silinmeden veya değiştirilmeden önce)"""
+        with self._kilit:
+            if self._zamanlayici is not None:
+                self._zamanlayici.cancel()
+                self._zamanlayici = None
+            self._dosyayi_kapat()
+
+
+@atexit.register
+def _gunlukleri_kapat():
+    """Süreç kapanırken hâlâ duran günlüklerin bekleyen eklemelerini diske indir"""
+    for gunluk in list(_gunlukler):
+        gunluk.kapat()
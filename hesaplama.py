@@ -0,0 +1,376 @@
+"""Maaş hesaplama motoru
+
+Konsol arayüzünden bağımsız, yan etkisiz hesaplama fonksiyonları. Bir ay kaydı
+(brut_maas, ay_gun, ay, puantaj, isten_cikma_tarihi) alınır ve kayda yazılacak
+hesaplama sözlüğü döndürülür; kayıt değiştirilmez, dosyaya yazılmaz.
+"""
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import olcum
+import takvim
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yoksa toplu hesaplama saf Python ile yapılır
+    np = None
+
+VARSAYILAN_KURALLAR = {
+    "gunluk_saat": 9,  # Saatlik kesinti hesabında bir iş günü
+    "devamsiz_carpani": 2,  # Devamsız gün başına kesilen günlük ücret sayısı
+    "yarim_gun_orani": 0.5,  # Yarım günde ödenen günlük ücret oranı
+}
+
+ONIZLEME_ONBELLEK_BOYUTU = 4096  # Önbellekte tutulan net maaş önizlemesi sayısı
+PARALEL_PARCA_BOYUTU = 5000  # İşçilere tek seferde gönderilen ay kaydı sayısı
+
+HESAPLAMA_ALANLARI = (
+    "calisilan_gun", "yarim_gun", "izinli_gun", "devamsiz_gun", "resmi_tatil_gun",
+    "yarim_gun_maas", "izinli_kesinti", "devamsiz_kesinti", "saatlik_kesinti_toplam",
+    "saatlik_kesinti", "resmi_tatil_maas", "toplam_maas", "net_maas",
+)
+
+# Aylık özet (materyalize toplamlar) alanları; kesinti ve net sadece kapatılmış aylardan toplanır
+OZET_ALANLARI = ("personel", "kapali", "acik", "toplam_brut_maas", "toplam_kesinti", "toplam_net_maas")
+# Özette tam sayı kuruş olarak toplanan tutarlar; TL'ye sadece dışarı verilirken çevrilir
+OZET_TUTAR_ALANLARI = frozenset(OZET_ALANLARI[3:])
+
+
+def kurallari_al(kurallar=None):
+    """Varsayılan kuralları verilen kurallarla birleştir"""
+    if not kurallar:
+        return VARSAYILAN_KURALLAR
+    return {**VARSAYILAN_KURALLAR, **kurallar}
+
+
+def son_gun(kayit):
+    """Hesaplamada dikkate alınacak son günü bul: (max_gun, isten_cikis_tarihi, cikis_ayi)"""
+    isten_cikis_tarihi_str = kayit.get("isten_cikma_tarihi")
+    if not isten_cikis_tarihi_str:
+        return kayit["ay_gun"], None, False
+
+    isten_cikis_tarihi = None
+    try:
+        isten_cikis_tarihi = takvim.tarih_coz(isten_cikis_tarihi_str)
+    except Exception:
+        pass
+
+    yil, ay_no = takvim.ay_coz(kayit["ay"])
+
+    # Eğer işten çıkış tarihi bu ayda ise, sadece o güne kadar olan puantajı dikkate al
+    max_gun = kayit["ay_gun"]
+    cikis_ayi = bool(isten_cikis_tarihi and yil == isten_cikis_tarihi.year
+                     and ay_no == isten_cikis_tarihi.month)
+    if cikis_ayi:
+        max_gun = isten_cikis_tarihi.day
+    return max_gun, isten_cikis_tarihi, cikis_ayi
+
+
+def kapatma_kontrolu(kayit):
+    """Ay kapatma için dikkate alınacak son günü ve eksik günleri bul
+
+    (max_gun, eksik_gunler, isten_cikis_tarihi, cikis_ayi) döndürür.
+    """
+    max_gun, isten_cikis_tarihi, cikis_ayi = son_gun(kayit)
+
+    girilen_gunler = {p['gun'] for p in kayit["puantaj"] if p['gun'] <= max_gun}
+    eksik_gunler = [g for g in range(1, max_gun + 1) if g not in girilen_gunler]
+    return max_gun, eksik_gunler, isten_cikis_tarihi, cikis_ayi
+
+
+def kapatilabilir_mi(kayit):
+    """Kayıt eksik gün nedeniyle kapatılamıyorsa eksik günleri, kapatılabiliyorsa boş liste döndür"""
+    _, eksik_gunler, isten_cikis_tarihi, cikis_ayi = kapatma_kontrolu(kayit)
+    # İşten çıkış yoksa veya çıkış bu aydaysa eksik gün kapatmayı engeller
+    if eksik_gunler and (not isten_cikis_tarihi or cikis_ayi):
+        return eksik_gunler
+    return []
+
+
+@olcum.olc
+def hesapla(kayit, kurallar=None, max_gun=None):
+    """Ay kaydının hesaplama sözlüğünü döndür (max_gun sonrası puantaj dikkate alınmaz)"""
+    kurallar = kurallari_al(kurallar)
+    if max_gun is None:
+        max_gun = son_gun(kayit)[0]
+
+    # Aynı gün birden çok girilmişse son giriş geçerlidir (kolon deposu ve toplu hesaplamadaki gibi)
+    gunler = {}
+    for p in kayit["puantaj"]:
+        if p['gun'] <= max_gun:
+            gunler[p['gun']] = p
+
+    calisilan_gun = izinli_gun = devamsiz_gun = yarim_gun = saatlik_kesinti_toplam = resmi_tatil_gun = 0
+
+    for p in gunler.values():
+        kod = p['durum']
+        if kod == 'C':
+            calisilan_gun += 1
+        elif kod == 'I':
+            izinli_gun += 1
+        elif kod == 'D':
+            devamsiz_gun += 1
+        elif kod == 'Y':
+            yarim_gun += 1
+        elif kod == 'S':
+            saatlik_kesinti_toplam += p['saat']
+        elif kod == 'R':
+            resmi_tatil_gun += 1
+
+    return _hesaplama_sozlugu(kayit["brut_maas"], kayit["ay_gun"], calisilan_gun, yarim_gun, izinli_gun,
+                              devamsiz_gun, resmi_tatil_gun, saatlik_kesinti_toplam, kurallar)
+
+
+def kural_surumu(kurallar=None):
+    """Kuralların kısa sürüm özeti; herhangi bir kural değeri değişince değişir"""
+    return hashlib.blake2b(repr(sorted(kurallari_al(kurallar).items())).encode(), digest_size=8).hexdigest()
+
+
+def icerik_ozeti(kayit, kurallar=None):
+    """Hesaplamayı belirleyen girdilerin özeti
+
+    brut_maas, ay_gun, puantaj, isten_cikma_tarihi ve kural sürümünün yanında
+    çıkış gününün hangi ayda olduğunu belirleyen ay da özete girer.
+    """
+    puantaj = sorted((p["gun"], p["durum"], p["saat"]) for p in kayit["puantaj"])
+    girdiler = (kayit["brut_maas"], kayit["ay_gun"], kayit["ay"], kayit.get("isten_cikma_tarihi"),
+                kural_surumu(kurallar), puantaj)
+    return hashlib.blake2b(repr(girdiler).encode(), digest_size=16).digest()
+
+
+_onizlemeler = {}  # içerik özeti -> hesaplama; sıra en eski kullanımdan en yeniye
+_onizleme_kilidi = threading.Lock()
+onizleme_sayaci = {"isabet": 0, "iska": 0}
+olcum.kaynak_ekle("hesaplama.onizleme", lambda: dict(onizleme_sayaci))
+
+
+@olcum.olc
+def onizle(kayit, kurallar=None):
+    """Ay kapatılmadan, şu ana kadarki puantajla hesaplama önizlemesi (hesapla ile aynı sonuç)
+
+    Sonuçlar girdilerin içerik özetiyle sınırlı (LRU) önbellekte tutulur; girdilerden
+    biri veya kurallar değişince özet de değiştiğinden eski sonuç kullanılmaz.
+    """
+    anahtar = icerik_ozeti(kayit, kurallar)
+    with _onizleme_kilidi:
+        sonuc = _onizlemeler.pop(anahtar, None)
+        if sonuc is not None:
+            _onizlemeler[anahtar] = sonuc
+            onizleme_sayaci["isabet"] += 1
+            return dict(sonuc)
+
+    sonuc = hesapla(kayit, kurallar)
+    with _onizleme_kilidi:
+        onizleme_sayaci["iska"] += 1
+        _onizlemeler[anahtar] = sonuc
+        while len(_onizlemeler) > ONIZLEME_ONBELLEK_BOYUTU:
+            del _onizlemeler[next(iter(_onizlemeler))]
+    return dict(sonuc)
+
+
+def _hesaplama_sozlugu(brut_maas, ay_gun, calisilan_gun, yarim_gun, izinli_gun, devamsiz_gun,
+                       resmi_tatil_gun, saatlik_kesinti_toplam, kurallar):
+    """Gün sayımlarından hesaplama sözlüğünü oluştur"""
+    net_tutar_gunluk = brut_maas / ay_gun
+    net_tutar_saatlik = net_tutar_gunluk / kurallar["gunluk_saat"]
+
+    # Hesaplamalar; yarım gün ücreti kapatılmış ayların sonuçlarıyla aynı yuvarlanması için gün gün eklenir
+    yarim_gun_ucreti = net_tutar_gunluk * kurallar["yarim_gun_orani"]
+    yarim_gun_maas = 0
+    for _ in range(yarim_gun):
+        yarim_gun_maas += yarim_gun_ucreti
+    izinli_kesinti = izinli_gun * net_tutar_gunluk
+    devamsiz_kesinti = devamsiz_gun * net_tutar_gunluk * kurallar["devamsiz_carpani"]
+    saatlik_kesinti = saatlik_kesinti_toplam * net_tutar_saatlik
+    toplam_maas = (calisilan_gun * net_tutar_gunluk) + yarim_gun_maas + (resmi_tatil_gun * net_tutar_gunluk)
+    net_maas = toplam_maas - izinli_kesinti - devamsiz_kesinti - saatlik_kesinti
+
+    return {
+        "calisilan_gun": calisilan_gun,
+        "yarim_gun": yarim_gun,
+        "izinli_gun": izinli_gun,
+        "devamsiz_gun": devamsiz_gun,
+        "resmi_tatil_gun": resmi_tatil_gun,
+        "yarim_gun_maas": round(yarim_gun_maas, 2),
+        "izinli_kesinti": round(izinli_kesinti, 2),
+        "devamsiz_kesinti": round(devamsiz_kesinti, 2),
+        "saatlik_kesinti_toplam": saatlik_kesinti_toplam,
+        "saatlik_kesinti": round(saatlik_kesinti, 2),
+        "resmi_tatil_maas": round(resmi_tatil_gun * net_tutar_gunluk, 2),
+        "toplam_maas": round(toplam_maas, 2),
+        "net_maas": round(max(0, net_maas), 2)
+    }
+
+
+@olcum.olc(kayit=len)
+def toplu_hesapla(kayitlar, kurallar=None, max_gunler=None):
+    """Birden çok ay kaydının hesaplamasını tek geçişte yap (NumPy varsa vektörel)"""
+    kurallar = kurallari_al(kurallar)
+    if max_gunler is None:
+        max_gunler = [son_gun(kayit)[0] for kayit in kayitlar]
+
+    if np is None or not kayitlar:
+        return [hesapla(kayit, kurallar, max_gun) for kayit, max_gun in zip(kayitlar, max_gunler)]
+
+    # Her kayıt için 31 günlük durum kodu ve saat matrisi; aynı günün son girişi öncekini ezer
+    kodlar = np.zeros((len(kayitlar), 31), dtype=np.uint8)
+    saatler = np.zeros((len(kayitlar), 31), dtype=np.int64)
+    for i, (kayit, max_gun) in enumerate(zip(kayitlar, max_gunler)):
+        for p in kayit["puantaj"]:
+            if p['gun'] <= max_gun:
+                kodlar[i, p['gun'] - 1] = ord(p['durum'])
+                saatler[i, p['gun'] - 1] = p['saat']
+
+    net_tutar_gunluk = (np.array([k["brut_maas"] for k in kayitlar], dtype=np.float64)
+                        / np.array([k["ay_gun"] for k in kayitlar], dtype=np.float64))
+    net_tutar_saatlik = net_tutar_gunluk / kurallar["gunluk_saat"]
+
+    calisilan_gun = (kodlar == ord('C')).sum(axis=1)
+    izinli_gun = (kodlar == ord('I')).sum(axis=1)
+    devamsiz_gun = (kodlar == ord('D')).sum(axis=1)
+    yarim_gun = (kodlar == ord('Y')).sum(axis=1)
+    resmi_tatil_gun = (kodlar == ord('R')).sum(axis=1)
+    saatlik_kesinti_toplam = np.where(kodlar == ord('S'), saatler, 0).sum(axis=1)
+
+    # Yarım gün ücreti tekli hesaplamadaki gibi gün gün eklenir
+    yarim_gun_ucreti = net_tutar_gunluk * kurallar["yarim_gun_orani"]
+    yarim_gun_maas = np.zeros(len(kayitlar), dtype=np.float64)
+    for gun in range(int(yarim_gun.max())):
+        yarim_gun_maas += np.where(yarim_gun > gun, yarim_gun_ucreti, 0.0)
+    izinli_kesinti = izinli_gun * net_tutar_gunluk
+    devamsiz_kesinti = devamsiz_gun * net_tutar_gunluk * kurallar["devamsiz_carpani"]
+    saatlik_kesinti = saatlik_kesinti_toplam * net_tutar_saatlik
+    resmi_tatil_maas = resmi_tatil_gun * net_tutar_gunluk
+    toplam_maas = (calisilan_gun * net_tutar_gunluk) + yarim_gun_maas + resmi_tatil_maas
+    net_maas = np.maximum(0, toplam_maas - izinli_kesinti - devamsiz_kesinti - saatlik_kesinti)
+
+    # Yuvarlama tekli hesaplamayla aynı sonucu vermesi için Python round ile yapılır
+    return [{
+        "calisilan_gun": int(calisilan_gun[i]),
+        "yarim_gun": int(yarim_gun[i]),
+        "izinli_gun": int(izinli_gun[i]),
+        "devamsiz_gun": int(devamsiz_gun[i]),
+        "resmi_tatil_gun": int(resmi_tatil_gun[i]),
+        "yarim_gun_maas": round(float(yarim_gun_maas[i]), 2),
+        "izinli_kesinti": round(float(izinli_kesinti[i]), 2),
+        "devamsiz_kesinti": round(float(devamsiz_kesinti[i]), 2),
+        "saatlik_kesinti_toplam": int(saatlik_kesinti_toplam[i]),
+        "saatlik_kesinti": round(float(saatlik_kesinti[i]), 2),
+        "resmi_tatil_maas": round(float(resmi_tatil_maas[i]), 2),
+        "toplam_maas": round(float(toplam_maas[i]), 2),
+        "net_maas": round(float(net_maas[i]), 2)
+    } for i in range(len(kayitlar))]
+
+
+def _kodla(kayit, max_gun):
+    """Kaydı işçiye gönderilecek kompakt biçime çevir: (brut_maas, ay_gun, 62 byte)
+
+    İlk 31 byte günlerin durum kodu (ASCII, girilmemiş gün 0), sonraki 31 byte saatlerdir.
+    """
+    puantaj = kayit["puantaj"]
+    if hasattr(puantaj, "bloklar"):
+        # Kolon deposundaki kayıtlar zaten bu biçimde tutulur
+        kodlar, saatler = puantaj.bloklar()
+        if max_gun < 31:
+            kodlar = kodlar[:max_gun] + bytes(31 - max_gun)
+        return kayit["brut_maas"], kayit["ay_gun"], kodlar + saatler
+
+    blok = bytearray(62)
+    for p in puantaj:
+        if p['gun'] <= max_gun:
+            blok[p['gun'] - 1] = ord(p['durum'])
+            blok[30 + p['gun']] = p['saat']
+    return kayit["brut_maas"], kayit["ay_gun"], bytes(blok)
+
+
+def _parca_hesapla(parca, kurallar):
+    """İşçi süreçte bir parçanın hesaplamalarını yap, alan sırasıyla demetler döndür"""
+    sonuclar = []
+    for brut_maas, ay_gun, blok in parca:
+        kodlar = blok[:31]
+        saatlik_kesinti_toplam = sum(blok[31 + i] for i, kod in enumerate(kodlar) if kod == 83)  # 83 = 'S'
+        sonuc = _hesaplama_sozlugu(brut_maas, ay_gun, kodlar.count(b'C'), kodlar.count(b'Y'),
+                                   kodlar.count(b'I'), kodlar.count(b'D'), kodlar.count(b'R'),
+                                   saatlik_kesinti_toplam, kurallar)
+        sonuclar.append(tuple(sonuc[alan] for alan in HESAPLAMA_ALANLARI))
+    return sonuclar
+
+
+@olcum.olc(kayit=len)
+def paralel_hesapla(kayitlar, kurallar=None, isci_sayisi=None, parca_boyutu=PARALEL_PARCA_BOYUTU):
+    """Ay kayıtlarını süreç havuzunda hesapla; sonuçlar girdi sırasıyla döner
+
+    Kayıtlar sırayla parçalara bölünür (aynı personelin ayları aynı parçada
+    kalır) ve her kayıt işçiye 62 byte'lık blok olarak gönderilir.
+    """
+    kurallar = kurallari_al(kurallar)
+    if isci_sayisi == 1 or len(kayitlar) <= parca_boyutu:
+        # Tek parçada süreç havuzu ve kodlama maliyetine gerek yok
+        return [hesapla(kayit, kurallar) for kayit in kayitlar]
+
+    parcalar = []
+    parca = []
+    onceki_id = None
+    for kayit in kayitlar:
+        # Parça sınırı sadece personel değişiminde
+        if len(parca) >= parca_boyutu and kayit.get("id") != onceki_id:
+            parcalar.append(parca)
+            parca = []
+        parca.append(_kodla(kayit, son_gun(kayit)[0]))
+        onceki_id = kayit.get("id")
+    if parca:
+        parcalar.append(parca)
+
+    with ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+        # map girdi sırasını koruduğu için birleştirme deterministiktir
+        parca_sonuclari = list(havuz.map(_parca_hesapla, parcalar, repeat(kurallar)))
+
+    return [dict(zip(HESAPLAMA_ALANLARI, sonuc)) for sonuclar in parca_sonuclari for sonuc in sonuclar]
+
+
+def kurus(tutar):
+    """TL tutarını tam sayı kuruşa çevir"""
+    return round(tutar * 100)
+
+
+def ozet_katkisi(kayit):
+    """Ay kaydının aylık özete katkısını OZET_ALANLARI sırasıyla getir (tutarlar kuruş)"""
+    kapali = kayit.get("durum") == "KAPATILDI"
+    kesinti = net_maas = 0
+    hesap = kayit.get("hesaplama")
+    if kapali and hesap:
+        kesinti = kurus(hesap["izinli_kesinti"]) + kurus(hesap["devamsiz_kesinti"]) + kurus(hesap["saatlik_kesinti"])
+        net_maas = kurus(hesap["net_maas"])
+    return (1, int(kapali), int(not kapali), kurus(kayit["brut_maas"]), kesinti, net_maas)
+
+
+def ozete_ekle(ozet, katki, isaret=1):
+    """Katkıyı özete ekle (isaret=-1 ile çıkar)
+
+    Tutarlar tam sayı kuruş olduğundan toplam, ekleme/çıkarma sırasından
+    bağımsızdır ve baştan hesaplanan özetle her zaman aynıdır.
+    """
+    for alan, deger in zip(OZET_ALANLARI, katki):
+        ozet[alan] = ozet.get(alan, 0) + isaret * deger
+    return ozet
+
+
+def ozet_tl(ozet):
+    """Kuruşla tutulan özeti TL tutarlarıyla getir (raporlar ve depo.ay_ozeti için)"""
+    return {alan: (deger // 100 if deger % 100 == 0 else deger / 100) if alan in OZET_TUTAR_ALANLARI else deger
+            for alan, deger in ozet.items()}
+
+
+def ozet_kurus(ozet):
+    """TL tutarlarıyla verilen özeti kuruşa çevir (ozet_tl'nin tersi)"""
+    return {alan: kurus(deger) if alan in OZET_TUTAR_ALANLARI else deger for alan, deger in ozet.items()}
+
+
+def ozet_olustur(kayitlar):
+    """Bir ayın kayıtlarından özeti (kuruş) baştan hesapla"""
+    ozet = dict.fromkeys(OZET_ALANLARI, 0)
+    for kayit in kayitlar:
+        ozete_ekle(ozet, ozet_katkisi(kayit))
+    return ozet
@@ -0,0 +1,453 @@
+"""Puantaj ve rapor işlemleri için yerel HTTP servisi
+
+Menüdeki puantaj girişi, ay kapatma, kayıt görüntüleme ve aylık rapor
+işlemleri JSON uç noktaları olarak sunulur. Tüm istekler bellekte tek bir
+depo üzerinde çalışır; istekler iş parçacığı havuzunda işlenir, depo
+erişimi ise sıralanır (depolar iş parçacığı güvenli değildir). Günlük
+yazımları grup kaydıyla diske indirilir: aynı pencere içinde gelen
+girişler tek fsync ile kalıcı olur ve yazım istekleri ancak girişleri
+kalıcı olduktan sonra yanıtlanır. Menü fonksiyonlarının ekrana yazdığı
+uyarılar stdout yerine logging ile "http_servisi" kaydedicisine gönderilir.
+
+    python http_servisi.py [--port 8080] [--isci 8] [--grup-ms 10]
+
+Uç noktalar:
+    GET  /personel                      personel listesi
+    GET  /personel/<id>[?ay=2025-08]    personelin (veya tek ayın) kayıtları
+    POST /puantaj                       {"id", "ay", "gun": "1-5", "kod", "saat", ["ad_soyad", "brut_maas"]}
+    POST /kapat                         {"ay", "id"} veya {"ay", "tumu": true}
+    GET  /rapor/<ay>                    aylık rapor satırları ve toplamları
+    GET  /rapor?donem=2025-Q1&grupla=calisan,ay   (veya bas=&son=) çok aylı rapor
+    GET  /metrikler                     istek sayıları, gecikme, verim ve iç ölçümler (JSON)
+    GET  /metrics                       iç ölçümler Prometheus metin biçiminde (MAAS_OLCUM=1, bkz. olcum.py)
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import queue
+import re
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import kolon_depo
+import komut_satiri
+import maas
+import olcum
+
+GECIKME_ORNEGI = 10000  # Rota başına saklanan son gecikme ölçümü sayısı
+
+kaydedici = logging.getLogger("http_servisi")
+
+
+class MetinYanit(str):
+    """JSON yerine olduğu gibi gönderilecek düz metin yanıt"""
+    icerik_turu = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class IstekHatasi(Exception):
+    """İstek hatalı; mesaj ve HTTP durum koduyla yanıtlanır"""
+
+    def __init__(self, mesaj, durum=400):
+        super().__init__(mesaj)
+        self.durum = durum
+
+
+def yuzdelik(sirali, oran):
+    """Sıralı ölçümlerin yüzdelik değeri (en yakın sıra yöntemi)"""
+    if not sirali:
+        return 0
+    return sirali[min(len(sirali) - 1, max(0, round(oran * len(sirali)) - 1))]
+
+
+class Metrikler:
+    """Rota başına istek sayısı, hata sayısı ve gecikme ölçümleri"""
+
+    def __init__(self):
+        self.baslangic = time.monotonic()
+        self._rotalar = {}  # rota -> [adet, hata, deque(gecikme_sn)]
+        self._kilit = threading.Lock()
+
+    def kaydet(self, rota, sure, basarili):
+        with self._kilit:
+            olcum = self._rotalar.setdefault(rota, [0, 0, deque(maxlen=GECIKME_ORNEGI)])
+            olcum[0] += 1
+            olcum[1] += not basarili
+            olcum[2].append(sure)
+
+    def ozet(self):
+        """Metriklerin JSON'a uygun özeti"""
+        with self._kilit:
+            rotalar = {rota: (adet, hata, sorted(gecikmeler))
+                       for rota, (adet, hata, gecikmeler) in self._rotalar.items()}
+        calisma = time.monotonic() - self.baslangic
+        toplam = sum(adet for adet, _, _ in rotalar.values())
+        return {
+            "calisma_suresi_sn": round(calisma, 3),
+            "istek": toplam,
+            "hata": sum(hata for _, hata, _ in rotalar.values()),
+            "istek_per_sn": round(toplam / calisma, 2) if calisma else 0,
+            "rotalar": {rota: {
+                "adet": adet,
+                "hata": hata,
+                "ort_ms": round(sum(gecikmeler) / len(gecikmeler) * 1000, 3),
+                "p50_ms": round(yuzdelik(gecikmeler, 0.50) * 1000, 3),
+                "p95_ms": round(yuzdelik(gecikmeler, 0.95) * 1000, 3),
+                "p99_ms": round(yuzdelik(gecikmeler, 0.99) * 1000, 3),
+            } for rota, (adet, hata, gecikmeler) in rotalar.items()},
+        }
+
+
+class PuantajServisi:
+    """Paylaşılan depo ve metrikler; depo işlemleri tek tek çalıştırılır"""
+
+    def __init__(self, depo):
+        self.depo = depo
+        self.metrikler = Metrikler()
+        self._kilit = threading.Lock()
+
+    def calistir(self, fonksiyon, args, yazim=False):
+        """komut_satiri alt komut fonksiyonunu depo kilidi altında çalıştır
+
+        yazim ise yanıt, günlüğe eklenen girişler diske indirildikten sonra döner;
+        grup kaydı penceresini kilit dışında bekleyen istekler aynı fsync'i paylaşır.
+        """
+        with self._kilit:
+            try:
+                with ekran_gunluge():
+                    sonuc = fonksiyon(self.depo, args)
+            except komut_satiri.KomutHatasi as e:
+                raise IstekHatasi(str(e))
+            sira = maas.journal_writer().eklenen if yazim else None
+        if sira:
+            maas.journal_writer().kalici_bekle(sira)
+        return sonuc
+
+    def personel_listesi(self):
+        with self._kilit, ekran_gunluge():
+            return [{"id": calisan_id, "ad_soyad": ad_soyad, "aktif": aktif}
+                    for calisan_id, ad_soyad, aktif in self.depo.personel_listesi()]
+
+
+@contextlib.contextmanager
+def ekran_gunluge():
+    """Blokta ekrana yazılanları satır satır logging'e aktar (uyarılar WARNING seviyesinde)
+
+    stdout süreç genelinde yönlendirildiğinden sadece depo kilidi tutulurken kullanılır;
+    depo erişimi sıralı olduğu için başka bir isteğin çıktısı karışmaz.
+    """
+    ekran = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(ekran):
+            yield
+    finally:
+        for satir in ekran.getvalue().splitlines():
+            satir = satir.strip()
+            if satir:
+                seviye = logging.WARNING if satir.startswith(("UYARI", "Uyarı", "HATA")) else logging.INFO
+                kaydedici.log(seviye, satir)
+
+
+# --- İstek gövdesinden komut argümanları ---
+
+def _alan(govde, ad, tur=None, zorunlu=True):
+    """Gövdedeki alanı (gerekirse komut satırındaki dönüştürücüyle) al"""
+    deger = govde.get(ad)
+    if deger is None:
+        if zorunlu:
+            raise IstekHatasi(f"eksik alan: {ad}")
+        return None
+    try:
+        return tur(deger) if tur else deger
+    except (argparse.ArgumentTypeError, TypeError, ValueError) as e:
+        raise IstekHatasi(f"{ad}: {e}")
+
+
+def _gunler(deger):
+    """Gün listesi: 5, [1, 2, 3] veya "1-5,8" """
+    if isinstance(deger, list):
+        deger = ",".join(str(gun) for gun in deger)
+    return komut_satiri._gunler(str(deger))
+
+
+def _args(**alanlar):
+    """Komut fonksiyonlarının beklediği argüman nesnesi (çıktı JSON, yüklü depo kullanılır)"""
+    return argparse.Namespace(bicim="json", batch=True, **alanlar)
+
+
+def _puantaj(servis, govde, sorgu):
+    args = _args(id=str(_alan(govde, "id")), ay=_alan(govde, "ay", komut_satiri._ay),
+                 gun=_alan(govde, "gun", _gunler), kod=str(_alan(govde, "kod")).upper(),
+                 saat=_alan(govde, "saat", int, zorunlu=False),
+                 ad_soyad=_alan(govde, "ad_soyad", str, zorunlu=False),
+                 brut_maas=_alan(govde, "brut_maas", float, zorunlu=False))
+    return servis.calistir(komut_satiri.komut_enter, args, yazim=True)
+
+
+def _kapat(servis, govde, sorgu):
+    args = _args(ay=_alan(govde, "ay", komut_satiri._ay), id=_alan(govde, "id", str, zorunlu=False),
+                 tumu=bool(govde.get("tumu")))
+    return servis.calistir(komut_satiri.komut_close, args, yazim=True)
+
+
+def _personel(servis, calisan_id, sorgu):
+    ay = sorgu.get("ay", [None])[0] or None
+    args = _args(id=calisan_id, ay=_alan({"ay": ay}, "ay", komut_satiri._ay, zorunlu=False))
+    return servis.calistir(komut_satiri.komut_show, args)
+
+
+def _rapor(servis, ay, sorgu):
+    args = _args(ay=_alan({"ay": ay}, "ay", komut_satiri._ay), akis=False)
+    return servis.calistir(komut_satiri.komut_report, args)
+
+
+def _aralik_rapor(servis, sorgu):
+    grupla = sorgu.get("grupla", ["calisan"])[0]
+    args = _args(donem=sorgu.get("donem", [None])[0] or None,
+                 bas=_alan({"bas": sorgu.get("bas", [None])[0] or None}, "bas", komut_satiri._ay, zorunlu=False),
+                 son=_alan({"son": sorgu.get("son", [None])[0] or None}, "son", komut_satiri._ay, zorunlu=False),
+                 grupla=[alan for alan in grupla.split(",") if alan])
+    return servis.calistir(komut_satiri.komut_range_report, args)
+
+
+# (yöntem, yol deseni, işleyici); işleyiciye POST'ta gövde, GET'te yoldaki grup (yüzde kodlaması
+# çözülmüş) ve sorgu verilir
+ROTALAR = (
+    ("GET", re.compile(r"/personel"), lambda servis, sorgu: servis.personel_listesi()),
+    ("GET", re.compile(r"/personel/([^/]+)"), _personel),
+    ("POST", re.compile(r"/puantaj"), _puantaj),
+    ("POST", re.compile(r"/kapat"), _kapat),
+    ("GET", re.compile(r"/rapor/([^/]+)"), _rapor),
+    ("GET", re.compile(r"/rapor"), _aralik_rapor),
+    ("GET", re.compile(r"/metrikler"), lambda servis, sorgu: {**servis.metrikler.ozet(), "olcum": olcum.ozet()}),
+    ("GET", re.compile(r"/metrics"), lambda servis, sorgu: MetinYanit(olcum.prometheus_metni())),
+)
+
+
+def _coz(parca):
+    """Yol parçasının yüzde kodlamasını çöz"""
+    try:
+        return unquote(parca, errors="strict")
+    except UnicodeDecodeError:
+        raise IstekHatasi(f"yol geçerli UTF-8 değil: {parca}")
+
+
+class IstekIsleyici(BaseHTTPRequestHandler):
+    """Tek bağlantının JSON istek/yanıt işleyicisi
+
+    Bağlantı açık tutulur ama havuzdaki iş parçacığını tutmaz: her istek ayrı
+    bir görev olarak işlenir, arada bağlantı HavuzluHTTPServer'ın bekleme
+    döngüsüne döner.
+    """
+    protocol_version = "HTTP/1.1"
+    server_version = "MaasPuantaj/1.0"
+    timeout = 30  # Gelmeye başlamış bir isteğin en uzun okunma süresi
+    wbufsize = -1  # Başlık ve gövde tek paket olarak gönderilir (Nagle/gecikmeli ACK beklemesi olmaz)
+    disable_nagle_algorithm = True
+
+    def __init__(self, request, client_address, server):
+        # BaseRequestHandler'ın aksine bağlantı burada işlenmez; istekler istegi_isle ile tek tek işlenir
+        self.request = request
+        self.client_address = client_address
+        self.server = server
+        self.setup()
+
+    def istegi_isle(self):
+        """Sıradaki isteği işle; bağlantı açık kalacaksa True döndür"""
+        self.handle_one_request()
+        return not self.close_connection
+
+    def do_GET(self):
+        self._isle("GET")
+
+    def do_POST(self):
+        self._isle("POST")
+
+    def _isle(self, yontem):
+        baslangic = time.perf_counter()
+        servis = self.server.servis
+        yol = urlsplit(self.path)
+        rota = f"{yontem} (bulunamadı)"  # Eşleşmeyen yollar metriklerde tek satırda toplanır
+        durum = 200
+        try:
+            for rota_yontemi, desen, isleyici in ROTALAR:
+                eslesme = desen.fullmatch(yol.path)
+                if eslesme and rota_yontemi == yontem:
+                    rota = f"{yontem} {re.sub(r'[(][^)]*[)]', '*', desen.pattern)}"
+                    # Gruplar eşleşmeden sonra çözülür; kimlikteki %2F yol ayracı sayılmaz
+                    argumanlar = ([self._govde()] if yontem == "POST"
+                                  else [_coz(grup) for grup in eslesme.groups()])
+                    yanit = isleyici(servis, *argumanlar, parse_qs(yol.query, keep_blank_values=True))
+                    break
+            else:
+                raise IstekHatasi(f"bulunamadı: {yontem} {unquote(yol.path)}", 404)
+        except IstekHatasi as e:
+            durum, yanit = e.durum, {"hata": str(e)}
+        except Exception as e:  # Beklenmeyen hata servisi durdurmaz
+            durum, yanit = 500, {"hata": f"{type(e).__name__}: {e}"}
+
+        if isinstance(yanit, MetinYanit):
+            icerik, icerik_turu = yanit.encode("utf-8"), yanit.icerik_turu
+        else:
+            icerik = json.dumps(yanit, ensure_ascii=False, default=kolon_depo.json_default).encode("utf-8")
+            icerik_turu = "application/json; charset=utf-8"
+        self.send_response(durum)
+        self.send_header("Content-Type", icerik_turu)
+        self.send_header("Content-Length", str(len(icerik)))
+        self.end_headers()
+        self.wfile.write(icerik)
+        servis.metrikler.kaydet(rota, time.perf_counter() - baslangic, durum < 400)
+
+    def _govde(self):
+        """JSON istek gövdesini oku"""
+        uzunluk = int(self.headers.get("Content-Length") or 0)
+        try:
+            govde = json.loads(self.rfile.read(uzunluk) or b"{}")
+        except (ValueError, UnicodeDecodeError):
+            raise IstekHatasi("gövde geçerli JSON değil")
+        if not isinstance(govde, dict):
+            raise IstekHatasi("gövde JSON nesnesi olmalı")
+        return govde
+
+    def log_message(self, format, *args):
+        if self.server.gunluk:
+            super().log_message(format, *args)
+
+
+class HavuzluHTTPServer(HTTPServer):
+    """İstekleri sabit boyutlu iş parçacığı havuzunda işleyen HTTP sunucusu
+
+    Açık (keep-alive) bağlantılar, yeni istek gelene kadar tek bir bekleme
+    iş parçacığında selectors ile izlenir; istek gelen bağlantı havuza verilir.
+    Böylece boşta bekleyen istemciler havuzdaki iş parçacıklarını tutmaz.
+    """
+
+    request_queue_size = 128  # Aynı anda bağlanan istemciler SYN tekrarına düşmesin
+
+    def __init__(self, adres, servis, isci_sayisi=8, gunluk=False, bosta_sure=60):
+        super().__init__(adres, IstekIsleyici)
+        self.servis = servis
+        self.gunluk = gunluk
+        self.bosta_sure = bosta_sure
+        self.havuz = ThreadPoolExecutor(max_workers=isci_sayisi, thread_name_prefix="http")
+        self._secici = selectors.DefaultSelector()
+        self._donenler = queue.SimpleQueue()  # bekleme döngüsüne dönen bağlantılar
+        self._uyandir_oku, self._uyandir_yaz = socket.socketpair()
+        self._secici.register(self._uyandir_oku, selectors.EVENT_READ)
+        self._kapaniyor = False
+        self._bekleme = threading.Thread(target=self._bekleme_dongusu, name="http-bekleme", daemon=True)
+        self._bekleme.start()
+
+    def process_request(self, request, client_address):
+        try:
+            isleyici = IstekIsleyici(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+            return
+        self.havuz.submit(self._istegi_isle, isleyici)
+
+    def _istegi_isle(self, isleyici):
+        """Havuzda bir isteği işle; bağlantı açık kalacaksa bekleme döngüsüne geri ver"""
+        try:
+            acik = isleyici.istegi_isle()
+        except Exception:
+            self.handle_error(isleyici.request, isleyici.client_address)
+            acik = False
+        if acik and not self._kapaniyor:
+            self._donenler.put(isleyici)
+            self._uyandir_yaz.send(b"\0")
+        else:
+            self._baglantiyi_kapat(isleyici)
+
+    def _baglantiyi_kapat(self, isleyici):
+        try:
+            isleyici.finish()
+        except OSError:
+            pass
+        self.shutdown_request(isleyici.request)
+
+    def _bekleme_dongusu(self):
+        """Açık bağlantıları izle; yeni istek geleni havuza ver, uzun süre boşta kalanı kapat"""
+        son_islem = {}  # isleyici -> son etkinlik zamanı
+        while not self._kapaniyor:
+            for anahtar, _ in self._secici.select(timeout=1):
+                if anahtar.fileobj is self._uyandir_oku:
+                    self._uyandir_oku.recv(4096)
+                    continue
+                self._secici.unregister(anahtar.fileobj)
+                son_islem.pop(anahtar.data, None)
+                self.havuz.submit(self._istegi_isle, anahtar.data)
+            while not self._donenler.empty():
+                isleyici = self._donenler.get()
+                self._secici.register(isleyici.request, selectors.EVENT_READ, isleyici)
+                son_islem[isleyici] = time.monotonic()
+            sinir = time.monotonic() - self.bosta_sure
+            for isleyici in [i for i, zaman in son_islem.items() if zaman < sinir]:
+                self._secici.unregister(isleyici.request)
+                del son_islem[isleyici]
+                self._baglantiyi_kapat(isleyici)
+        for isleyici in son_islem:
+            self._baglantiyi_kapat(isleyici)
+
+    def server_close(self):
+        self._kapaniyor = True
+        self._uyandir_yaz.send(b"\0")
+        self._bekleme.join()
+        super().server_close()
+        self.havuz.shutdown(wait=True)
+        self._secici.close()
+        self._uyandir_oku.close()
+        self._uyandir_yaz.close()
+
+
+def sunucu_olustur(adres="127.0.0.1", port=8080, isci_sayisi=8, grup_ms=10, gunluk=False):
+    """Depoyu yükleyip sunucuyu oluştur (port 0 ise boş bir port seçilir)"""
+    # Eşzamanlı isteklerin günlük yazımları aynı fsync'i paylaşır
+    maas.JOURNAL_GROUP_COMMIT_WINDOW = grup_ms / 1000
+    servis = PuantajServisi(maas.get_depo(paylasimli=True))
+    return HavuzluHTTPServer((adres, port), servis, isci_sayisi, gunluk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maaş & Puantaj HTTP servisi")
+    parser.add_argument("--adres", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--isci", type=int, default=8, help="istek işleyen iş parçacığı sayısı")
+    parser.add_argument("--grup-ms", type=float, default=float(os.environ.get("MAAS_GROUP_COMMIT_MS", "10")),
+                        help="günlük grup kaydı penceresi (0: her giriş ayrı fsync)")
+    parser.add_argument("--gunluk", action="store_true", help="her isteği stderr'e yaz")
+    parser.add_argument("--profil", "--profile", metavar="DOSYA",
+                        help="servis kapanınca cProfile istatistiklerini dosyaya yaz")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.gunluk else logging.WARNING,
+                        format="%(asctime)s %(levelname)s %(message)s")
+    if args.profil:
+        olcum.profille(args.profil, servisi_calistir, args)
+    else:
+        servisi_calistir(args)
+
+
+def servisi_calistir(args):
+    """Komut satırı seçenekleriyle servisi başlat, Ctrl+C ile durdur"""
+    sunucu = sunucu_olustur(args.adres, args.port, args.isci, args.grup_ms, args.gunluk)
+    print(f"Servis http://{sunucu.server_address[0]}:{sunucu.server_address[1]} adresinde çalışıyor "
+          f"({args.isci} işçi, grup kaydı {args.grup_ms:g} ms)")
+    try:
+        sunucu.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sunucu.server_close()
+
+
+if __name__ == "__main__":
+    main()
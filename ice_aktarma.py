@@ -0,0 +1,208 @@
+"""Toplu puantaj içe aktarma
+
+Turnike ve kart okuyucu sistemlerinin dışa aktardığı (calisan_id, tarih, kod,
+saat) satırları CSV veya JSON-lines dosyasından akış halinde okunur, menüdeki
+puantaj girişiyle aynı kurallarla doğrulanır ve tek kayıt işlemiyle yazılır:
+
+    python maas.py import puantaj.csv [--hatalari-atla]
+
+CSV dosyasında başlık satırı isteğe bağlıdır; sütunlar sırasıyla calisan_id,
+tarih (YYYY-AA-GG), kod ve saattir. JSON-lines dosyasında her satır
+{"calisan_id": ..., "tarih": ..., "kod": ..., "saat": ...} nesnesidir.
+"""
+import csv
+import json
+
+DURUM_KODLARI = frozenset("CIDYSR")
+MAX_SAAT = 12
+HATA_SINIRI = 1000  # Saklanan hata mesajı sayısı; fazlası sadece sayılır
+
+# Kabul edilen alan adları (JSON-lines anahtarları ve CSV başlığı)
+_ALANLAR = (
+    ("calisan_id", "id"),
+    ("tarih", "date"),
+    ("kod", "durum", "code"),
+    ("saat", "hours"),
+)
+
+
+def _csv_satirlari(dosya_yolu, ayrac):
+    """CSV dosyasından (satir_no, calisan_id, tarih, kod, saat) üret"""
+    with open(dosya_yolu, newline="", encoding="utf-8-sig") as f:
+        for satir_no, satir in enumerate(csv.reader(f, delimiter=ayrac), 1):
+            if not satir:
+                continue
+            # İlk satır başlıksa atlanır
+            if satir_no == 1 and satir[0].strip().lower() in _ALANLAR[0]:
+                continue
+            calisan_id, tarih, kod, saat = (satir + ["", "", "", ""])[:4]
+            yield satir_no, calisan_id, tarih, kod, saat
+
+
+def _jsonl_satirlari(dosya_yolu):
+    """JSON-lines dosyasından (satir_no, calisan_id, tarih, kod, saat) üret"""
+    with open(dosya_yolu, encoding="utf-8-sig") as f:
+        for satir_no, satir in enumerate(f, 1):
+            satir = satir.strip()
+            if not satir:
+                continue
+            try:
+                nesne = json.loads(satir)
+            except json.JSONDecodeError:
+                nesne = None
+            if not isinstance(nesne, dict):
+                yield satir_no, None, None, None, None
+                continue
+            yield (satir_no,) + tuple(next((nesne[ad] for ad in adlar if ad in nesne), "") for adlar in _ALANLAR)
+
+
+def satirlari_oku(dosya_yolu, bicim=None, ayrac=","):
+    """Dosyadaki puantaj satırlarını akış halinde oku (bicim: "csv" veya "jsonl", uzantıdan bulunur)"""
+    if bicim is None:
+        bicim = "jsonl" if dosya_yolu.lower().endswith((".jsonl", ".ndjson")) else "csv"
+    if bicim == "jsonl":
+        return _jsonl_satirlari(dosya_yolu)
+    return _csv_satirlari(dosya_yolu, ayrac)
+
+
+def ice_aktar(depo, satirlar, hatalari_atla=False, yeni_personeller=None):
+    """Puantaj satırlarını doğrulayıp depoya tek işlemle yaz
+
+    Kayıtlı olmayan personel, geçersiz tarih/kod/saat, işten çıkış tarihinden
+    sonraki gün ve kapatılmış ay hatalıdır. Hata varsa hiçbir şey yazılmaz;
+    hatalari_atla ile sadece geçerli satırlar yazılır. Zaten girilmiş günler
+    menüdeki gibi korunur. Eksik ay kayıtları get_month_days ile oluşturulur.
+    yeni_personeller ({calisan_id: {"ad_soyad", "brut_maas"}}) depoda olmayan
+    personelleri tanımlar; ilk ay kayıtları satırlarla aynı işlemde yazılır.
+    Sonuç sayımlarını ve hata mesajlarını içeren sözlük döndürür.
+    """
+    from maas import get_month_days
+
+    sonuc = {"okunan": 0, "eklenen": 0, "mevcut": 0, "yeni_ay": 0, "hata_sayisi": 0,
+             "hatalar": [], "yazildi": False}
+    personeller = {}  # calisan_id -> ilk ay kaydı (kayıtlı değilse None)
+    aylar = {}  # (calisan_id, ay) -> [kayıt kopyası, girilmiş günler, yeni mi] (kapatılmışsa None)
+    ay_gunleri = {}  # ay -> gün sayısı
+    degisenler = set()
+
+    def hata(satir_no, mesaj):
+        sonuc["hata_sayisi"] += 1
+        if len(sonuc["hatalar"]) < HATA_SINIRI:
+            sonuc["hatalar"].append(f"{satir_no}. satır: {mesaj}")
+
+    for satir_no, calisan_id, tarih, kod, saat in satirlar:
+        sonuc["okunan"] += 1
+        if calisan_id is None:
+            hata(satir_no, "satır okunamadı")
+            continue
+        calisan_id = str(calisan_id).strip()
+        tarih = str(tarih).strip()
+        kod = str(kod).strip().upper()
+
+        # Tarih her satırda strptime yerine parça parça doğrulanır
+        if (len(tarih) != 10 or tarih[4] != "-" or tarih[7] != "-"
+                or not (tarih[:4] + tarih[5:7] + tarih[8:]).isdigit() or not 1 <= int(tarih[5:7]) <= 12):
+            hata(satir_no, f"geçersiz tarih: {tarih}")
+            continue
+        ay = tarih[:7]
+        gun = int(tarih[8:])
+        if ay not in ay_gunleri:
+            ay_gunleri[ay] = get_month_days(ay)
+        if not 1 <= gun <= ay_gunleri[ay]:
+            hata(satir_no, f"geçersiz tarih: {tarih}")
+            continue
+
+        if kod not in DURUM_KODLARI:
+            hata(satir_no, f"geçersiz kod: {kod}")
+            continue
+        saat = str(saat).strip()
+        if kod == 'S':
+            if not saat.isdigit() or not 1 <= int(saat) <= MAX_SAAT:
+                hata(satir_no, f"S kodu için saat 1-{MAX_SAAT} arası olmalı: {saat}")
+                continue
+            saat = int(saat)
+        elif saat in ("", "0"):
+            saat = 0
+        else:
+            hata(satir_no, f"saat sadece S kodunda girilir: {saat}")
+            continue
+
+        if calisan_id not in personeller:
+            kayitlar = depo.personel_kayitlari(calisan_id)
+            personeller[calisan_id] = kayitlar[0] if kayitlar else (yeni_personeller or {}).get(calisan_id)
+        personel = personeller[calisan_id]
+        if personel is None:
+            hata(satir_no, f"kayıtlı personel değil: {calisan_id}")
+            continue
+        # ISO tarihler metin olarak karşılaştırılabilir
+        if personel.get("isten_cikma_tarihi") and tarih > personel["isten_cikma_tarihi"]:
+            hata(satir_no, f"işten çıkış tarihinden ({personel['isten_cikma_tarihi']}) sonra: {tarih}")
+            continue
+
+        anahtar = (calisan_id, ay)
+        if anahtar not in aylar:
+            mevcut = depo.ay_kaydi(calisan_id, ay)
+            if mevcut is None:
+                kayit = {
+                    "id": calisan_id,
+                    "ad_soyad": personel["ad_soyad"],
+                    "ay": ay,
+                    "brut_maas": personel["brut_maas"],
+                    "ay_gun": ay_gunleri[ay],
+                    "puantaj": [],
+                    "hesaplama": {},
+                    "durum": "KAPATILMAMIŞ",
+                    "aktif": personel.get("aktif", True),
+                    "isten_cikma_tarihi": personel.get("isten_cikma_tarihi", None)
+                }
+                aylar[anahtar] = [kayit, set(), True]
+            elif mevcut.get("durum") == "KAPATILDI":
+                aylar[anahtar] = None
+            else:
+                # Depodaki kayıt, yazım başarılı olana kadar değiştirilmez
+                kayit = dict(mevcut, puantaj=list(mevcut["puantaj"]))
+                aylar[anahtar] = [kayit, {p['gun'] for p in kayit["puantaj"]}, False]
+        if aylar[anahtar] is None:
+            hata(satir_no, f"{ay} ayı kapatılmış")
+            continue
+
+        kayit, gunler, _ = aylar[anahtar]
+        if gun in gunler:
+            sonuc["mevcut"] += 1
+            continue
+        gunler.add(gun)
+        kayit["puantaj"].append({'gun': gun, 'durum': kod, 'saat': saat})
+        degisenler.add(anahtar)
+        sonuc["eklenen"] += 1
+
+    if sonuc["hata_sayisi"] and not hatalari_atla:
+        return sonuc
+
+    yazilacaklar = []
+    # Yeni ay kayıtları personelin listesine ay sırasıyla eklenir
+    for anahtar in sorted(degisenler, key=lambda a: a[1]):
+        kayit, _, yeni = aylar[anahtar]
+        kayit["puantaj"].sort(key=lambda p: p['gun'])
+        yazilacaklar.append((anahtar[0], kayit))
+        sonuc["yeni_ay"] += yeni
+    # Tüm değişiklikler tek kayıt işlemiyle yazılır
+    sonuc["yazildi"] = depo.ay_kayitlarini_yaz(yazilacaklar) if yazilacaklar else True
+    return sonuc
+
+
+def ice_aktarma_raporu(sonuc, hatalari_atla=False):
+    """İçe aktarma sonucunu yazdır"""
+    print(f"Okunan satır: {sonuc['okunan']}")
+    print(f"Geçerli yeni gün: {sonuc['eklenen']} (yeni ay kaydı: {sonuc['yeni_ay']})")
+    print(f"Zaten girilmiş olduğu için atlanan gün: {sonuc['mevcut']}")
+    if sonuc["hata_sayisi"]:
+        print(f"Hatalı satır: {sonuc['hata_sayisi']}")
+        for mesaj in sonuc["hatalar"][:20]:
+            print(f"  {mesaj}")
+        if sonuc["hata_sayisi"] > 20:
+            print(f"  ... ve {sonuc['hata_sayisi'] - 20} hata daha")
+        if not hatalari_atla:
+            print("Hatalı satırlar olduğu için hiçbir kayıt yazılmadı (--hatalari-atla ile geçerliler yazılır).")
+            return
+    if not sonuc["yazildi"]:
+        print("HATA: Veri kaydedilemedi!")
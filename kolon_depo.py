@@ -0,0 +1,159 @@
+"""Sıkıştırılmış kolon tabanlı puantaj deposu
+
+Her personel-ay kaydının puantajı, 31 günlük sabit bir durum kodu dizisi ve
+buna paralel bir saat dizisi olarak tutulur. Dosya biçimi:
+
+    MAGIC (5 byte) | meta uzunluğu (4 byte) | meta JSON | kayıt başına 62 byte
+
+Meta JSON, puantaj alanı çıkarılmış ay kayıtlarını personel sırasıyla içerir;
+ardından her kayıt için 31 byte durum kodu ve 31 byte saat gelir.
+"""
+import struct
+
+import olcum
+import serilestirme
+from guvenli_yazim import atomik_yaz
+
+MAGIC = b"MPKD1"
+MAX_GUN = 31
+DURUM_KODLARI = "CIDYSR"
+# Durum kodu byte değerleri: 0 = girilmemiş, 1.. = DURUM_KODLARI sırası
+_KOD_DEGERI = {kod: i + 1 for i, kod in enumerate(DURUM_KODLARI)}
+_BLOK = 2 * MAX_GUN
+# Byte değerinden ASCII durum koduna çeviri tablosu (0 -> 0)
+_ASCII_TABLOSU = bytes([0] + [ord(kod) for kod in DURUM_KODLARI] + [0] * (255 - len(DURUM_KODLARI)))
+
+
+class PuantajDizisi:
+    """Bir ayın puantajını sözlük listesi gibi gösteren kompakt dizi"""
+    __slots__ = ("_kodlar", "_saatler", "_adet")
+
+    def __init__(self, girdiler=(), kodlar=None, saatler=None):
+        if kodlar is not None:
+            self._kodlar = kodlar
+            self._saatler = saatler
+            self._adet = MAX_GUN - kodlar.count(0)
+            return
+
+        self._kodlar = bytearray(MAX_GUN)
+        self._saatler = bytearray(MAX_GUN)
+        self._adet = 0
+        for girdi in girdiler:
+            self.append(girdi)
+
+    def append(self, girdi):
+        """Tek günlük girişi ekle ({'gun', 'durum', 'saat'})"""
+        gun = girdi["gun"]
+        if not 1 <= gun <= MAX_GUN:
+            raise ValueError(f"Geçersiz gün: {gun}")
+        if girdi["durum"] not in _KOD_DEGERI:
+            raise ValueError(f"Geçersiz durum kodu: {girdi['durum']}")
+
+        i = gun - 1
+        if not self._kodlar[i]:
+            self._adet += 1
+        self._kodlar[i] = _KOD_DEGERI[girdi["durum"]]
+        self._saatler[i] = girdi.get("saat", 0)
+
+    def _girdi(self, i):
+        return {'gun': i + 1, 'durum': DURUM_KODLARI[self._kodlar[i] - 1], 'saat': self._saatler[i]}
+
+    def __iter__(self):
+        kodlar = self._kodlar
+        for i in range(MAX_GUN):
+            if kodlar[i]:
+                yield self._girdi(i)
+
+    def __len__(self):
+        return self._adet
+
+    def __getitem__(self, index):
+        return self.tolist()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, PuantajDizisi):
+            return self._kodlar == other._kodlar and self._saatler == other._saatler
+        return sorted(self.tolist(), key=lambda p: p['gun']) == sorted(other, key=lambda p: p['gun'])
+
+    def __repr__(self):
+        return f"PuantajDizisi({self.tolist()!r})"
+
+    def tolist(self):
+        """Eski biçimdeki sözlük listesine çevir"""
+        return list(self)
+
+    def bloklar(self):
+        """(ASCII durum kodları, saatler) olarak iki 31 byte'lık blok getir"""
+        return bytes(self._kodlar).translate(_ASCII_TABLOSU), bytes(self._saatler)
+
+    def to_bytes(self):
+        """Durum kodu ve saat dizilerini tek blok olarak getir"""
+        return bytes(self._kodlar) + bytes(self._saatler)
+
+
+def json_default(nesne):
+    """json.dump için PuantajDizisi dönüştürücüsü"""
+    if isinstance(nesne, PuantajDizisi):
+        return nesne.tolist()
+    raise TypeError(f"{type(nesne).__name__} JSON'a çevrilemez")
+
+
+def yaz(data, dosya_yolu):
+    """Verileri kolon biçiminde dosyaya yaz"""
+    meta = []
+    bloklar = []
+    for calisan_id, kayitlar in data.items():
+        ay_kayitlari = []
+        for kayit in kayitlar:
+            puantaj = kayit["puantaj"]
+            if not isinstance(puantaj, PuantajDizisi):
+                puantaj = PuantajDizisi(puantaj)
+            bloklar.append(puantaj.to_bytes())
+            ay_kayitlari.append({k: v for k, v in kayit.items() if k != "puantaj"})
+        meta.append([calisan_id, ay_kayitlari])
+
+    meta_bytes = serilestirme.dumps(meta)
+    with atomik_yaz(dosya_yolu, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(meta_bytes)))
+        f.write(meta_bytes)
+        f.write(b"".join(bloklar))
+
+
+def oku(dosya_yolu):
+    """Kolon biçimindeki dosyayı eski kayıt yapısıyla yükle
+
+    Önce başlık ve meta okunur; kayıt sayısı bilindiğinden puantaj blokları tek
+    bir tampona readinto ile okunur ve her kaydın dizileri bu tamponun
+    memoryview dilimlerinden kopyalanır. Dosyanın tamamı ve ara dilim
+    kopyaları bellekte tutulmaz.
+    """
+    with open(dosya_yolu, "rb") as f:
+        baslik = f.read(len(MAGIC) + 4)
+        if len(baslik) < len(MAGIC) + 4 or baslik[:len(MAGIC)] != MAGIC:
+            raise ValueError("Geçersiz kolon dosyası")
+        (meta_uzunlugu,) = struct.unpack_from("<I", baslik, len(MAGIC))
+        meta_bytes = f.read(meta_uzunlugu)
+        if len(meta_bytes) < meta_uzunlugu:
+            raise ValueError("Kolon dosyası eksik (yarım kalmış yazım)")
+        meta = serilestirme.loads(meta_bytes)
+        del meta_bytes
+
+        kayit_sayisi = sum(len(kayitlar) for _, kayitlar in meta)
+        tampon = bytearray(kayit_sayisi * _BLOK)
+        okunan = f.readinto(tampon)
+    olcum.say("dosya.okunan_bayt", len(baslik) + meta_uzunlugu + okunan)
+    if okunan < len(tampon):
+        raise ValueError("Kolon dosyası eksik (yarım kalmış yazım)")
+
+    bloklar = memoryview(tampon)
+    konum = 0
+    data = {}
+    for calisan_id, kayitlar in meta:
+        for kayit in kayitlar:
+            kayit["puantaj"] = PuantajDizisi(kodlar=bytearray(bloklar[konum:konum + MAX_GUN]),
+                                             saatler=bytearray(bloklar[konum + MAX_GUN:konum + _BLOK]))
+            konum += _BLOK
+        data[calisan_id] = kayitlar
+    bloklar.release()
+    return data
@@ -0,0 +1,491 @@
+"""Menüsüz komut satırı arayüzü
+
+Gece çalışan işler ve betikler için maas.py alt komutlarla çağrılır; sonuç
+stdout'a JSON (varsayılan) veya CSV olarak yazılır, uyarı ve hata mesajları
+stderr'e gider. Çıkış kodu başarıda 0, hatada 1'dir.
+
+    python maas.py enter --id 100 --ay 2025-08 --gun 1-5 --kod C
+    python maas.py prefill --ay 2025-08 --ay 2025-09
+    python maas.py close --ay 2025-08 --tumu
+    python maas.py report --ay 2025-08 --bicim csv
+    python maas.py range-report --donem 2025-Q3 --grupla calisan ay
+    python maas.py export bordro.xlsx --bas 2025-01 --son 2025-06
+    python maas.py batch < komutlar.txt
+    MAAS_OLCUM=1 MAAS_OLCUM_DOSYASI=maas.prom python maas.py --profil maas.prof close --ay 2025-08 --tumu
+
+batch komutu her satırı ayrı bir alt komut olarak, aynı depo üzerinde ve veriler
+yeniden yüklenmeden çalıştırır; her komutun sonucu bir JSON satırıdır.
+
+MAAS_OLCUM ile süre ve sayaç ölçümleri, --profil ile cProfile istatistikleri alınır (bkz. olcum.py).
+"""
+import argparse
+import contextlib
+import csv
+import json
+import shlex
+import sys
+from datetime import datetime
+
+import akis_json
+import disa_aktarma
+import hesaplama
+import kolon_depo
+import maas
+import olcum
+import raporlama
+import takvim
+
+class KomutHatasi(Exception):
+    """Komut yerine getirilemedi (mesaj stderr'e yazılır)"""
+
+
+def _ay(deger):
+    if not maas.validate_month(deger):
+        raise argparse.ArgumentTypeError("Geçersiz ay formatı! Örnek: 2025-08")
+    return deger
+
+
+def _tarih(deger):
+    if not maas.validate_date(deger):
+        raise argparse.ArgumentTypeError("Geçersiz tarih formatı! Örnek: 2025-08-21")
+    return deger
+
+
+def _gunler(deger):
+    """'1-5,8,10' biçimindeki gün listesini çöz"""
+    gunler = []
+    try:
+        for parca in deger.split(","):
+            bas, _, son = parca.partition("-")
+            gunler.extend(range(int(bas), int(son or bas) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError("Geçersiz gün listesi! Örnek: 1-5,8,10")
+    return gunler
+
+
+def _kayit_bul(depo, calisan_id, ay=None):
+    """Personelin kayıtlarını (veya tek ay kaydını) getir, yoksa hata ver"""
+    kayitlar = depo.personel_kayitlari(calisan_id)
+    if not kayitlar:
+        raise KomutHatasi(f"Bu ID'ye ait personel yok: {calisan_id}")
+    if ay is None:
+        return kayitlar
+    kayit = depo.ay_kaydi(calisan_id, ay)
+    if kayit is None:
+        raise KomutHatasi(f"{calisan_id} için {ay} ayı kaydı yok")
+    return kayit
+
+
+class _TembelDepo:
+    """Depoyu ilk kullanımda oluşturan vekil
+
+    Akışlı yollar (close --tumu, report --akis, export) depoya hiç dokunmadığından
+    veri dosyası tamamen yüklenip indekslenmez; bellek kullanımı sınırlı kalır.
+    """
+
+    def __init__(self):
+        self._depo = None
+
+    def __getattr__(self, ad):
+        if self._depo is None:
+            self._depo = maas.get_depo()
+        return getattr(self._depo, ad)
+
+
+# --- Alt komutlar ---
+
+def komut_enter(depo, args):
+    """Puantaj girişi (eksik ay kaydı oluşturulur; yeni personel için --ad-soyad ve --brut-maas)"""
+    import ice_aktarma
+
+    yeni_personeller = None
+    if not depo.personel_kayitlari(args.id):
+        if not args.ad_soyad or args.brut_maas is None:
+            raise KomutHatasi("Yeni personel için --ad-soyad ve --brut-maas gerekli")
+        # Personelin ilk ay kaydı ancak girilen günler geçerliyse, günlerle birlikte yazılır
+        yeni_personeller = {args.id: {"ad_soyad": args.ad_soyad, "brut_maas": args.brut_maas}}
+
+    # Doğrulama ve ay kaydı oluşturma toplu içe aktarmayla aynıdır
+    satirlar = ((i, args.id, f"{args.ay}-{gun:02d}", args.kod, args.saat or "")
+                for i, gun in enumerate(args.gun, 1))
+    sonuc = ice_aktarma.ice_aktar(depo, satirlar, yeni_personeller=yeni_personeller)
+    if sonuc["hata_sayisi"]:
+        raise KomutHatasi("; ".join(sonuc["hatalar"][:20]))
+    if not sonuc["yazildi"]:
+        raise KomutHatasi("Veri kaydedilemedi!")
+    return {k: sonuc[k] for k in ("eklenen", "mevcut", "yeni_ay")}
+
+
+def komut_close(depo, args):
+    """Tek personelin ayını (--id) veya ayın tüm kapatılabilir kayıtlarını (--tumu) kapat"""
+    if args.tumu:
+        # JSON dosyası tamamı belleğe alınmadan akış halinde işlenir; batch içinde
+        # ise yüklü depo kullanılır ki sonraki komutlar dosyayı yeniden okumasın
+        if maas.STORAGE_FORMAT == "json" and not getattr(args, "batch", False):
+            kapatilanlar, atlananlar = maas.ay_toplu_kapat_akisli(args.ay)
+        else:
+            kapatilanlar, atlananlar = maas.ay_toplu_kapat(args.ay, depo)
+        maas.toplu_kapatma_raporu(args.ay, kapatilanlar, atlananlar)
+        if kapatilanlar is None:
+            raise KomutHatasi("Veri kaydedilemedi!")
+        return [{"id": k["id"], "ad_soyad": k["ad_soyad"], "durum": "KAPATILDI",
+                 "net_maas": k["hesaplama"]["net_maas"], "eksik_gunler": ""} for k in kapatilanlar] + \
+               [{"id": a["id"], "ad_soyad": a["ad_soyad"], "durum": "ATLANDI", "net_maas": "",
+                 "eksik_gunler": ",".join(str(g) for g in a["eksik_gunler"])} for a in atlananlar]
+
+    if not args.id:
+        raise KomutHatasi("--id veya --tumu gerekli")
+    kayit = _kayit_bul(depo, args.id, args.ay)
+    if kayit.get("durum") == "KAPATILDI":
+        raise KomutHatasi(f"{args.ay} ayı zaten kapatılmış")
+    max_gun, _, _, _ = hesaplama.kapatma_kontrolu(kayit)
+    eksik_gunler = hesaplama.kapatilabilir_mi(kayit)
+    if eksik_gunler:
+        raise KomutHatasi("Eksik puantaj günleri var: " + ", ".join(str(g) for g in eksik_gunler))
+
+    kayit = dict(kayit, hesaplama=hesaplama.hesapla(kayit, max_gun=max_gun), durum="KAPATILDI",
+                 kapatma_tarihi=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    if not depo.ay_kaydi_yaz(args.id, kayit):
+        raise KomutHatasi("Veri kaydedilemedi!")
+    return dict({"id": args.id, "ay": args.ay}, **kayit["hesaplama"])
+
+
+def komut_show(depo, args):
+    """Personelin ay kayıtlarını göster (CSV'de puantaj hariç)"""
+    kayitlar = [_kayit_bul(depo, args.id, args.ay)] if args.ay else _kayit_bul(depo, args.id)
+    if args.bicim == "csv":
+        return [dict({k: v for k, v in kayit.items() if k not in ("puantaj", "hesaplama")},
+                     **(kayit.get("hesaplama") or {})) for kayit in kayitlar]
+    return kayitlar
+
+
+def komut_terminate(depo, args):
+    """Personeli işten çıkar"""
+    kayitlar = _kayit_bul(depo, args.id)
+    if not kayitlar[0].get("aktif", True):
+        raise KomutHatasi("Bu personel zaten işten çıkmış!")
+    tarih = args.tarih or datetime.now().strftime("%Y-%m-%d")
+    if not depo.personel_guncelle(args.id, {"aktif": False, "isten_cikma_tarihi": tarih}):
+        raise KomutHatasi("Veri kaydedilemedi!")
+    return {"id": args.id, "aktif": False, "isten_cikma_tarihi": tarih}
+
+
+def komut_edit(depo, args):
+    """Personelin adını, açık aylarının brüt maaşını değiştir veya işe geri al"""
+    kayitlar = _kayit_bul(depo, args.id)
+    degisenler = {}
+    if args.ad_soyad:
+        if not depo.personel_guncelle(args.id, {"ad_soyad": args.ad_soyad}):
+            raise KomutHatasi("Veri kaydedilemedi!")
+        degisenler["ad_soyad"] = args.ad_soyad
+    if args.brut_maas is not None:
+        # Menüdeki gibi sadece kapatılmamış aylar güncellenir
+        if not depo.personel_guncelle(args.id, {"brut_maas": args.brut_maas}, sadece_acik=True):
+            raise KomutHatasi("Veri kaydedilemedi!")
+        degisenler["brut_maas"] = args.brut_maas
+    if args.ise_geri_al:
+        if kayitlar[0].get("aktif", True):
+            raise KomutHatasi("Personel zaten aktif.")
+        if not depo.personel_guncelle(args.id, {"aktif": True, "isten_cikma_tarihi": None}):
+            raise KomutHatasi("Veri kaydedilemedi!")
+        degisenler.update(aktif=True, isten_cikma_tarihi=None)
+    if not degisenler:
+        raise KomutHatasi("Değiştirilecek alan yok (--ad-soyad, --brut-maas veya --ise-geri-al)")
+    return dict({"id": args.id}, **degisenler)
+
+
+def komut_report(depo, args):
+    """Aylık rapor (JSON: satırlar ve toplamlar, CSV: satırlar)"""
+    if args.akis:
+        satirlar, ozet = maas.aylik_rapor_akisli(args.ay)
+    else:
+        satirlar = [maas.rapor_satiri(kayit) for kayit in depo.ay_kayitlari(args.ay)]
+        ozet = depo.ay_ozeti(args.ay)
+    satirlar.sort(key=lambda x: x['ad_soyad'])
+    if args.bicim == "csv":
+        return satirlar
+    return {"ay": args.ay, "satirlar": satirlar, "toplamlar": ozet}
+
+
+def komut_range_report(depo, args):
+    """Ay aralığı raporu: --donem (2025, 2025-Q2, ytd) veya --bas/--son, --grupla ile gruplanır"""
+    try:
+        if args.donem:
+            aylar = raporlama.donem_aylari(args.donem)
+        elif args.bas:
+            aylar = raporlama.ay_araligi(args.bas, args.son or args.bas)
+        else:
+            raise KomutHatasi("--donem veya --bas gerekli")
+        satirlar, toplam = raporlama.motor(depo).rapor(aylar, args.grupla)
+    except ValueError as e:
+        raise KomutHatasi(str(e))
+    if args.bicim == "csv":
+        return satirlar
+    return {"aylar": [aylar[0], aylar[-1]] if aylar else [], "grupla": list(args.grupla),
+            "satirlar": satirlar, "toplam": toplam}
+
+
+def komut_backup(depo, args):
+    """Yedek oluştur (--listele ile mevcut yedekleri listele)"""
+    if not args.listele and not maas.create_backup():
+        raise KomutHatasi("Yedek oluşturulamadı!")
+    yedekler = [{"ad": y["ad"], "zaman": y["zaman"], "boyut": y["boyut"]} for y in maas.list_backups()]
+    return yedekler if args.listele else yedekler[0]
+
+
+def komut_restore(depo, args):
+    """Adı veya sırası (1 = en yeni) verilen yedeği geri yükle"""
+    yedekler = maas.list_backups()
+    secilen = next((y for y in yedekler if y["ad"] == args.yedek), None)
+    if secilen is None and args.yedek.isdigit() and 1 <= int(args.yedek) <= len(yedekler):
+        secilen = yedekler[int(args.yedek) - 1]
+    if secilen is None:
+        raise KomutHatasi(f"Yedek bulunamadı: {args.yedek}")
+    depo.hepsini_yaz(maas.read_backup(secilen))
+    return {"ad": secilen["ad"], "zaman": secilen["zaman"]}
+
+
+def komut_export(depo, args):
+    """Verileri dışa aktar: .csv/.xlsx/.parquet dosyasına bordro veya puantaj satırları, diğer
+    uzantılarda tüm veriler eski biçimde, girintili JSON olarak"""
+    bicim = disa_aktarma.bicim_bul(args.dosya)
+    if bicim is None:
+        try:
+            adet = akis_json.yaz(maas.personel_akisi(), args.dosya, default=kolon_depo.json_default,
+                                 girintili=not args.sikisik)
+        except (ValueError, IOError) as e:
+            raise KomutHatasi(f"Dışa aktarılamadı: {e}")
+        return {"dosya": args.dosya, "personel": adet}
+
+    aylar = args.ay
+    if args.bas:
+        aylar = (aylar or []) + raporlama.ay_araligi(args.bas, args.son or args.bas)
+    try:
+        adet = disa_aktarma.disa_aktar(maas.personel_akisi(), args.dosya, icerik=args.icerik, bicim=bicim,
+                                       aylar=aylar)
+    except (ValueError, IOError, ImportError) as e:
+        raise KomutHatasi(f"Dışa aktarılamadı: {e}")
+    return {"dosya": args.dosya, "bicim": bicim, "icerik": args.icerik, "satir": adet}
+
+
+def komut_import(depo, args):
+    """CSV veya JSON-lines dosyasından toplu puantaj aktar"""
+    import ice_aktarma
+
+    try:
+        sonuc = ice_aktarma.ice_aktar(depo, ice_aktarma.satirlari_oku(args.dosya), args.hatalari_atla)
+    except (IOError, UnicodeDecodeError) as e:
+        raise KomutHatasi(f"Dosya okunurken hata oluştu: {e}")
+    ice_aktarma.ice_aktarma_raporu(sonuc, args.hatalari_atla)
+    if sonuc["hata_sayisi"] and not args.hatalari_atla:
+        raise KomutHatasi(f"{sonuc['hata_sayisi']} hatalı satır, hiçbir kayıt yazılmadı: "
+                          + "; ".join(sonuc["hatalar"][:20]))
+    if not sonuc["yazildi"]:
+        raise KomutHatasi("Veri kaydedilemedi!")
+    return sonuc
+
+
+def komut_prefill(depo, args):
+    """Ayların açık kayıtlarında eksik hafta sonu ve resmi tatil günlerini politikaya göre doldur"""
+    try:
+        if args.politika:
+            takvim.politika_yukle(args.politika)
+        else:
+            takvim.politika()
+    except (IOError, ValueError) as e:
+        raise KomutHatasi(f"Takvim politikası okunamadı: {e}")
+    sonuc = maas.puantaj_on_doldur(args.ay, depo, set(args.id) if args.id else None)
+    if sonuc is None:
+        raise KomutHatasi("Veri kaydedilemedi!")
+    return {"kayit": sonuc[0], "gun": sonuc[1]}
+
+
+def komut_recompute(depo, args):
+    """Kapatılmış ayları yeniden hesapla"""
+    degisen = maas.kapali_aylari_yeniden_hesapla(args.ay, depo, args.isci)
+    if degisen is None:
+        raise KomutHatasi("Veri kaydedilemedi!")
+    return {"degisen": degisen}
+
+
+def komut_check_summaries(depo, args):
+    """Aylık özetleri baştan oluştur; tutarsız ay varsa çıkış kodu 1"""
+    farkli = depo.ozetleri_yeniden_olustur()
+    if farkli:
+        raise KomutHatasi(f"Tutarsız özet bulunan ve düzeltilen aylar: {', '.join(farkli)}")
+    return {"tutarsiz_aylar": []}
+
+
+def komut_batch(depo, args):
+    """Komutları satır satır aynı depo üzerinde çalıştır"""
+    parser = parser_olustur()
+    basarisiz = 0
+    for satir in args.dosya:
+        satir = satir.strip()
+        if not satir or satir.startswith("#"):
+            continue
+        try:
+            alt_args = parser.parse_args(shlex.split(satir))
+        except (SystemExit, ValueError):
+            # argparse hatayı stderr'e yazmıştır
+            _yaz({"komut": satir, "hata": "geçersiz komut"}, "json", args.cikti, tek_satir=True)
+            basarisiz += 1
+            continue
+        if alt_args.komut == "batch":
+            _yaz({"komut": satir, "hata": "batch içinde batch çalıştırılamaz"}, "json", args.cikti,
+                 tek_satir=True)
+            basarisiz += 1
+            continue
+        alt_args.bicim = "json"
+        alt_args.batch = True
+        if not _calistir_ve_yaz(depo, alt_args, args.cikti, tek_satir=True):
+            basarisiz += 1
+    if basarisiz:
+        raise KomutHatasi(f"{basarisiz} komut başarısız")
+    return None
+
+
+# --- Çıktı ---
+
+def _yaz(sonuc, bicim, cikti, tek_satir=False):
+    """Sonucu çıktı dosyasına (stdout) JSON veya CSV olarak yaz"""
+    if sonuc is None:
+        return
+    if bicim == "csv":
+        satirlar = sonuc if isinstance(sonuc, list) else [sonuc]
+        alanlar = list(dict.fromkeys(k for satir in satirlar for k in satir))
+        yazici = csv.DictWriter(cikti, fieldnames=alanlar, lineterminator="\n")
+        yazici.writeheader()
+        yazici.writerows(satirlar)
+        return
+    json.dump(sonuc, cikti, ensure_ascii=False, default=kolon_depo.json_default,
+              indent=None if tek_satir else 2)
+    cikti.write("\n")
+
+
+def _calistir_ve_yaz(depo, args, cikti=None, tek_satir=False):
+    """Alt komutu çalıştır; fonksiyonların ekrana yazdıkları stderr'e yönlendirilir"""
+    # Sonuç, yönlendirmeden önceki stdout'a yazılır (batch içindeki komutlar dahil)
+    args.cikti = cikti = cikti or sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr), olcum.sure(f"komut_satiri.{args.komut}"):
+            sonuc = args.fonksiyon(depo, args)
+    except KomutHatasi as e:
+        print(f"HATA: {e}", file=sys.stderr)
+        if tek_satir:
+            _yaz({"komut": args.komut, "hata": str(e)}, "json", cikti, tek_satir)
+        return False
+    if tek_satir and sonuc is not None:
+        sonuc = {"komut": args.komut, "sonuc": sonuc}
+    _yaz(sonuc, args.bicim, cikti, tek_satir)
+    return True
+
+
+def parser_olustur():
+    """Alt komutlu argparse ayrıştırıcısını oluştur"""
+    ortak = argparse.ArgumentParser(add_help=False)
+    ortak.add_argument("--bicim", choices=("json", "csv"), default="json", help="çıktı biçimi")
+
+    parser = argparse.ArgumentParser(prog="maas.py", description="Maaş & Puantaj Sistemi (menüsüz)")
+    alt = parser.add_subparsers(dest="komut", required=True)
+
+    p = alt.add_parser("enter", parents=[ortak], help="puantaj girişi")
+    p.add_argument("--id", required=True)
+    p.add_argument("--ay", type=_ay, required=True)
+    p.add_argument("--gun", type=_gunler, required=True, help="gün veya gün listesi (örn: 1-5,8)")
+    p.add_argument("--kod", required=True, choices=tuple("CIDYSR"), type=str.upper)
+    p.add_argument("--saat", type=int, help="S kodu için kesinti saati (1-12)")
+    p.add_argument("--ad-soyad", help="yeni personel için ad soyad")
+    p.add_argument("--brut-maas", type=float, help="yeni personel için aylık brüt maaş")
+    p.set_defaults(fonksiyon=komut_enter)
+
+    p = alt.add_parser("prefill", parents=[ortak],
+                       help="eksik hafta sonu ve resmi tatil günlerini takvim politikasına göre doldur")
+    p.add_argument("--ay", type=_ay, required=True, action="append", help="ay (birden çok verilebilir)")
+    p.add_argument("--id", action="append", help="sadece bu personeller (birden çok verilebilir)")
+    p.add_argument("--politika", help=f"politika dosyası (varsayılan: {takvim.POLITIKA_DOSYASI})")
+    p.set_defaults(fonksiyon=komut_prefill)
+
+    p = alt.add_parser("close", parents=[ortak], help="ay kapat ve hesapla")
+    p.add_argument("--ay", type=_ay, required=True)
+    p.add_argument("--id", help="kapatılacak personel")
+    p.add_argument("--tumu", action="store_true", help="ayın kapatılabilir tüm kayıtlarını kapat")
+    p.set_defaults(fonksiyon=komut_close)
+
+    p = alt.add_parser("show", parents=[ortak], help="kayıt görüntüle")
+    p.add_argument("--id", required=True)
+    p.add_argument("--ay", type=_ay)
+    p.set_defaults(fonksiyon=komut_show)
+
+    p = alt.add_parser("terminate", parents=[ortak], help="personel işten çıkar")
+    p.add_argument("--id", required=True)
+    p.add_argument("--tarih", type=_tarih, help="işten çıkış tarihi (varsayılan: bugün)")
+    p.set_defaults(fonksiyon=komut_terminate)
+
+    p = alt.add_parser("edit", parents=[ortak], help="personel düzenle")
+    p.add_argument("--id", required=True)
+    p.add_argument("--ad-soyad")
+    p.add_argument("--brut-maas", type=float, help="kapatılmamış ayların brüt maaşı")
+    p.add_argument("--ise-geri-al", action="store_true")
+    p.set_defaults(fonksiyon=komut_edit)
+
+    p = alt.add_parser("report", parents=[ortak], help="aylık rapor")
+    p.add_argument("--ay", type=_ay, required=True)
+    p.add_argument("--akis", action="store_true", help="verileri personel personel okuyarak (sınırlı bellek)")
+    p.set_defaults(fonksiyon=komut_report)
+
+    p = alt.add_parser("range-report", parents=[ortak], help="çok aylı rapor (çeyrek, yıl, yılbaşından bugüne)")
+    p.add_argument("--donem", help="2025, 2025-Q2, ytd veya tek ay")
+    p.add_argument("--bas", type=_ay, help="ilk ay")
+    p.add_argument("--son", type=_ay, help="son ay (varsayılan: ilk ay)")
+    p.add_argument("--grupla", nargs="*", choices=raporlama.GRUPLAR, default=["calisan"],
+                   help="grup alanları (boş: sadece genel toplam)")
+    p.set_defaults(fonksiyon=komut_range_report)
+
+    p = alt.add_parser("backup", parents=[ortak], help="yedek oluştur")
+    p.add_argument("--listele", action="store_true", help="yedek almadan mevcut yedekleri listele")
+    p.set_defaults(fonksiyon=komut_backup)
+
+    p = alt.add_parser("restore", parents=[ortak], help="yedekten geri yükle")
+    p.add_argument("--yedek", required=True, help="yedek adı veya sırası (1 = en yeni)")
+    p.set_defaults(fonksiyon=komut_restore)
+
+    p = alt.add_parser("import", parents=[ortak], help="CSV/JSON-lines dosyasından toplu puantaj")
+    p.add_argument("dosya")
+    p.add_argument("--hatalari-atla", action="store_true", help="hatalı satırları atlayıp geçerlileri yaz")
+    p.set_defaults(fonksiyon=komut_import)
+
+    p = alt.add_parser("export", parents=[ortak],
+                       help="bordro/puantaj satırlarını CSV, XLSX veya Parquet; tüm verileri JSON dosyasına aktar")
+    p.add_argument("dosya", help="biçim uzantıdan bulunur (.csv, .xlsx, .parquet; diğerleri JSON)")
+    p.add_argument("--sikisik", action="store_true", help="JSON: girintisiz (ana dosya biçiminde) yaz")
+    p.add_argument("--icerik", choices=disa_aktarma.ICERIKLER, default="bordro",
+                   help="ay başına bordro veya gün başına puantaj satırları")
+    p.add_argument("--ay", type=_ay, action="append", help="sadece bu ay (birden çok verilebilir)")
+    p.add_argument("--bas", type=_ay, help="ilk ay")
+    p.add_argument("--son", type=_ay, help="son ay (varsayılan: ilk ay)")
+    p.set_defaults(fonksiyon=komut_export)
+
+    p = alt.add_parser("recompute", parents=[ortak], help="kapatılmış ayları yeniden hesapla")
+    p.add_argument("--ay", type=_ay)
+    p.add_argument("--isci", type=int, help="süreç sayısı")
+    p.set_defaults(fonksiyon=komut_recompute)
+
+    p = alt.add_parser("check-summaries", parents=[ortak], help="aylık özetleri doğrula ve yeniden oluştur")
+    p.set_defaults(fonksiyon=komut_check_summaries)
+
+    p = alt.add_parser("batch", parents=[ortak], help="komutları dosyadan/stdin'den tek depo ile çalıştır")
+    p.add_argument("dosya", nargs="?", type=argparse.FileType("r", encoding="utf-8"), default=sys.stdin)
+    p.set_defaults(fonksiyon=komut_batch)
+    return parser
+
+
+def calistir(argv):
+    """Komut satırını çalıştır, çıkış kodunu döndür"""
+    args = parser_olustur().parse_args(argv)
+
+    return 0 if _calistir_ve_yaz(_TembelDepo(), args) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(calistir(sys.argv[1:]))
@@ -1,18 +1,55 @@
-import json
+import asyncio
+import hashlib
 import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
-import calendar
+import sqlite3
 import sys
 
+import akis_json
+import hesaplama
+import kolon_depo
+import model
+import olcum
+import serilestirme
+import sqlite_depo
+import takvim
+from guvenli_yazim import GrupGunluk, atomik_yaz, dosya_kilidi, dosya_kilidi_async
+
 DATA_FILE = "puantaj_kayitlari.json"
+KOLON_DATA_FILE = "puantaj_kayitlari.bin"
+SQLITE_DATA_FILE = "puantaj_kayitlari.db"
+# Depolama biçimi: "json", "kolon" (sıkıştırılmış ikili biçim, bkz. kolon_depo.py) veya "sqlite"
+STORAGE_FORMAT = os.environ.get("MAAS_STORAGE_FORMAT", "json")
+# JSON ana dosyası varsayılan olarak sıkışık yazılır; "1" ise json.dump(indent=2) biçiminde
+JSON_PRETTY = os.environ.get("MAAS_JSON_PRETTY") == "1"
 BACKUP_FOLDER = "backups"
+BACKUP_INDEX_NAME = "index.json"
+BACKUP_OBJECTS_NAME = "objects"
+# Saklanacak yedekler: son N yedek + son 24 saatin saatlik, 30 günün günlük, 12 ayın aylık yedeği
+BACKUP_RETENTION = {"son": 10, "saatlik": 24, "gunluk": 30, "aylik": 12}
+JOURNAL_FILE = "puantaj_kayitlari.journal"
+# Birden çok kullanıcı aynı dosyaları değiştirirken kayıt anında tutulan danışma kilidi
+LOCK_FILE = "puantaj_kayitlari.lock"
+JOURNAL_COMPACT_SIZE = 256 * 1024  # Günlük bu boyutu aşınca ana dosyaya sıkıştırılır
+JOURNAL_BATCH_LIMIT = 100  # Bu sayıya kadar ay kaydı ana dosya yerine günlüğe tek satırda yazılır
+# Grup kaydı penceresi (sn): 0 ise her günlük girişi hemen fsync edilir, büyükse
+# pencere içindeki girişler tek fsync ile diske indirilir (örn. MAAS_GROUP_COMMIT_MS=20)
+JOURNAL_GROUP_COMMIT_WINDOW = float(os.environ.get("MAAS_GROUP_COMMIT_MS", "0")) / 1000
+SAYFA_BOYUTU = 50  # Personel listesinde tek seferde gösterilen kişi sayısı
+AKIS_PARCA_BOYUTU = 1000  # Akışlı toplu kapatmada birlikte hesaplanan personel sayısı
 
 def clear_console():
-    """Konsolu temizle"""
+    """Konsolu temizle (çıktı terminale gitmiyorsa hiçbir şey yapılmaz)"""
+    if not sys.stdout.isatty():
+        return
     if os.name == 'nt':
         os.system('cls')
-    elif os.environ.get('TERM'):
-        os.system('clear')
+    else:
+        # Her seferinde 'clear' süreci başlatmak yerine ANSI kaçış dizisi yazılır
+        print("\033[2J\033[H", end="", flush=True)
 
 
 def input_int(prompt, min_value=None, max_value=None):
@@ -57,58 +94,592 @@ def input_float(prompt, min_value=None, max_value=None):
             print("Lütfen geçerli bir sayı giriniz.")
 
 
-def create_backup():
-    """Veri yedekleme oluştur"""
+def backup_index_path():
+    """Yedek dizin (index) dosyasının yolu"""
+    return os.path.join(BACKUP_FOLDER, BACKUP_INDEX_NAME)
+
+
+def backup_chunk_path(ozet):
+    """İçerik özetine (hash) göre yedek parçasının yolu"""
+    return os.path.join(BACKUP_FOLDER, BACKUP_OBJECTS_NAME, ozet[:2], ozet + ".json")
+
+
+def load_backup_index():
+    """Yedek dizinini yükle (ilk kullanımda eski tam kopya yedekleri içeri al)"""
+    index_path = backup_index_path()
+    if os.path.exists(index_path):
+        try:
+            olcum.okundu(index_path)
+            with open(index_path, "rb") as f:
+                return serilestirme.loads(f.read())
+        except (ValueError, IOError) as e:
+            print(f"Yedek dizini okunurken hata oluştu: {e}")
+            return {"yedekler": []}
+
+    index = {"yedekler": []}
+    import_legacy_backups(index)
+    return index
+
+
+def save_backup_index(index):
+    """Yedek dizinini yarım kalmayacak şekilde yaz"""
+    with atomik_yaz(backup_index_path(), "wb") as f:
+        f.write(serilestirme.dumps(index))
+
+
+def write_backup_chunk(kayitlar):
+    """Bir personelin kayıtlarını parça olarak yaz, aynı içerik varsa tekrar yazma"""
+    icerik = serilestirme.dumps(kayitlar, sirali=True, default=kolon_depo.json_default)
+    ozet = hashlib.sha256(icerik).hexdigest()
+    yol = backup_chunk_path(ozet)
+    if not os.path.exists(yol):
+        os.makedirs(os.path.dirname(yol), exist_ok=True)
+        with atomik_yaz(yol, "wb") as f:
+            f.write(icerik)
+        olcum.say("yedek.yeni_parca")
+    else:
+        olcum.say("yedek.paylasilan_parca")
+    return ozet, len(icerik)
+
+
+@olcum.olc
+def read_backup(yedek):
+    """Dizindeki bir yedeği parçalarından birleştir"""
+    data = {}
+    for calisan_id, ozet in yedek["parcalar"]:
+        with open(backup_chunk_path(ozet), "rb") as f:
+            icerik = f.read()
+        olcum.say("dosya.okunan_bayt", len(icerik))
+        data[calisan_id] = serilestirme.loads(icerik)
+    return data
+
+
+def add_backup_snapshot(index, ogeler, zaman):
+    """(calisan_id, kayitlar) çiftlerinin anlık görüntüsünü parçalar halinde yedek deposuna ekle"""
+    parcalar = []
+    boyut = 0
+    for calisan_id, kayitlar in ogeler:
+        ozet, parca_boyutu = write_backup_chunk(kayitlar)
+        parcalar.append([calisan_id, ozet])
+        boyut += parca_boyutu
+
+    # Son yedekle aynı içerik tekrar kaydedilmez
+    if index["yedekler"] and index["yedekler"][-1]["parcalar"] == parcalar:
+        return index["yedekler"][-1]
+
+    ad = "puantaj_backup_" + zaman.strftime("%Y%m%d_%H%M%S")
+    mevcut_adlar = {y["ad"] for y in index["yedekler"][-10:]}
+    sira = 2
+    temel_ad = ad
+    while ad in mevcut_adlar:
+        ad = f"{temel_ad}_{sira}"
+        sira += 1
+
+    yedek = {"ad": ad, "zaman": zaman.strftime("%Y-%m-%d %H:%M:%S"), "parcalar": parcalar, "boyut": boyut}
+    index["yedekler"].append(yedek)
+    return yedek
+
+
+def import_legacy_backups(index):
+    """Eski tam kopya yedek dosyalarını parça deposuna taşı"""
     if not os.path.exists(BACKUP_FOLDER):
-        os.makedirs(BACKUP_FOLDER)
+        return
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_file = os.path.join(BACKUP_FOLDER, f"puantaj_backup_{timestamp}.json")
+    eski_yedekler = sorted(f for f in os.listdir(BACKUP_FOLDER)
+                           if f.startswith("puantaj_backup_") and f.endswith(".json"))
+    for dosya in eski_yedekler:
+        yol = os.path.join(BACKUP_FOLDER, dosya)
+        try:
+            with open(yol, "rb") as f:
+                data = serilestirme.loads(f.read())
+            zaman = datetime.strptime(dosya[len("puantaj_backup_"):-len(".json")], "%Y%m%d_%H%M%S")
+        except (IOError, ValueError) as e:
+            print(f"Eski yedek içeri alınamadı ({dosya}): {e}")
+            continue
+        add_backup_snapshot(index, data.items(), zaman)
+        save_backup_index(index)
+        os.remove(yol)
+
+
+def apply_backup_retention(index, simdi=None):
+    """Saatlik, günlük ve aylık saklama kuralına göre eski yedekleri buda"""
+    simdi = simdi or datetime.now()
+    yedekler = index["yedekler"]
+    tutulacak = set(range(max(0, len(yedekler) - BACKUP_RETENTION["son"]), len(yedekler)))
+
+    katmanlar = [
+        ("saatlik", "%Y%m%d%H", timedelta(hours=BACKUP_RETENTION["saatlik"])),
+        ("gunluk", "%Y%m%d", timedelta(days=BACKUP_RETENTION["gunluk"])),
+        ("aylik", "%Y%m", timedelta(days=31 * BACKUP_RETENTION["aylik"])),
+    ]
+    for _, bicim, sure in katmanlar:
+        gorulen = set()
+        # Her zaman diliminin en yeni yedeği tutulur
+        for i in range(len(yedekler) - 1, -1, -1):
+            zaman = datetime.strptime(yedekler[i]["zaman"], "%Y-%m-%d %H:%M:%S")
+            if simdi - zaman > sure:
+                break
+            dilim = zaman.strftime(bicim)
+            if dilim not in gorulen:
+                gorulen.add(dilim)
+                tutulacak.add(i)
 
-    if os.path.exists(DATA_FILE):
+    silinenler = [y for i, y in enumerate(yedekler) if i not in tutulacak]
+    if not silinenler:
+        return 0
+
+    index["yedekler"] = [y for i, y in enumerate(yedekler) if i in tutulacak]
+
+    # Artık hiçbir yedeğin kullanmadığı parçaları sil
+    kullanilan = {ozet for y in index["yedekler"] for _, ozet in y["parcalar"]}
+    for ozet in {ozet for y in silinenler for _, ozet in y["parcalar"]} - kullanilan:
         try:
-            with open(DATA_FILE, "r", encoding="utf-8") as source:
-                data = source.read()
-            with open(backup_file, "w", encoding="utf-8") as target:
-                target.write(data)
+            os.remove(backup_chunk_path(ozet))
+        except OSError:
+            pass
+    return len(silinenler)
+
+
+@olcum.olc
+def create_backup(data=None, kilit_tutuluyor=False):
+    """Veri yedekleme oluştur
+
+    Yedek dizini veri_kilidi altında okunup yazılır; aynı anda kayıt yapan
+    başka bir oturumun yedeği dizinden kaybolmaz. kilit_tutuluyor: çağıran
+    kilidi başka bir iş parçacığında zaten tutuyor (save_data_async).
+    """
+    if not os.path.exists(BACKUP_FOLDER):
+        os.makedirs(BACKUP_FOLDER)
+
+    try:
+        with nullcontext() if kilit_tutuluyor else veri_kilidi():
+            if data is not None:
+                ogeler = data.items()
+            elif snapshot_exists():
+                # Dosya personel personel okunur; günlükte bekleyen girişler yedeğe dahildir
+                ogeler = personel_akisi()
+            else:
+                return False
+
+            index = load_backup_index()
+            add_backup_snapshot(index, ogeler, datetime.now())
+            apply_backup_retention(index)
+            save_backup_index(index)
             return True
-        except Exception as e:
-            print(f"Yedek oluşturulurken hata: {e}")
-            return False
-    return False
+    except Exception as e:
+        print(f"Yedek oluşturulurken hata: {e}")
+        return False
 
 
-def load_data():
-    """Verileri yükle"""
+def list_backups():
+    """Yedekleri en yeniden eskiye listele (klasör taranmaz)"""
+    if not os.path.exists(BACKUP_FOLDER):
+        return []
+    return list(reversed(load_backup_index()["yedekler"]))
+
+
+def snapshot_exists():
+    """Ana veri dosyası (herhangi bir biçimde) var mı"""
+    if STORAGE_FORMAT == "sqlite":
+        return os.path.exists(SQLITE_DATA_FILE)
+    return os.path.exists(DATA_FILE) or (STORAGE_FORMAT == "kolon" and os.path.exists(KOLON_DATA_FILE))
+
+
+def kayit_sayisi(data):
+    """Verilerdeki personel-ay kaydı sayısı"""
+    return sum(len(kayitlar) for kayitlar in data.values()) if data else 0
+
+
+@olcum.olc(kayit=kayit_sayisi)
+def read_snapshot():
+    """Ana veri dosyasını seçili biçimde oku, dosya yoksa None döndür"""
+    if STORAGE_FORMAT == "sqlite":
+        if not os.path.exists(SQLITE_DATA_FILE):
+            return None
+        depo = sqlite_depo.SqliteDepo(SQLITE_DATA_FILE)
+        try:
+            return depo.tumu()
+        finally:
+            depo.kapat()
+
+    if STORAGE_FORMAT == "kolon" and os.path.exists(KOLON_DATA_FILE):
+        return kolon_depo.oku(KOLON_DATA_FILE)
+
+    # Kolon biçimine ilk geçişte mevcut JSON dosyası okunur, ilk kayıtta dönüştürülür
     if os.path.exists(DATA_FILE):
+        # Dosyanın tamamı tek metin olarak belleğe alınmadan personel personel çözülür
+        return dict(akis_json.oku(DATA_FILE))
+    return None
+
+
+def _sqlite_akisi():
+    """SQLite veritabanındaki personelleri sırayla getir, bitince bağlantıyı kapat"""
+    if not os.path.exists(SQLITE_DATA_FILE):
+        return
+    depo = sqlite_depo.SqliteDepo(SQLITE_DATA_FILE)
+    try:
+        yield from depo.personel_akisi()
+    finally:
+        depo.kapat()
+
+
+@olcum.olc
+def personel_akisi():
+    """Verileri (calisan_id, kayitlar) çiftleri halinde personel personel oku
+
+    Günlükte bekleyen girişler ilgili personele uygulanır; JSON dosyası için
+    bellekte aynı anda yalnızca bir personelin kayıtları bulunur.
+    """
+    bekleyenler = {}
+    for islem in read_journal():
+        if islem["islem"] == "ay_kayitlari":
+            for calisan_id, kayit in islem["kayitlar"]:
+                bekleyenler.setdefault(calisan_id, []).append({"islem": "ay_kaydi", "id": calisan_id, "kayit": kayit})
+        else:
+            bekleyenler.setdefault(islem["id"], []).append(islem)
+
+    if STORAGE_FORMAT == "sqlite":
+        ogeler = _sqlite_akisi()
+    elif STORAGE_FORMAT == "kolon" and os.path.exists(KOLON_DATA_FILE):
+        ogeler = kolon_depo.oku(KOLON_DATA_FILE).items()
+    elif os.path.exists(DATA_FILE):
+        ogeler = akis_json.oku(DATA_FILE)
+    else:
+        ogeler = ()
+
+    for calisan_id, kayitlar in ogeler:
+        islemler = bekleyenler.pop(calisan_id, None)
+        if islemler:
+            personel = {calisan_id: kayitlar}
+            for islem in islemler:
+                apply_journal_entry(personel, islem)
+            kayitlar = personel[calisan_id]
+        yield calisan_id, kayitlar
+
+    # Sadece günlükte bulunan yeni personeller, replay_journal'daki gibi sona eklenir
+    for calisan_id, islemler in bekleyenler.items():
+        personel = {}
+        for islem in islemler:
+            apply_journal_entry(personel, islem)
+        if calisan_id in personel:
+            yield calisan_id, personel[calisan_id]
+
+
+@olcum.olc
+def write_snapshot(data):
+    """Verileri ana dosyaya seçili biçimde yaz"""
+    if olcum.ACIK:
+        olcum.say("maas.write_snapshot.kayit", kayit_sayisi(data))
+    if STORAGE_FORMAT == "sqlite":
+        depo = sqlite_depo.SqliteDepo(SQLITE_DATA_FILE)
         try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Veri dosyası okunurken hata oluştu: {e}")
-            # Yedeklerden geri yükleme seçeneği sun
-            restore_backup_option = input("Yedekten geri yüklemek ister misiniz? (E/H): ").strip().upper()
-            if restore_backup_option == 'E':
-                return restore_backup()
-            return {}
+            depo.hepsini_yaz(data)
+        finally:
+            depo.kapat()
+    elif STORAGE_FORMAT == "kolon":
+        kolon_depo.yaz(data, KOLON_DATA_FILE)
     else:
+        akis_json.yaz(data.items(), DATA_FILE, default=kolon_depo.json_default, girintili=JSON_PRETTY)
+
+
+@olcum.olc(kayit=kayit_sayisi)
+def load_data():
+    """Verileri yükle"""
+    try:
+        return _senkron_calistir(load_data_async())
+    except (ValueError, IOError, sqlite3.Error) as e:
+        print(f"Veri dosyası okunurken hata oluştu: {e}")
+        # Yedeklerden geri yükleme seçeneği sun
+        restore_backup_option = input("Yedekten geri yüklemek ister misiniz? (E/H): ").strip().upper()
+        if restore_backup_option == 'E':
+            return restore_backup()
         return {}
 
 
+# --- asyncio depolama arayüzü ---
+# Dosya okuma/yazma ve serileştirme iş parçacığı havuzunda yapılır; olay döngüsü
+# beklerken başka işlere devam eder. Senkron load_data/save_data bunları çalıştıran
+# ince sarmalayıcılardır.
+
+_yurutucu = None
+_kayit_kilitleri = weakref.WeakKeyDictionary()  # olay döngüsü -> asyncio.Lock
+
+
+def _depo_yurutucusu():
+    """Depolama işlerinin çalıştığı iş parçacığı havuzu"""
+    global _yurutucu
+    if _yurutucu is None:
+        _yurutucu = ThreadPoolExecutor(max_workers=4, thread_name_prefix="depo")
+    return _yurutucu
+
+
+async def _arka_planda(fonksiyon, *args):
+    """Senkron fonksiyonu depolama havuzunda çalıştırıp sonucunu bekle"""
+    return await asyncio.get_running_loop().run_in_executor(_depo_yurutucusu(), fonksiyon, *args)
+
+
+def _senkron_calistir(eszamanli):
+    """Eşyordamı yeni bir olay döngüsünde sonuna kadar çalıştır (senkron sarmalayıcılar için)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(eszamanli)
+    eszamanli.close()
+    raise RuntimeError("Olay döngüsü içinden senkron depolama fonksiyonu çağrılamaz; _async sürümünü kullanın")
+
+
+def _kayit_kilidi():
+    """Aynı olay döngüsündeki kayıt eşyordamlarını sıralayan kilit"""
+    dongu = asyncio.get_running_loop()
+    kilit = _kayit_kilitleri.get(dongu)
+    if kilit is None:
+        kilit = _kayit_kilitleri[dongu] = asyncio.Lock()
+    return kilit
+
+
+async def load_data_async():
+    """Verileri yükle; ana dosya ve günlük aynı anda okunur
+
+    Okuma hatası (ValueError, IOError, sqlite3.Error) çağırana iletilir.
+    """
+    data, islemler = await asyncio.gather(_arka_planda(read_snapshot),
+                                          _arka_planda(lambda: list(read_journal())))
+    data = data if data is not None else {}
+    # Ana dosyadan sonra günlüğe yazılmış girişleri uygula
+    for islem in islemler:
+        apply_journal_entry(data, islem)
+    return data
+
+
+async def create_backup_async(data=None, kilit_tutuluyor=False):
+    """create_backup'ı depolama havuzunda çalıştır"""
+    return await _arka_planda(create_backup, data, kilit_tutuluyor)
+
+
+async def save_data_async(data):
+    """Verileri kaydet; döndüğünde ana dosya diske indirilmiştir (fsync)
+
+    Yeni durumun yedeği ana dosya yazılırken aynı anda alınır. data, kilit
+    altında okunmuş güncel veriler olmalıdır.
+    """
+    async with _kayit_kilidi(), veri_kilidi_async():
+        # Henüz hiç yedek yoksa mevcut dosyanın ilk yedeği, dosya değişmeden alınır
+        # Kilit olay döngüsünün iş parçacığında tutulur; havuzdaki yedekleme tekrar almaz
+        if snapshot_exists() and not list_backups():
+            await create_backup_async(kilit_tutuluyor=True)
+
+        # Değişmeyen personel parçaları yedekler arasında paylaşılır
+        yazim, _ = await asyncio.gather(_arka_planda(write_snapshot, data),
+                                        create_backup_async(data, kilit_tutuluyor=True),
+                                        return_exceptions=True)
+        if isinstance(yazim, BaseException):
+            if not isinstance(yazim, IOError):
+                raise yazim
+            print(f"Veri kaydedilirken hata oluştu: {yazim}")
+            return False
+
+        # Günlükteki girişler artık ana dosyada
+        try:
+            clear_journal()
+        except IOError as e:
+            print(f"Veri kaydedilirken hata oluştu: {e}")
+            return False
+        return True
+
+
+async def journal_durable_async(sira=None):
+    """Günlüğe eklenmiş girişlerin (grup kaydı penceresi dolmadan) diske indirilmesini bekle
+
+    sira, journal_writer().ekle'nin döndürdüğü numaradır; verilmezse şimdiye kadarki tüm girişler.
+    """
+    gunluk = journal_writer()
+    if sira is None:
+        sira = gunluk.eklenen
+    if gunluk.kalici < sira:
+        await _arka_planda(gunluk.kalici_bekle, sira)
+
+
+def journal_size():
+    """Günlük dosyasının boyutunu getir"""
+    try:
+        return os.path.getsize(JOURNAL_FILE)
+    except OSError:
+        return 0
+
+
+_gunluk = None
+
+
+def journal_writer():
+    """Günlük dosyasının (grup kaydı destekli) yazıcısını getir"""
+    global _gunluk
+    yol = os.path.abspath(JOURNAL_FILE)
+    if _gunluk is None or _gunluk.yol != yol:
+        if _gunluk is not None:
+            _gunluk.kapat()
+        _gunluk = GrupGunluk(yol, JOURNAL_GROUP_COMMIT_WINDOW)
+    return _gunluk
+
+
+@olcum.olc
+def append_journal(islem):
+    """Günlüğe tek bir işlem kaydı ekle"""
+    try:
+        journal_writer().ekle(serilestirme.dumps(islem, default=kolon_depo.json_default).decode("utf-8") + "\n")
+        return True
+    except IOError as e:
+        print(f"Günlüğe yazılırken hata oluştu: {e}")
+        return False
+
+
+def veri_kilidi():
+    """Veri dosyaları ve günlük üzerinde süreçler arası kayıt kilidi"""
+    return dosya_kilidi(LOCK_FILE)
+
+
+def veri_kilidi_async():
+    """veri_kilidi'nin olay döngüsünü bloklamayan sürümü (async with)"""
+    return dosya_kilidi_async(LOCK_FILE)
+
+
+def apply_journal_entry(data, islem):
+    """Tek bir günlük kaydını verilere uygula
+
+    Değişen her ay kaydının "surum" damgası bir artırılır; günlük her süreçte
+    aynı sırayla uygulandığından damgalar süreçler arasında tutarlıdır.
+    """
+    if islem["islem"] == "ay_kayitlari":
+        # Birlikte yazılan ay kayıtları tek satırdadır; satır ya tamamen uygulanır ya hiç
+        for calisan_id, kayit in islem["kayitlar"]:
+            apply_journal_entry(data, {"islem": "ay_kaydi", "id": calisan_id, "kayit": kayit})
+        return
+
+    calisan_id = islem["id"]
+    if islem["islem"] == "ay_kaydi":
+        yeni_kayit = islem["kayit"]
+        kayitlar = data.setdefault(calisan_id, [])
+        for i, k in enumerate(kayitlar):
+            if k["ay"] == yeni_kayit["ay"]:
+                yeni_kayit["surum"] = k.get("surum", 0) + 1
+                kayitlar[i] = yeni_kayit
+                break
+        else:
+            yeni_kayit["surum"] = 1
+            kayitlar.append(yeni_kayit)
+    elif islem["islem"] == "puantaj":
+        for k in data.get(calisan_id, []):
+            if k["ay"] == islem["ay"]:
+                if all(p["gun"] != islem["gun"] for p in k["puantaj"]):
+                    k["puantaj"].append({'gun': islem["gun"], 'durum': islem["durum"], 'saat': islem["saat"]})
+                    k["surum"] = k.get("surum", 0) + 1
+                break
+    elif islem["islem"] == "personel":
+        for k in data.get(calisan_id, []):
+            if islem.get("sadece_acik") and k.get('durum') == 'KAPATILDI':
+                continue
+            k.update(islem["alanlar"])
+            k["surum"] = k.get("surum", 0) + 1
+
+
+def merge_ay_kaydi(taban, yeni, guncel):
+    """Oturumun taban kayıt üzerinde yaptığı değişiklikleri güncel kayda uygula
+
+    taban: oturumun değiştirmeden önce gördüğü kayıt, yeni: oturumun yazmak
+    istediği kayıt, guncel: diskteki son kayıt. Oturumun değiştirmediği alanlar
+    güncel kayıttan alınır, puantaja oturumun eklediği günler eklenir. Aynı alan
+    iki tarafta farklı değiştirildiyse veya hesaplama güncel olmayan puantajla
+    yapıldıysa çakışma vardır ve None döner.
+    """
+    birlesik = dict(guncel)
+    for alan in set(taban) | set(yeni):
+        if alan in ("puantaj", "surum") or yeni.get(alan) == taban.get(alan):
+            continue
+        if guncel.get(alan) not in (taban.get(alan), yeni.get(alan)):
+            return None
+        birlesik[alan] = yeni.get(alan)
+
+    # Hesaplama, oturumun gördüğü puantajla yapılmıştır
+    if yeni.get("hesaplama") != taban.get("hesaplama") and guncel["puantaj"] != taban["puantaj"]:
+        return None
+
+    taban_gunleri = {p['gun'] for p in taban["puantaj"]}
+    guncel_gunleri = {p['gun']: p for p in guncel["puantaj"]}
+    eklenenler = []
+    for p in yeni["puantaj"]:
+        if p['gun'] in taban_gunleri:
+            continue
+        if p['gun'] in guncel_gunleri:
+            if guncel_gunleri[p['gun']] != p:
+                return None
+            continue
+        eklenenler.append(p)
+    if eklenenler:
+        birlesik["puantaj"] = list(guncel["puantaj"]) + eklenenler
+    birlesik["surum"] = guncel.get("surum", 0)
+    return birlesik
+
+
+@olcum.olc
+def read_journal(yol=None):
+    """Günlükteki (yol verilmezse JOURNAL_FILE) işlemleri sırasıyla getir"""
+    yol = yol or JOURNAL_FILE
+    if not os.path.exists(yol):
+        return
+
+    olcum.okundu(yol)
+    try:
+        with open(yol, "r", encoding="utf-8") as f:
+            for satir in f:
+                satir = satir.strip()
+                if not satir:
+                    continue
+                try:
+                    islem = serilestirme.loads(satir)
+                except ValueError:
+                    # Yazımı yarıda kalmış son satır; öncesi geçerli
+                    print("Uyarı: Günlükte yarım kalmış bir kayıt atlandı.")
+                    break
+                yield islem
+    except IOError as e:
+        print(f"Günlük okunurken hata oluştu: {e}")
+
+
+def replay_journal(data):
+    """Günlükteki işlemleri sırasıyla verilere uygula"""
+    for islem in read_journal():
+        apply_journal_entry(data, islem)
+    return data
+
+
+def clear_journal():
+    """Günlüğü temizle (ana dosyaya yazıldıktan sonra)"""
+    journal_writer().kapat()
+    if os.path.exists(JOURNAL_FILE):
+        try:
+            os.remove(JOURNAL_FILE)
+        except OSError as e:
+            print(f"Günlük temizlenirken hata oluştu: {e}")
+
+
+def compact_journal(data):
+    """Günlüğü ana veri dosyasına sıkıştır"""
+    return save_data(data)
+
+
 def restore_backup():
     """Yedekten geri yükle"""
     if not os.path.exists(BACKUP_FOLDER):
         print("Yedek klasörü bulunamadı!")
         return {}
 
-    backups = [f for f in os.listdir(BACKUP_FOLDER) if f.endswith('.json')]
+    backups = list_backups()
     if not backups:
         print("Yedek dosyası bulunamadı!")
         return {}
 
     print("Mevcut yedekler:")
-    for i, backup in enumerate(sorted(backups, reverse=True), 1):
-        print(f"{i}. {backup}")
+    for i, backup in enumerate(backups, 1):
+        print(f"{i}. {backup['ad']}")
 
     try:
         choice = input("Hangi yedeği geri yüklemek istersiniz? (Çıkış için 0): ")
@@ -117,38 +688,297 @@ def restore_backup():
 
         choice = int(choice)
         if 1 <= choice <= len(backups):
-            selected_backup = sorted(backups, reverse=True)[choice - 1]
-            backup_path = os.path.join(BACKUP_FOLDER, selected_backup)
-
-            with open(backup_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            selected_backup = backups[choice - 1]
+            data = read_backup(selected_backup)
 
             # Ana veri dosyasına yaz
-            with open(DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with veri_kilidi():
+                write_snapshot(data)
+                clear_journal()
 
-            print(f"{selected_backup} başarıyla geri yüklendi!")
+            print(f"{selected_backup['ad']} başarıyla geri yüklendi!")
             return data
         else:
             print("Geçersiz seçim!")
             return {}
-    except (ValueError, IndexError):
+    except (ValueError, IndexError, IOError):
         print("Geçersiz seçim!")
         return {}
 
 
+@olcum.olc
 def save_data(data):
-    """Verileri kaydet"""
-    # Önce yedek oluştur
-    create_backup()
+    """Verileri kaydet (data, kilit altında okunmuş güncel veriler olmalı)"""
+    return _senkron_calistir(save_data_async(data))
 
-    try:
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        return True
-    except IOError as e:
-        print(f"Veri kaydedilirken hata oluştu: {e}")
-        return False
+
+def dosya_imzasi():
+    """Veri dosyaları ve günlüğün (mtime, boyut) imzası; dışarıdan değişiklik tespiti için"""
+    imza = []
+    for yol in (DATA_FILE, KOLON_DATA_FILE, JOURNAL_FILE):
+        try:
+            st = os.stat(yol)
+            imza.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            imza.append(None)
+    return tuple(imza)
+
+
+@olcum.metotlari_olc
+class DosyaDepo:
+    """JSON (veya kolon) ana dosyası ve günlük üzerinde puantaj deposu
+
+    Veriler bir kez yüklenip bellekte normalize modele (model.Calisan/AyKaydi)
+    çevrilir ve indekslenir; dosyalar dışarıdan değişmedikçe (mtime/boyut)
+    yeniden okunmaz. Okuma metotları eski biçimde yeni sözlükler döndürür.
+    Değişiklikler tüm dosya yeniden yazılmadan günlüğe tek kayıt olarak eklenir.
+
+    Aynı dosyaları kullanan birden çok oturum için kilit sadece kayıt anında
+    tutulur: kilit altında diskteki son durum yüklenir, oturumun değişikliği
+    bu duruma uygulanır (gerekirse merge_ay_kaydi ile birleştirilir) ve yazılır.
+    """
+
+    def __init__(self):
+        self._yukle()
+
+    def _yukle(self):
+        """Verileri dosyadan yükle ve indeksleri kur"""
+        # İmza yüklemeden önce alınır; arada yapılan yazım bir sonraki kontrolde fark edilir
+        self._imza = dosya_imzasi()
+        self._calisanlar = model.calisanlara_donustur(load_data())
+        self._aylar = {}  # calisan_id -> {ay -> AyKaydi}
+        self._aya_gore = {}  # ay -> {calisan_id -> AyKaydi}
+        self._acik = set()  # kapatılmamış (calisan_id, ay) çiftleri
+        self._pasif = set()  # işten çıkmış calisan_id'ler
+        self._ozetler = {}  # ay -> aylık özet (hesaplama.OZET_ALANLARI, tutarlar kuruş)
+        self._katkilar = {}  # (calisan_id, ay) -> kaydın özete eklenmiş katkısı
+        for calisan_id in self._calisanlar:
+            self._personeli_indeksle(calisan_id)
+
+    def _guncel_tut(self):
+        """Dosyalar başka bir süreç tarafından değiştirildiyse yeniden yükle"""
+        if dosya_imzasi() != self._imza:
+            self._yukle()
+
+    def _veriler(self):
+        """Bellekteki verileri eski biçimde getir (ana dosyaya yazmak için)"""
+        return model.eski_bicime_donustur(self._calisanlar)
+
+    def _pasifligi_guncelle(self, calisan_id):
+        calisan = self._calisanlar.get(calisan_id)
+        if calisan is not None and calisan.aylar and not calisan.alan("aktif", True):
+            self._pasif.add(calisan_id)
+        else:
+            self._pasif.discard(calisan_id)
+
+    def _personeli_indeksle(self, calisan_id):
+        """Tek personelin indeks kayıtlarını yenile"""
+        for ay in self._aylar.pop(calisan_id, {}):
+            self._aya_gore[ay].pop(calisan_id, None)
+            self._acik.discard((calisan_id, ay))
+            # Kayıt yerinde değişmiş olabileceğinden eklenmiş olan katkı çıkarılır
+            ozet = hesaplama.ozete_ekle(self._ozetler[ay], self._katkilar.pop((calisan_id, ay)), -1)
+            if not ozet["personel"]:
+                del self._ozetler[ay]
+
+        calisan = self._calisanlar.get(calisan_id)
+        aylar = {}
+        for kayit in calisan.aylar if calisan is not None else ():
+            # Aynı ay iki kez varsa eskiden olduğu gibi ilk kayıt geçerlidir
+            if kayit.ay in aylar:
+                continue
+            aylar[kayit.ay] = kayit
+            self._aya_gore.setdefault(kayit.ay, {})[calisan_id] = kayit
+            if kayit.durum != 'KAPATILDI':
+                self._acik.add((calisan_id, kayit.ay))
+            katki = hesaplama.ozet_katkisi(kayit.sozluk())
+            self._katkilar[(calisan_id, kayit.ay)] = katki
+            hesaplama.ozete_ekle(self._ozetler.setdefault(kayit.ay, {}), katki)
+        self._aylar[calisan_id] = aylar
+        self._pasifligi_guncelle(calisan_id)
+
+    def _taban(self, calisan_id, ay):
+        """Oturumun gördüğü ay kaydı (yeniden yüklemeden önce birleştirme tabanı olarak alınır)"""
+        kayit = self._aylar.get(calisan_id, {}).get(ay)
+        return kayit.sozluk() if kayit is not None else None
+
+    def _birlestir(self, calisan_id, kayit, taban):
+        """Oturumun yazmak istediği ay kaydını güncel duruma göre hazırla
+
+        Yazılacak kaydı, yazılacak bir şey yoksa kayıt olmadan True, çakışmada None döndürür.
+        """
+        guncel = self._taban(calisan_id, kayit["ay"])
+        if guncel is None:
+            return kayit
+        if taban is None:
+            # Aynı ay başka bir oturumda açılmış; boş yeni kayıt yerine mevcut kayıt kullanılır
+            return True if not kayit["puantaj"] and not kayit.get("hesaplama") else None
+        # Sürüm değişmediyse araya başka yazım girmemiştir
+        if guncel.get("surum", 0) == taban.get("surum", 0):
+            return kayit
+        return merge_ay_kaydi(taban, kayit, guncel)
+
+    def _uygula(self, islem):
+        """İşlemi kilit altında güncel verilere uygula ve günlüğe yaz"""
+        taban = None
+        if islem["islem"] == "ay_kaydi":
+            taban = self._taban(islem["id"], islem["kayit"]["ay"])
+
+        with veri_kilidi():
+            self._guncel_tut()
+            if islem["islem"] == "ay_kaydi":
+                kayit = self._birlestir(islem["id"], islem["kayit"], taban)
+                if kayit is None:
+                    print(f"UYARI: {islem['id']} - {islem['kayit']['ay']} kaydı başka bir kullanıcı tarafından "
+                          "değiştirildi. Güncel kayıtla tekrar deneyin.")
+                    return False
+                if kayit is True:
+                    return True
+                islem = dict(islem, kayit=kayit)
+            elif islem["islem"] == "puantaj":
+                kayit = self._aylar.get(islem["id"], {}).get(islem["ay"])
+                if kayit is None:
+                    raise ValueError(f"{islem['id']} - {islem['ay']} ay kaydı bulunamadı")
+                if any(p["gun"] == islem["gun"] for p in kayit.puantaj):
+                    print(f"UYARI: {islem['gun']}. gün başka bir kullanıcı tarafından girilmiş, "
+                          "mevcut giriş korundu.")
+                    return True
+
+            if not append_journal(islem):
+                return False
+            model.islem_uygula(self._calisanlar, islem)
+            # Ad, işten çıkış gibi personel bilgisi değişikliği ay kayıtlarını ve özetleri etkilemez
+            if model.sadece_personel_bilgisi(islem):
+                self._pasifligi_guncelle(islem["id"])
+            else:
+                self._personeli_indeksle(islem["id"])
+
+            # Günlük büyüdüyse ana dosyaya sıkıştır
+            sonuc = True
+            if journal_size() >= JOURNAL_COMPACT_SIZE:
+                sonuc = compact_journal(self._veriler())
+            self._imza = dosya_imzasi()
+        return sonuc
+
+    def personel_listesi(self):
+        """(calisan_id, ad_soyad, aktif) listesini kayıt sırasıyla getir"""
+        self._guncel_tut()
+        return [(calisan_id, calisan.alan("ad_soyad"), calisan_id not in self._pasif)
+                for calisan_id, calisan in self._calisanlar.items() if calisan.aylar]
+
+    def personel_kayitlari(self, calisan_id):
+        """Personelin tüm ay kayıtlarını getir"""
+        self._guncel_tut()
+        calisan = self._calisanlar.get(calisan_id)
+        return calisan.kayitlar() if calisan is not None else []
+
+    def ay_kaydi(self, calisan_id, ay):
+        """Personelin belirtilen aydaki kaydını getir"""
+        self._guncel_tut()
+        return self._taban(calisan_id, ay)
+
+    def ay_kayitlari(self, ay):
+        """Belirtilen aya ait tüm personel kayıtlarını getir"""
+        self._guncel_tut()
+        return [kayit.sozluk() for kayit in self._aya_gore.get(ay, {}).values()]
+
+    def acik_kayitlar(self, ay):
+        """Belirtilen ayın kapatılmamış kayıtlarını getir"""
+        self._guncel_tut()
+        return [kayit.sozluk() for calisan_id, kayit in self._aya_gore.get(ay, {}).items()
+                if (calisan_id, ay) in self._acik]
+
+    def tumu(self):
+        """Tüm verileri getir"""
+        self._guncel_tut()
+        return self._veriler()
+
+    def ay_ozeti(self, ay):
+        """Ayın materyalize özetini getir (personel, kapalı/açık sayısı ve toplamlar)"""
+        self._guncel_tut()
+        return hesaplama.ozet_tl(self._ozetler.get(ay) or dict.fromkeys(hesaplama.OZET_ALANLARI, 0))
+
+    def ozetleri_yeniden_olustur(self):
+        """Özetleri kayıtlardan baştan hesapla; tutarsız bulunan ayları getir"""
+        self._guncel_tut()
+        yeni = {ay: hesaplama.ozet_olustur(kayit.sozluk() for kayit in kayitlar.values())
+                for ay, kayitlar in self._aya_gore.items() if kayitlar}
+        farkli = sorted(ay for ay in set(yeni) | set(self._ozetler) if yeni.get(ay) != self._ozetler.get(ay))
+        self._ozetler = yeni
+        return farkli
+
+    def ay_kaydi_yaz(self, calisan_id, kayit):
+        """Ay kaydını ekle veya güncelle"""
+        return self._uygula({"islem": "ay_kaydi", "id": calisan_id, "kayit": kayit})
+
+    def ay_kayitlarini_yaz(self, kayitlar):
+        """Birden çok ay kaydını tek seferde yaz ([(calisan_id, kayit), ...])
+
+        Kayıtlardan biri başka bir oturumun değişikliğiyle çakışırsa hiçbiri yazılmaz.
+        """
+        tabanlar = [self._taban(calisan_id, kayit["ay"]) for calisan_id, kayit in kayitlar]
+        with veri_kilidi():
+            self._guncel_tut()
+            yazilacaklar = []
+            cakisanlar = []
+            for (calisan_id, kayit), taban in zip(kayitlar, tabanlar):
+                birlesik = self._birlestir(calisan_id, kayit, taban)
+                if birlesik is None:
+                    cakisanlar.append(f"{calisan_id} - {kayit['ay']}")
+                elif birlesik is not True:
+                    yazilacaklar.append((calisan_id, birlesik))
+            if cakisanlar:
+                print("UYARI: Şu kayıtlar başka bir kullanıcı tarafından değiştirildi, hiçbir kayıt yazılmadı: "
+                      + ", ".join(cakisanlar))
+                return False
+
+            if not yazilacaklar:
+                return True
+            # Az sayıda kayıt günlüğe tek satır olarak eklenir; çok sayıda kayıt için
+            # günlüğe tek tek eklemek yerine ana dosya bir kez yazılır
+            islem = {"islem": "ay_kayitlari", "kayitlar": yazilacaklar}
+            gunluge = len(yazilacaklar) <= JOURNAL_BATCH_LIMIT
+            if gunluge and not append_journal(islem):
+                return False
+            for calisan_id in model.islem_uygula(self._calisanlar, islem):
+                self._personeli_indeksle(calisan_id)
+
+            if not gunluge or journal_size() >= JOURNAL_COMPACT_SIZE:
+                sonuc = save_data(self._veriler())
+            else:
+                sonuc = True
+            self._imza = dosya_imzasi()
+        return sonuc
+
+    def puantaj_ekle(self, calisan_id, ay, girdi):
+        """Tek günlük puantaj girişini ekle (gün girilmişse mevcut giriş korunur)
+
+        Ay kaydı yoksa ValueError verir.
+        """
+        return self._uygula({"islem": "puantaj", "id": calisan_id, "ay": ay,
+                             "gun": girdi["gun"], "durum": girdi["durum"], "saat": girdi["saat"]})
+
+    def personel_guncelle(self, calisan_id, alanlar, sadece_acik=False):
+        """Personelin tüm (veya sadece kapatılmamış) aylarındaki alanları güncelle"""
+        return self._uygula({"islem": "personel", "id": calisan_id, "alanlar": alanlar,
+                             "sadece_acik": sadece_acik})
+
+    def hepsini_yaz(self, data):
+        """Tüm verileri değiştir"""
+        with veri_kilidi():
+            write_snapshot(data)
+            clear_journal()
+            self._yukle()
+
+
+def get_depo(paylasimli=False):
+    """Seçili depolama biçimine göre depo oluştur
+
+    paylasimli: depo birden çok iş parçacığından kullanılacak (erişimi çağıran sıralar)
+    """
+    if STORAGE_FORMAT == "sqlite":
+        return sqlite_depo.SqliteDepo(SQLITE_DATA_FILE, paylasimli)
+    return DosyaDepo()
 
 
 def get_personel_info(data, calisan_id):
@@ -174,7 +1004,7 @@ def personel_isten_cikis_tarihi(data, calisan_id):
 
 def ay_str_to_datetime(ay_str):
     """Ay string'ini datetime'a çevir"""
-    return datetime.strptime(ay_str + "-01", "%Y-%m-%d")
+    return datetime(*takvim.ay_coz(ay_str), 1)
 
 
 def get_current_month():
@@ -185,9 +1015,7 @@ def get_current_month():
 def get_month_days(ay_str):
     """Belirtilen aydaki gün sayısını hesapla"""
     try:
-        ay_dt = ay_str_to_datetime(ay_str)
-        _, num_days = calendar.monthrange(ay_dt.year, ay_dt.month)
-        return num_days
+        return takvim.ay_gun_sayisi(ay_str)
     except ValueError:
         return 30  # Varsayılan değer
 
@@ -203,31 +1031,37 @@ def validate_date(date_str, format="%Y-%m-%d"):
 
 def validate_month(month_str):
     """Ay formatını doğrula"""
-    return validate_date(month_str + "-01", "%Y-%m-%d")
+    return takvim.gecerli_ay_mi(month_str)
 
 
-def personel_listele(data):
+def personel_listele(depo):
     """Tüm personelleri listele"""
-    if not data:
+    personeller = depo.personel_listesi()
+    if not personeller:
         print("Kayıtlı personel bulunamadı.")
         return []
 
     print("\n--- Tüm Personeller ---")
-    for i, (calisan_id, kayitlar) in enumerate(data.items(), 1):
-        aktif = kayitlar[0].get("aktif", True)
+    for i, (calisan_id, ad_soyad, aktif) in enumerate(personeller, 1):
         durum = "AKTİF" if aktif else "PASİF"
-        print(f"{i}. ID: {calisan_id}, Ad: {kayitlar[0]['ad_soyad']}, Durum: {durum}")
+        print(f"{i}. ID: {calisan_id}, Ad: {ad_soyad}, Durum: {durum}")
+        # Uzun listeler sayfa sayfa gösterilir; numaralar tüm liste üzerinden geçerlidir
+        if i % SAYFA_BOYUTU == 0 and i < len(personeller):
+            devam = input(f"-- {i}/{len(personeller)} -- Sonraki sayfa için ENTER, "
+                          "listeyi bitirmek için Q: ").strip().upper()
+            if devam == 'Q':
+                break
 
-    return list(data.keys())
+    return [calisan_id for calisan_id, _, _ in personeller]
 
 
-def puantaj_girisi_veya_devam():
+def puantaj_girisi_veya_devam(depo=None):
     """Puantaj girişi yap veya devam et"""
-    data = load_data()
+    depo = depo or get_depo()
 
     # Personel listesini göster ve seçim yap
     print("\n--- Puantaj Girişi ---")
-    calisan_ids = personel_listele(data)
+    calisan_ids = personel_listele(depo)
     if not calisan_ids:
         # Yeni personel ekleme seçeneği sun
         yeni_secim = input("Kayıtlı personel yok. Yeni personel eklemek ister misiniz? (E/H): ").strip().upper()
@@ -252,7 +1086,7 @@ def puantaj_girisi_veya_devam():
                 secim = int(secim)
                 if 1 <= secim <= len(calisan_ids):
                     calisan_id = calisan_ids[secim - 1]
-                    kayitlar = get_personel_info(data, calisan_id)
+                    kayitlar = depo.personel_kayitlari(calisan_id)
                 else:
                     print("Geçersiz seçim!")
                     return
@@ -261,8 +1095,9 @@ def puantaj_girisi_veya_devam():
             return
 
     yeni_personel = False
+    yeni_ay_kaydi = False
 
-    isten_cikis_tarihi_str = personel_isten_cikis_tarihi(data, calisan_id)
+    isten_cikis_tarihi_str = kayitlar[0].get("isten_cikma_tarihi") if kayitlar else None
     isten_cikis_tarihi = None
     if isten_cikis_tarihi_str:
         try:
@@ -323,7 +1158,7 @@ def puantaj_girisi_veya_devam():
                 "aktif": kayitlar[0].get("aktif", True),
                 "isten_cikma_tarihi": kayitlar[0].get("isten_cikma_tarihi", None)
             }
-            data[calisan_id].append(ay_kayit)
+            yeni_ay_kaydi = True
     else:
         print("Bu ID ile kayıtlı personel yok. Yeni kayıt oluşturulacak.")
         yeni_personel = True
@@ -355,10 +1190,15 @@ def puantaj_girisi_veya_devam():
             "aktif": True,
             "isten_cikma_tarihi": None
         }
-        if calisan_id in data:
-            data[calisan_id].append(ay_kayit)
-        else:
-            data[calisan_id] = [ay_kayit]
+        yeni_ay_kaydi = True
+
+    # Aynı ay için kayıt zaten varsa üzerine yazılmaz, mevcut kayda devam edilir
+    if yeni_ay_kaydi:
+        mevcut_kayit = depo.ay_kaydi(calisan_id, ay)
+        if mevcut_kayit:
+            print(f"{ay} ayı için kayıt zaten var, mevcut kayıt devam ettiriliyor.")
+            ay_kayit = mevcut_kayit
+            yeni_ay_kaydi = False
 
     clear_console()
 
@@ -383,23 +1223,48 @@ def puantaj_girisi_veya_devam():
         print("Bu ayın tüm günleri için puantaj zaten girilmiş.")
         return
 
+    # Şirket politikası istiyorsa hafta sonu ve resmi tatiller sorulmadan, yeni
+    # kayıtla birlikte tek yazımda girilir; kullanıcı sadece kalan günleri girer
+    on_doldurulan = []
+    if takvim.politika()["giriste_doldur"]:
+        on_doldurulan = on_doldurma_girdileri(ay_kayit)
+        if on_doldurulan:
+            ay_kayit = dict(ay_kayit, puantaj=sorted(list(ay_kayit["puantaj"]) + on_doldurulan,
+                                                     key=lambda p: p["gun"]))
+
+    # Yeni açılan (veya ön doldurulan) ay kaydı, günlük girişlerinden önce yazılır
+    if (yeni_ay_kaydi or on_doldurulan) and not depo.ay_kaydi_yaz(calisan_id, ay_kayit):
+        print("HATA: Veri kaydedilemedi!")
+        return
+    if on_doldurulan:
+        print(f"{len(on_doldurulan)} gün (hafta sonu / resmi tatil) takvim politikasına göre dolduruldu.")
+        doldurulan_gunler = {p["gun"] for p in on_doldurulan}
+        eksik_gunler = [g for g in eksik_gunler if g not in doldurulan_gunler]
+        if not eksik_gunler:
+            return
+
     print(f"\n{ay_kayit['ad_soyad']} - {ay} ayı için puantaj girişi")
     print("=" * 50)
+    if ay_kayit['puantaj']:
+        net_maas_onizlemesi_yazdir(ay_kayit)
     print("Her gün için aşağıdaki kodlardan birini girin:")
     print("C: Çalıştı, I: İzinli, D: Devamsız, Y: Yarım Gün, S: Saatlik Kesinti, R: Resmi Tatil")
     print("Girişten çıkmak için 'q' tuşuna basabilirsiniz.")
 
-    for g in eksik_gunler:
-        # Günün haftasonu olup olmadığını kontrol et
-        try:
-            ay_dt = ay_str_to_datetime(ay)
-            gun_dt = datetime(ay_dt.year, ay_dt.month, g)
-            haftasonu = gun_dt.weekday() >= 5  # 5=Cumartesi, 6=Pazar
+    # Gün adları ve hafta sonu/tatil işaretleri ay başına bir kez hesaplanmış takvimden alınır
+    try:
+        ay_takvimi = takvim.ay_takvimi(ay)
+    except ValueError:
+        ay_takvimi = None
 
-            gun_bilgisi = f"{g}. gün ({gun_dt.strftime('%a')})"
-            if haftasonu:
+    for g in eksik_gunler:
+        if ay_takvimi is not None and g <= ay_takvimi.gun_sayisi:
+            gun_bilgisi = f"{g}. gün ({ay_takvimi.gun_adi(g)})"
+            if ay_takvimi.haftasonu_mu(g):
                 gun_bilgisi += " [Haftasonu]"
-        except:
+            if ay_takvimi.tatil_mi(g):
+                gun_bilgisi += f" [Resmi Tatil: {ay_takvimi.tatiller[g]}]"
+        else:
             gun_bilgisi = f"{g}. gün"
 
         while True:
@@ -407,43 +1272,248 @@ def puantaj_girisi_veya_devam():
 
             if kod == "Q":
                 print("Puantaj girişi durduruldu. Kaldığınız yerden devam edebilirsiniz.")
-                if save_data(data):
-                    print("Veriler kaydedildi.")
+                print("Veriler kaydedildi.")
+                _giris_onizlemesi(depo, calisan_id, ay)
                 return
             elif kod in ['C', 'I', 'D', 'Y', 'S', 'R']:
                 if kod == 'S':
                     saat = input_int(f"  {g}. gün kaç saat kesinti var?: ", min_value=1, max_value=12)
-                    ay_kayit["puantaj"].append({'gun': g, 'durum': kod, 'saat': saat})
+                    girdi = {'gun': g, 'durum': kod, 'saat': saat}
                 else:
-                    ay_kayit["puantaj"].append({'gun': g, 'durum': kod, 'saat': 0})
+                    girdi = {'gun': g, 'durum': kod, 'saat': 0}
                 break
             else:
                 print("Geçersiz kod! Lütfen C, I, D, Y, S, R veya q giriniz.")
                 continue
 
-        if not save_data(data):
+        # Her gün tüm dosya yerine sadece tek kayıt yazılır
+        if not depo.puantaj_ekle(calisan_id, ay, girdi):
             print("HATA: Veri kaydedilemedi!")
             return
 
     print("\nEklendi! Kaldığınız yerden istediğiniz zaman devam edebilirsiniz.")
+    _giris_onizlemesi(depo, calisan_id, ay)
+
 
+def _giris_onizlemesi(depo, calisan_id, ay):
+    """Girişten sonra ayın güncel kaydıyla net maaş önizlemesini göster"""
+    kayit = depo.ay_kaydi(calisan_id, ay)
+    if kayit and kayit['puantaj']:
+        net_maas_onizlemesi_yazdir(kayit)
 
-def ay_hesapla_ve_kapat():
+
+def on_doldurma_girdileri(kayit):
+    """Kaydın eksik günlerinden takvim politikasına göre doldurulacak puantaj girdileri
+
+    Hafta sonu ve resmi tatil kodları ay başına bir kez hesaplanmış takvimden
+    alınır; işten çıkış ayında çıkış gününden sonrası, sonraki aylarda hiçbir
+    gün doldurulmaz.
+    """
+    # Geçersiz ay metni atlanır; geçersiz politikanın ValueError'ı çağırana ulaşır
+    if not takvim.gecerli_ay_mi(kayit["ay"]):
+        return []
+    kodlar = takvim.ay_takvimi(kayit["ay"]).doldurma_kodlari
+    max_gun, isten_cikis_tarihi, _ = hesaplama.son_gun(kayit)
+    if isten_cikis_tarihi and ay_str_to_datetime(kayit["ay"]) > isten_cikis_tarihi.replace(day=1):
+        return []
+    girilen = {p["gun"] for p in kayit["puantaj"]}
+    return [{'gun': gun, 'durum': kod, 'saat': 0}
+            for gun, kod in enumerate(kodlar[:max_gun], 1) if kod and gun not in girilen]
+
+
+@olcum.olc
+def puantaj_on_doldur(aylar, depo=None, calisan_idler=None):
+    """Ayların açık kayıtlarındaki eksik hafta sonu ve resmi tatil günlerini tek yazımla doldur
+
+    calisan_idler verilirse sadece o personeller doldurulur. (doldurulan kayıt
+    sayısı, eklenen gün sayısı) döndürür; yazım başarısızsa None.
+    """
+    depo = depo or get_depo()
+
+    yazilacaklar = []
+    eklenen = 0
+    for ay in aylar:
+        for kayit in depo.acik_kayitlar(ay):
+            if calisan_idler is not None and kayit["id"] not in calisan_idler:
+                continue
+            girdiler = on_doldurma_girdileri(kayit)
+            if not girdiler:
+                continue
+            # Depodaki kayıt, yazım başarılı olana kadar değiştirilmez
+            puantaj = sorted(list(kayit["puantaj"]) + girdiler, key=lambda p: p["gun"])
+            yazilacaklar.append((kayit["id"], dict(kayit, puantaj=puantaj)))
+            eklenen += len(girdiler)
+
+    if yazilacaklar and not depo.ay_kayitlarini_yaz(yazilacaklar):
+        return None
+    return len(yazilacaklar), eklenen
+
+
+@olcum.olc
+def ay_toplu_kapat(ay, depo=None):
+    """Belirtilen ayın kapatılabilir tüm kayıtlarını tek seferde kapat
+
+    (kapatilanlar, atlananlar) döndürür; atlananlar eksik günleri olan kayıtlardır.
+    """
+    depo = depo or get_depo()
+
+    adaylar = []
+    atlananlar = []
+    for kayit in depo.acik_kayitlar(ay):
+        eksik_gunler = hesaplama.kapatilabilir_mi(kayit)
+        if eksik_gunler:
+            atlananlar.append({"id": kayit["id"], "ad_soyad": kayit["ad_soyad"], "eksik_gunler": eksik_gunler})
+            continue
+        # Depodaki kayıt, yazım başarılı olana kadar değiştirilmez
+        adaylar.append(dict(kayit))
+
+    kapatma_tarihi = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for kayit, sonuc in zip(adaylar, hesaplama.toplu_hesapla(adaylar)):
+        kayit["hesaplama"] = sonuc
+        kayit["durum"] = "KAPATILDI"
+        kayit["kapatma_tarihi"] = kapatma_tarihi
+
+    # Tüm sonuçlar tek kayıt işlemiyle yazılır
+    if adaylar and not depo.ay_kayitlarini_yaz([(kayit["id"], kayit) for kayit in adaylar]):
+        return None, atlananlar
+    return adaylar, atlananlar
+
+
+def _akista_kapat(ogeler, ay, kapatilanlar, atlananlar, kapatma_tarihi):
+    """Personel akışındaki kapatılabilir ay kayıtlarını parça parça hesaplayıp kapat"""
+    parca = []
+    for oge in ogeler:
+        parca.append(oge)
+        if len(parca) >= AKIS_PARCA_BOYUTU:
+            yield from _parcayi_kapat(parca, ay, kapatilanlar, atlananlar, kapatma_tarihi)
+            parca = []
+    yield from _parcayi_kapat(parca, ay, kapatilanlar, atlananlar, kapatma_tarihi)
+
+
+def _parcayi_kapat(parca, ay, kapatilanlar, atlananlar, kapatma_tarihi):
+    """Bir parça personelin ilgili ay kaydını kapat ve personelleri sırayla geri ver"""
+    adaylar = []
+    for _, kayitlar in parca:
+        kayit = next((k for k in kayitlar if k['ay'] == ay), None)
+        if kayit is None or kayit.get('durum') == 'KAPATILDI':
+            continue
+        eksik_gunler = hesaplama.kapatilabilir_mi(kayit)
+        if eksik_gunler:
+            atlananlar.append({"id": kayit["id"], "ad_soyad": kayit["ad_soyad"], "eksik_gunler": eksik_gunler})
+        else:
+            adaylar.append(kayit)
+
+    for kayit, sonuc in zip(adaylar, hesaplama.toplu_hesapla(adaylar)):
+        kayit["hesaplama"] = sonuc
+        kayit["durum"] = "KAPATILDI"
+        kayit["kapatma_tarihi"] = kapatma_tarihi
+        kayit["surum"] = kayit.get("surum", 0) + 1
+        # Rapor için puantajsız özet tutulur
+        kapatilanlar.append({"id": kayit["id"], "ad_soyad": kayit["ad_soyad"], "hesaplama": sonuc})
+    yield from parca
+
+
+@olcum.olc
+def ay_toplu_kapat_akisli(ay):
+    """ay_toplu_kapat'ın JSON dosyası için sınırlı bellekli sürümü
+
+    Dosya personel personel okunur, kapatılan kayıtlar yeni dosyaya akış halinde
+    yazılır; bellekte en fazla AKIS_PARCA_BOYUTU personel bulunur.
+    (kapatilanlar, atlananlar) döndürür; kapatilanlar puantaj içermez.
+    """
+    kapatilanlar = []
+    atlananlar = []
+    kapatma_tarihi = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # Okuma ile yazma arasında başka oturumun kaydı kaybolmasın diye işlem boyunca kilit tutulur
+    with veri_kilidi():
+        # Henüz hiç yedek yoksa mevcut dosyanın ilk yedeği alınır
+        if snapshot_exists() and not list_backups():
+            create_backup()
+
+        try:
+            akis_json.yaz(_akista_kapat(personel_akisi(), ay, kapatilanlar, atlananlar, kapatma_tarihi),
+                          DATA_FILE, default=kolon_depo.json_default, girintili=JSON_PRETTY)
+        except (ValueError, IOError) as e:
+            print(f"Veri kaydedilirken hata oluştu: {e}")
+            return None, atlananlar
+        # Günlükteki girişler artık ana dosyada
+        clear_journal()
+        create_backup()
+    return kapatilanlar, atlananlar
+
+
+def toplu_kapatma_raporu(ay, kapatilanlar, atlananlar):
+    """Toplu kapatma sonucunu yazdır"""
+    if kapatilanlar is None:
+        print("HATA: Veri kaydedilemedi!")
+        return
+
+    print(f"\n{ay} ayı toplu kapatma sonucu:")
+    print(f"Kapatılan kayıt: {len(kapatilanlar)}")
+    if kapatilanlar:
+        print(f"Toplam Net Maaş: {round(sum(k['hesaplama']['net_maas'] for k in kapatilanlar), 2)}₺")
+    print(f"Eksik gün nedeniyle atlanan kayıt: {len(atlananlar)}")
+    for atlanan in atlananlar:
+        print(f"  {atlanan['ad_soyad']} ({atlanan['id']}) - Eksik günler: "
+              + ", ".join(str(g) for g in atlanan['eksik_gunler']))
+
+
+@olcum.olc
+def kapali_aylari_yeniden_hesapla(ay=None, depo=None, isci_sayisi=None):
+    """Kapatılmış ayların hesaplamalarını süreç havuzunda yeniden yap, değişenleri yaz
+
+    Değişen kayıt sayısını döndürür; kayıt başarısızsa None.
+    """
+    depo = depo or get_depo()
+    if ay:
+        kayitlar = [(kayit['id'], kayit) for kayit in depo.ay_kayitlari(ay)]
+    else:
+        kayitlar = [(calisan_id, kayit) for calisan_id, ay_kayitlari in depo.tumu().items()
+                    for kayit in ay_kayitlari]
+    kapali = [(calisan_id, kayit) for calisan_id, kayit in kayitlar if kayit.get('durum') == 'KAPATILDI']
+
+    sonuclar = hesaplama.paralel_hesapla([kayit for _, kayit in kapali], isci_sayisi=isci_sayisi)
+    degisenler = []
+    for (calisan_id, kayit), sonuc in zip(kapali, sonuclar):
+        if kayit.get("hesaplama") != sonuc:
+            degisenler.append((calisan_id, dict(kayit, hesaplama=sonuc)))
+
+    if degisenler and not depo.ay_kayitlarini_yaz(degisenler):
+        return None
+    return len(degisenler)
+
+
+def ay_hesapla_ve_kapat(depo=None):
     """Ayı kapat ve hesaplama yap"""
-    data = load_data()
+    depo = depo or get_depo()
 
     # Personel listesini göster ve seçim yap
     print("\n--- Ay Kapatma ---")
-    calisan_ids = personel_listele(data)
+    calisan_ids = personel_listele(depo)
     if not calisan_ids:
         return
 
     try:
-        secim = input("\nPersonel seçmek için numara girin: ").strip()
+        secim = input("\nPersonel seçmek için numara girin (T: Tüm personel için toplu kapat): ").strip()
         if not secim:
             print("Geçersiz seçim!")
             return
 
+        if secim.upper() == 'T':
+            while True:
+                ay = input("Kapatılacak ay (örn: 2025-08) veya geçerli ay için ENTER: ").strip()
+                if not ay:
+                    ay = get_current_month()
+
+                if validate_month(ay):
+                    break
+                else:
+                    print("Geçersiz ay formatı! Örnek: 2025-08")
+
+            kapatilanlar, atlananlar = ay_toplu_kapat(ay, depo)
+            toplu_kapatma_raporu(ay, kapatilanlar, atlananlar)
+            return
+
         secim = int(secim)
         if 1 <= secim <= len(calisan_ids):
             calisan_id = calisan_ids[secim - 1]
@@ -454,7 +1524,7 @@ def ay_hesapla_ve_kapat():
         print("Geçersiz giriş!")
         return
 
-    kayitlar = get_personel_info(data, calisan_id)
+    kayitlar = depo.personel_kayitlari(calisan_id)
     if not kayitlar:
         print("Bu ID'ye ait kayıt yok.")
         return
@@ -479,7 +1549,8 @@ def ay_hesapla_ve_kapat():
 
         secim = int(secim)
         if 1 <= secim <= len(kapatilabilir_kayitlar):
-            kayit = kapatilabilir_kayitlar[secim - 1]
+            # Depodaki kayıt, yazım başarılı olana kadar değiştirilmez
+            kayit = dict(kapatilabilir_kayitlar[secim - 1])
         else:
             print("Geçersiz seçim!")
             return
@@ -487,27 +1558,7 @@ def ay_hesapla_ve_kapat():
         print("Geçersiz giriş!")
         return
 
-    isten_cikis_tarihi_str = kayit.get("isten_cikma_tarihi")
-    isten_cikis_tarihi = None
-    if isten_cikis_tarihi_str:
-        try:
-            isten_cikis_tarihi = datetime.strptime(isten_cikis_tarihi_str, "%Y-%m-%d")
-        except Exception:
-            pass
-
-    puantaj = kayit["puantaj"]
-    ay_gun = kayit["ay_gun"]
-    maas_tutari = kayit["brut_maas"]
-    ay_dt = ay_str_to_datetime(kayit["ay"])
-
-    # Eğer işten çıkış tarihi bu ayda ise, sadece o güne kadar olan puantajı dikkate al
-    max_gun = ay_gun
-    if isten_cikis_tarihi and ay_dt.year == isten_cikis_tarihi.year and ay_dt.month == isten_cikis_tarihi.month:
-        max_gun = isten_cikis_tarihi.day
-
-    puantaj_filtreli = [p for p in puantaj if p['gun'] <= max_gun]
-    girilen_gunler = set([p['gun'] for p in puantaj_filtreli])
-    eksik_gunler = [g for g in range(1, max_gun + 1) if g not in girilen_gunler]
+    max_gun, eksik_gunler, isten_cikis_tarihi, cikis_ayi = hesaplama.kapatma_kontrolu(kayit)
 
     # Sadece işten çıkış YOKSA ve eksik gün varsa kapatma engellensin
     if not isten_cikis_tarihi and eksik_gunler:
@@ -516,62 +1567,16 @@ def ay_hesapla_ve_kapat():
         return
 
     # İşten çıkış varsa, sadece çıkış gününe kadar olan puantajın eksik olup olmadığına bakılır, eksikse yine engellenir
-    if isten_cikis_tarihi and ay_dt.year == isten_cikis_tarihi.year and ay_dt.month == isten_cikis_tarihi.month and eksik_gunler:
+    if cikis_ayi and eksik_gunler:
         print(f"Uyarı: İşten çıkış ayı için eksik puantaj günleri var! Bu ay kapatılamaz.")
         print("Eksik günler:", ", ".join(str(g) for g in eksik_gunler))
         return
 
-    gunluk_saat = 9
-    net_tutar_gunluk = maas_tutari / ay_gun
-    net_tutar_saatlik = net_tutar_gunluk / gunluk_saat
-
-    calisilan_gun = izinli_gun = devamsiz_gun = yarim_gun = saatlik_kesinti_toplam = resmi_tatil_gun = 0
-    yarim_gun_maaş = 0
-
-    for p in puantaj_filtreli:
-        kod = p['durum']
-        saat = p['saat']
-        if kod == 'C':
-            calisilan_gun += 1
-        elif kod == 'I':
-            izinli_gun += 1
-        elif kod == 'D':
-            devamsiz_gun += 1
-        elif kod == 'Y':
-            yarim_gun += 1
-            yarim_gun_maaş += net_tutar_gunluk / 2
-        elif kod == 'S':
-            saatlik_kesinti_toplam += saat
-        elif kod == 'R':
-            resmi_tatil_gun += 1
-
-    # Hesaplamalar
-    izinli_kesinti = izinli_gun * net_tutar_gunluk
-    devamsiz_kesinti = devamsiz_gun * net_tutar_gunluk * 2
-    saatlik_kesinti = saatlik_kesinti_toplam * net_tutar_saatlik
-    toplam_maaş = (calisilan_gun * net_tutar_gunluk) + yarim_gun_maaş + (resmi_tatil_gun * net_tutar_gunluk)
-    net_maaş = toplam_maaş - izinli_kesinti - devamsiz_kesinti - saatlik_kesinti
-
-    kayit["hesaplama"] = {
-        "calisilan_gun": calisilan_gun,
-        "yarim_gun": yarim_gun,
-        "izinli_gun": izinli_gun,
-        "devamsiz_gun": devamsiz_gun,
-        "resmi_tatil_gun": resmi_tatil_gun,
-        "yarim_gun_maas": round(yarim_gun_maaş, 2),
-        "izinli_kesinti": round(izinli_kesinti, 2),
-        "devamsiz_kesinti": round(devamsiz_kesinti, 2),
-        "saatlik_kesinti_toplam": saatlik_kesinti_toplam,
-        "saatlik_kesinti": round(saatlik_kesinti, 2),
-        "resmi_tatil_maas": round(resmi_tatil_gun * net_tutar_gunluk, 2),
-        "toplam_maas": round(toplam_maaş, 2),
-        "net_maas": round(max(0, net_maaş), 2)
-    }
-
+    kayit["hesaplama"] = hesaplama.hesapla(kayit, max_gun=max_gun)
     kayit["durum"] = "KAPATILDI"
     kayit["kapatma_tarihi"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    if save_data(data):
+    if depo.ay_kaydi_yaz(calisan_id, kayit):
         print(f"\n{kayit['ay']} ayı kapatıldı! Net maaş: {kayit['hesaplama']['net_maas']}₺")
         if isten_cikis_tarihi:
             print("(İşten çıkış varsa sadece o güne kadar hesaplandı)")
@@ -579,13 +1584,13 @@ def ay_hesapla_ve_kapat():
         print("HATA: Veri kaydedilemedi!")
 
 
-def kayit_goruntule():
+def kayit_goruntule(depo=None):
     """Kayıtları görüntüle"""
-    data = load_data()
+    depo = depo or get_depo()
 
     # Personel listesini göster ve seçim yap
     print("\n--- Kayıt Görüntüleme ---")
-    calisan_ids = personel_listele(data)
+    calisan_ids = personel_listele(depo)
     if not calisan_ids:
         return
 
@@ -605,7 +1610,7 @@ def kayit_goruntule():
         print("Geçersiz giriş!")
         return
 
-    kayitlar = get_personel_info(data, calisan_id)
+    kayitlar = depo.personel_kayitlari(calisan_id)
     if not kayitlar:
         print("Bu ID'ye ait kayıt yok.")
         return
@@ -639,6 +1644,14 @@ def kayit_goruntule():
         return
 
 
+def net_maas_onizlemesi_yazdir(kayit):
+    """Kapatılmamış ayın şu ana kadarki puantajla net maaş önizlemesini yazdır"""
+    onizleme = hesaplama.onizle(kayit)
+    kesinti = onizleme['izinli_kesinti'] + onizleme['devamsiz_kesinti'] + onizleme['saatlik_kesinti']
+    print(f"Net maaş önizlemesi ({len(kayit['puantaj'])} gün girilmiş): {onizleme['net_maas']}₺ "
+          f"(kesinti: {round(kesinti, 2)}₺)")
+
+
 def print_kayit_detay(kayit):
     """Kayıt detaylarını yazdır"""
     print("\n" + "=" * 60)
@@ -668,6 +1681,8 @@ def print_kayit_detay(kayit):
         print(f"Net Maaş: {kayit['hesaplama']['net_maas']}₺")
     else:
         print("Bu ay henüz kapatılmamış.")
+        if kayit['puantaj']:
+            net_maas_onizlemesi_yazdir(kayit)
 
     print("\n--- GÜNLÜK PUANTAJ ---")
     if kayit['puantaj']:
@@ -692,13 +1707,13 @@ def print_kayit_detay(kayit):
     print("=" * 60)
 
 
-def personel_isten_cikar():
+def personel_isten_cikar(depo=None):
     """Personeli işten çıkar"""
-    data = load_data()
+    depo = depo or get_depo()
 
     # Personel listesini göster ve seçim yap
     print("\n--- Personel İşten Çıkarma ---")
-    calisan_ids = personel_listele(data)
+    calisan_ids = personel_listele(depo)
     if not calisan_ids:
         return
 
@@ -718,12 +1733,12 @@ def personel_isten_cikar():
         print("Geçersiz giriş!")
         return
 
-    kayitlar = get_personel_info(data, calisan_id)
+    kayitlar = depo.personel_kayitlari(calisan_id)
     if not kayitlar:
         print("Bu ID'ye ait personel yok.")
         return
 
-    if not personel_aktif_mi(data, calisan_id):
+    if not kayitlar[0].get("aktif", True):
         print("Bu personel zaten işten çıkmış!")
         return
 
@@ -748,23 +1763,19 @@ def personel_isten_cikar():
         return
 
     # Tüm ay kayıtlarında işten çıkma bilgisini güncelle
-    for k in kayitlar:
-        k["aktif"] = False
-        k["isten_cikma_tarihi"] = tarih
-
-    if save_data(data):
+    if depo.personel_guncelle(calisan_id, {"aktif": False, "isten_cikma_tarihi": tarih}):
         print("Personel başarıyla işten çıkarıldı.")
     else:
         print("HATA: Veri kaydedilemedi!")
 
 
-def personel_duzenle():
+def personel_duzenle(depo=None):
     """Personel bilgilerini düzenle"""
-    data = load_data()
+    depo = depo or get_depo()
 
     # Personel listesini göster ve seçim yap
     print("\n--- Personel Düzenleme ---")
-    calisan_ids = personel_listele(data)
+    calisan_ids = personel_listele(depo)
     if not calisan_ids:
         return
 
@@ -784,7 +1795,7 @@ def personel_duzenle():
         print("Geçersiz giriş!")
         return
 
-    kayitlar = get_personel_info(data, calisan_id)
+    kayitlar = depo.personel_kayitlari(calisan_id)
     if not kayitlar:
         print("Bu ID'ye ait personel yok.")
         return
@@ -807,36 +1818,35 @@ def personel_duzenle():
 
     if secim == 1:
         yeni_ad = input("Yeni Ad Soyad: ").strip()
-        if yeni_ad:
-            for k in kayitlar:
-                k["ad_soyad"] = yeni_ad
+        if not yeni_ad:
+            return
+        if depo.personel_guncelle(calisan_id, {"ad_soyad": yeni_ad}):
             print("Ad Soyad güncellendi.")
+        else:
+            print("HATA: Veri kaydedilemedi!")
     elif secim == 2:
         # Tüm aylar için maaş bilgisi güncelle
         yeni_maas = input_float("Yeni Brüt Maaş (₺): ", min_value=0)
-        for k in kayitlar:
-            if k.get('durum') != 'KAPATILDI':  # Sadece kapatılmamış ayları güncelle
-                k["brut_maas"] = yeni_maas
-        print("Maaş bilgileri güncellendi.")
+        # Sadece kapatılmamış ayları güncelle
+        if depo.personel_guncelle(calisan_id, {"brut_maas": yeni_maas}, sadece_acik=True):
+            print("Maaş bilgileri güncellendi.")
+        else:
+            print("HATA: Veri kaydedilemedi!")
     elif secim == 3:
-        if personel_aktif_mi(data, calisan_id):
+        if kayitlar[0].get("aktif", True):
             print("Personel zaten aktif.")
-        else:
-            for k in kayitlar:
-                k["aktif"] = True
-                k["isten_cikma_tarihi"] = None
+        elif depo.personel_guncelle(calisan_id, {"aktif": True, "isten_cikma_tarihi": None}):
             print("Personel tekrar işe alındı.")
+        else:
+            print("HATA: Veri kaydedilemedi!")
     else:
         print("Geçersiz seçim!")
         return
 
-    if not save_data(data):
-        print("HATA: Veri kaydedilemedi!")
-
 
-def aylik_rapor_al():
+def aylik_rapor_al(depo=None):
     """Aylık rapor al"""
-    data = load_data()
+    depo = depo or get_depo()
 
     while True:
         ay = input("Rapor alınacak ay (örn: 2025-08) veya geçerli ay için ENTER: ").strip()
@@ -848,45 +1858,58 @@ def aylik_rapor_al():
         else:
             print("Geçersiz ay formatı! Örnek: 2025-08")
 
-    print(f"\n{ay} ayı için personel raporları:")
-    print("=" * 80)
+    # Sadece bu aya ait kayıtlar getirilir; toplamlar kayıtlar taranmadan aylık özetten alınır
+    rapor_verileri = [rapor_satiri(ay_kaydi) for ay_kaydi in depo.ay_kayitlari(ay)]
+    rapor_yazdir(ay, rapor_verileri, depo.ay_ozeti(ay))
+
+
+@olcum.olc
+def rapor_satiri(ay_kaydi):
+    """Ay kaydından puantajsız rapor satırı oluştur"""
+    if ay_kaydi.get('hesaplama'):
+        return {
+            'ad_soyad': ay_kaydi['ad_soyad'],
+            'id': ay_kaydi['id'],
+            'net_maas': ay_kaydi['hesaplama']['net_maas'],
+            'kesinti': ay_kaydi['hesaplama']['izinli_kesinti'] +
+                       ay_kaydi['hesaplama']['devamsiz_kesinti'] +
+                       ay_kaydi['hesaplama']['saatlik_kesinti'],
+            'durum': ay_kaydi.get('durum', 'KAPATILMAMIŞ'),
+            'brut_maas': ay_kaydi['brut_maas']
+        }
+    return {
+        'ad_soyad': ay_kaydi['ad_soyad'],
+        'id': ay_kaydi['id'],
+        'net_maas': 0,
+        'kesinti': 0,
+        'durum': 'KAPATILMAMIŞ',
+        'brut_maas': ay_kaydi['brut_maas'],
+        # Kapatılmamış ay için şu ana kadarki puantajla hesaplanan tahmini net maaş
+        'onizleme_net_maas': hesaplama.onizle(ay_kaydi)['net_maas'] if ay_kaydi['puantaj'] else 0
+    }
+
 
-    toplam_net_maas = 0
-    toplam_kesinti = 0
-    toplam_brut_maas = 0
+@olcum.olc
+def aylik_rapor_akisli(ay):
+    """Aylık rapor satırlarını ve toplamlarını verileri personel personel okuyarak topla (sınırlı bellek)
+
+    (rapor_verileri, ozet) döndürür.
+    """
     rapor_verileri = []
+    ozet = dict.fromkeys(hesaplama.OZET_ALANLARI, 0)
+    for _, kayitlar in personel_akisi():
+        ay_kaydi = next((k for k in kayitlar if k['ay'] == ay), None)
+        if ay_kaydi is not None:
+            rapor_verileri.append(rapor_satiri(ay_kaydi))
+            hesaplama.ozete_ekle(ozet, hesaplama.ozet_katkisi(ay_kaydi))
+    return rapor_verileri, hesaplama.ozet_tl(ozet)
 
-    for calisan_id, kayitlar in data.items():
-        # Bu ayın kaydını bul
-        ay_kaydi = None
-        for kayit in kayitlar:
-            if kayit['ay'] == ay:
-                ay_kaydi = kayit
-                break
 
-        if ay_kaydi:
-            if ay_kaydi.get('hesaplama'):
-                rapor_verileri.append({
-                    'ad_soyad': ay_kaydi['ad_soyad'],
-                    'id': calisan_id,
-                    'net_maas': ay_kaydi['hesaplama']['net_maas'],
-                    'kesinti': ay_kaydi['hesaplama']['izinli_kesinti'] +
-                               ay_kaydi['hesaplama']['devamsiz_kesinti'] +
-                               ay_kaydi['hesaplama']['saatlik_kesinti'],
-                    'durum': ay_kaydi.get('durum', 'KAPATILMAMIŞ'),
-                    'brut_maas': ay_kaydi['brut_maas']
-                })
-            else:
-                rapor_verileri.append({
-                    'ad_soyad': ay_kaydi['ad_soyad'],
-                    'id': calisan_id,
-                    'net_maas': 0,
-                    'kesinti': 0,
-                    'durum': 'KAPATILMAMIŞ',
-                    'brut_maas': ay_kaydi['brut_maas']
-                })
-
-    # Raporları sırala ve göster
+def rapor_yazdir(ay, rapor_verileri, ozet):
+    """Rapor satırlarını ada göre sıralayıp ay toplamlarıyla yazdır"""
+    print(f"\n{ay} ayı için personel raporları:")
+    print("=" * 80)
+
     for veri in sorted(rapor_verileri, key=lambda x: x['ad_soyad']):
         print(f"{veri['ad_soyad']} ({veri['id']}):")
         if veri['durum'] == 'KAPATILDI':
@@ -894,18 +1917,16 @@ def aylik_rapor_al():
             print(f"  Kesintiler: {veri['kesinti']}₺")
         else:
             print("  Bu ay henüz kapatılmamış")
+            if veri.get('onizleme_net_maas'):
+                print(f"  Net Maaş Önizlemesi: {veri['onizleme_net_maas']}₺")
         print(f"  Durum: {veri['durum']}")
         print("-" * 40)
 
-        if veri['durum'] == 'KAPATILDI':
-            toplam_net_maas += veri['net_maas']
-            toplam_kesinti += veri['kesinti']
-        toplam_brut_maas += veri['brut_maas']
-
     print(f"\n{ay} ayı toplamları:")
-    print(f"Toplam Brüt Maaş: {toplam_brut_maas}₺")
-    print(f"Toplam Kesinti: {toplam_kesinti}₺")
-    print(f"Toplam Net Maaş: {toplam_net_maas}₺")
+    print(f"Personel: {ozet['personel']} (Kapatılan: {ozet['kapali']}, Açık: {ozet['acik']})")
+    print(f"Toplam Brüt Maaş: {ozet['toplam_brut_maas']}₺")
+    print(f"Toplam Kesinti: {ozet['toplam_kesinti']}₺")
+    print(f"Toplam Net Maaş: {ozet['toplam_net_maas']}₺")
     print("=" * 80)
 
 
@@ -944,18 +1965,14 @@ def yedekleri_yonet():
             print("Yedek klasörü bulunamadı!")
             return
 
-        backups = [f for f in os.listdir(BACKUP_FOLDER) if f.endswith('.json')]
+        backups = list_backups()
         if not backups:
             print("Yedek dosyası bulunamadı!")
             return
 
         print("Mevcut yedekler:")
-        for i, backup in enumerate(sorted(backups, reverse=True), 1):
-            try:
-                dosya_boyutu = os.path.getsize(os.path.join(BACKUP_FOLDER, backup))
-                print(f"{i}. {backup} ({dosya_boyutu} byte)")
-            except:
-                print(f"{i}. {backup}")
+        for i, backup in enumerate(backups, 1):
+            print(f"{i}. {backup['ad']} ({backup['boyut']} byte)")
     elif secim == 0:
         return
     else:
@@ -964,10 +1981,32 @@ def yedekleri_yonet():
 
 def main():
     """Ana menü"""
+    # python maas.py --profil DOSYA [...]: menü veya komut cProfile altında çalışır (bkz. olcum.py)
+    profil, argv = olcum.profil_ayir(sys.argv[1:])
+    if profil:
+        sys.argv[1:] = argv
+        return olcum.profille(profil, main)
+
+    # Menüsüz kullanım: python maas.py <komut> ... (bkz. komut_satiri.py)
+    if len(sys.argv) > 1:
+        import komut_satiri
+
+        sys.exit(komut_satiri.calistir(sys.argv[1:]))
+
     # Yedek klasörünü oluştur
     if not os.path.exists(BACKUP_FOLDER):
         os.makedirs(BACKUP_FOLDER)
 
+    # Geçersiz takvim politikası puantaj girişinin ortasında değil, başta bildirilir
+    try:
+        takvim.politika()
+    except (OSError, ValueError) as e:
+        print(f"HATA: Takvim politikası okunamadı ({takvim.POLITIKA_DOSYASI}): {e}")
+        sys.exit(1)
+
+    # Veriler bir kez yüklenir; menü işlemleri aynı depoyu kullanır
+    depo = get_depo()
+
     while True:
         print("\n--- Maaş & Puantaj Sistemi ---")
         print("1. Eksik günleri gir veya puantajı devam ettir")
@@ -982,17 +2021,17 @@ def main():
         secim = input("Seçiminiz: ").strip()
 
         if secim == "1":
-            puantaj_girisi_veya_devam()
+            puantaj_girisi_veya_devam(depo)
         elif secim == "2":
-            ay_hesapla_ve_kapat()
+            ay_hesapla_ve_kapat(depo)
         elif secim == "3":
-            kayit_goruntule()
+            kayit_goruntule(depo)
         elif secim == "4":
-            personel_isten_cikar()
+            personel_isten_cikar(depo)
         elif secim == "5":
-            personel_duzenle()
+            personel_duzenle(depo)
         elif secim == "6":
-            aylik_rapor_al()
+            aylik_rapor_al(depo)
         elif secim == "7":
             yedekleri_yonet()
         elif secim == "8":
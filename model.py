@@ -0,0 +1,256 @@
+"""Normalize puantaj modeli
+
+Eski JSON biçiminde personel bilgileri (ad_soyad, aktif, isten_cikma_tarihi)
+her ay kaydında tekrarlanır. Bu modülde personel bilgileri Calisan nesnesinde
+bir kez tutulur, ay kayıtları (AyKaydi) sadece aya ait alanları taşır; iki sınıf
+da __slots__ kullanır. Ad değiştirme ve işten çıkarma gibi tüm aylara uygulanan
+personel işlemleri ayları dolaşmadan O(1) yapılır.
+
+Dönüşüm kayıpsızdır: eski_bicime_donustur(calisanlara_donustur(data)) == data.
+Personel bilgisi ilk ay kaydından alınır; ondan farklı değer taşıyan aylar
+farkı kendi kayıtlarında saklar, bilinmeyen alanlar da aynen korunur.
+
+    calisanlar = model.calisanlara_donustur(data)
+    model.islem_uygula(calisanlar, islem)  # maas.apply_journal_entry ile aynı sonuç
+    data = model.eski_bicime_donustur(calisanlar)
+"""
+CALISAN_ALANLARI = ("ad_soyad", "aktif", "isten_cikma_tarihi")
+AY_ALANLARI = ("ay", "brut_maas", "ay_gun", "puantaj", "hesaplama", "durum", "kapatma_tarihi", "surum")
+# Personel bilgisi ile birlikte ay kaydının içindeki "id" de personel düzeyindedir
+_PERSONEL_ALANLARI = ("id",) + CALISAN_ALANLARI
+
+
+class _Yok:
+    """Kayıtta bulunmayan alan (None değerinden ayırmak için)"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "YOK"
+
+
+YOK = _Yok()
+
+
+def _ayni(a, b):
+    """Değerler aynı mı (True ile 1 gibi eşit ama farklı türdeki değerler ayrı tutulur)"""
+    return a is b or (type(a) is type(b) and a == b)
+
+
+class Calisan:
+    """Personel bilgileri ve ay kayıtları (eski biçimdeki kayıt sırasıyla)"""
+    __slots__ = ("id", "ad_soyad", "aktif", "isten_cikma_tarihi", "aylar", "surum_ek", "farkli")
+
+    def __init__(self, calisan_id, ad_soyad=YOK, aktif=YOK, isten_cikma_tarihi=YOK):
+        self.id = calisan_id
+        self.ad_soyad = ad_soyad
+        self.aktif = aktif
+        self.isten_cikma_tarihi = isten_cikma_tarihi
+        self.aylar = []
+        self.surum_ek = 0  # Tüm aylara birlikte eklenmiş sürüm artışı
+        self.farkli = False  # Personel bilgisinden farklı değer taşıyan ay var mı
+
+    @classmethod
+    def kayitlardan(cls, calisan_id, kayitlar):
+        """Eski biçimdeki ay kayıtları listesinden oluştur"""
+        calisan = cls(calisan_id)
+        calisan._kayitlari_yukle(kayitlar)
+        return calisan
+
+    def _kayitlari_yukle(self, kayitlar):
+        ilk = kayitlar[0] if kayitlar else {}
+        for alan in CALISAN_ALANLARI:
+            setattr(self, alan, ilk.get(alan, YOK))
+        self.surum_ek = 0
+        self.farkli = False
+        self.aylar = [AyKaydi.sozlukten(self, kayit) for kayit in kayitlar]
+
+    def normallestir(self):
+        """Personel bilgisini ilk aydan yeniden al (ilk ay değiştiğinde)"""
+        self._kayitlari_yukle([ay.sozluk() for ay in self.aylar])
+
+    def alan(self, ad, varsayilan=None):
+        """Personel bilgisini getir; kayıtta yoksa varsayılanı döndür"""
+        deger = getattr(self, ad)
+        return varsayilan if deger is YOK else deger
+
+    def ay_bul(self, ay):
+        """Aya ait ilk kaydın sırasını getir (yoksa None)"""
+        for i, kayit in enumerate(self.aylar):
+            if kayit.ay == ay:
+                return i
+        return None
+
+    def kayitlar(self):
+        """Eski biçimde ay kayıtları listesi"""
+        return [ay.sozluk() for ay in self.aylar]
+
+    def bilgileri_guncelle(self, alanlar):
+        """Tüm aylara uygulanan güncelleme; sadece personel bilgisi değişiyorsa O(1)"""
+        for alan, deger in alanlar.items():
+            if alan in CALISAN_ALANLARI:
+                setattr(self, alan, deger)
+                if self.farkli:
+                    for ay in self.aylar:
+                        if ay.farklar:
+                            ay.farklar.pop(alan, None)
+            else:
+                for ay in self.aylar:
+                    ay.ayarla(alan, deger)
+        self.surum_ek += 1
+
+
+class AyKaydi:
+    """Bir personelin bir aylık kaydı; personel bilgisi Calisan'dan okunur"""
+    __slots__ = ("calisan",) + AY_ALANLARI + ("farklar", "ekler")
+
+    def __init__(self, calisan, ay, brut_maas=YOK, ay_gun=YOK, puantaj=YOK, hesaplama=YOK, durum=YOK,
+                 kapatma_tarihi=YOK, surum=YOK):
+        self.calisan = calisan
+        self.ay = ay
+        self.brut_maas = brut_maas
+        self.ay_gun = ay_gun
+        self.puantaj = puantaj
+        self.hesaplama = hesaplama
+        self.durum = durum
+        self.kapatma_tarihi = kapatma_tarihi
+        self.surum = surum  # Ham sürüm; geçerli sürüm için calisan.surum_ek eklenir
+        self.farklar = None  # Personel bilgisinden farklı alanlar
+        self.ekler = None  # Modelde karşılığı olmayan alanlar (aynen korunur)
+
+    @classmethod
+    def sozlukten(cls, calisan, kayit):
+        """Eski biçimdeki ay kaydından oluştur"""
+        ay = cls(calisan, kayit["ay"])
+        for alan, deger in kayit.items():
+            if alan != "ay":
+                ay.ayarla(alan, deger)
+        for alan in _PERSONEL_ALANLARI:
+            if alan not in kayit:
+                ay.ayarla(alan, YOK)
+        if ay.surum is not YOK:
+            ay.surum -= calisan.surum_ek
+        return ay
+
+    def ayarla(self, alan, deger):
+        """Eski biçimdeki kayda kayit[alan] = deger yapılmış gibi güncelle"""
+        if alan in AY_ALANLARI:
+            setattr(self, alan, deger)
+        elif alan in _PERSONEL_ALANLARI:
+            ortak = self.calisan.id if alan == "id" else getattr(self.calisan, alan)
+            if _ayni(deger, ortak):
+                if self.farklar:
+                    self.farklar.pop(alan, None)
+            else:
+                if self.farklar is None:
+                    self.farklar = {}
+                self.farklar[alan] = deger
+                self.calisan.farkli = True
+        else:
+            if self.ekler is None:
+                self.ekler = {}
+            self.ekler[alan] = deger
+
+    def gecerli_surum(self):
+        """Eski biçimdeki "surum" değeri (kayıtta yoksa 0)"""
+        return (0 if self.surum is YOK else self.surum) + self.calisan.surum_ek
+
+    def surumu_artir(self):
+        self.surum = (0 if self.surum is YOK else self.surum) + 1
+
+    def sozluk(self):
+        """Eski biçimde ay kaydı (puantaj ve hesaplama nesneleri paylaşılır)"""
+        calisan = self.calisan
+        farklar = self.farklar or {}
+        kayit = {}
+        degerler = (
+            ("id", farklar["id"] if "id" in farklar else calisan.id),
+            ("ad_soyad", farklar["ad_soyad"] if "ad_soyad" in farklar else calisan.ad_soyad),
+            ("ay", self.ay),
+            ("brut_maas", self.brut_maas),
+            ("ay_gun", self.ay_gun),
+            ("puantaj", self.puantaj),
+            ("hesaplama", self.hesaplama),
+            ("durum", self.durum),
+            ("aktif", farklar["aktif"] if "aktif" in farklar else calisan.aktif),
+            ("isten_cikma_tarihi", farklar["isten_cikma_tarihi"] if "isten_cikma_tarihi" in farklar
+             else calisan.isten_cikma_tarihi),
+            ("kapatma_tarihi", self.kapatma_tarihi),
+        )
+        for alan, deger in degerler:
+            if deger is not YOK:
+                kayit[alan] = deger
+        if self.surum is not YOK or calisan.surum_ek:
+            kayit["surum"] = self.gecerli_surum()
+        if self.ekler:
+            kayit.update(self.ekler)
+        return kayit
+
+
+def calisanlara_donustur(data):
+    """Eski biçimdeki verileri ({calisan_id: [ay kaydı, ...]}) {calisan_id: Calisan} yapısına çevir"""
+    return {calisan_id: Calisan.kayitlardan(calisan_id, kayitlar) for calisan_id, kayitlar in data.items()}
+
+
+def eski_bicime_donustur(calisanlar):
+    """{calisan_id: Calisan} yapısını eski biçimdeki verilere çevir"""
+    return {calisan_id: calisan.kayitlar() for calisan_id, calisan in calisanlar.items()}
+
+
+def islem_uygula(calisanlar, islem):
+    """Günlük işlemini modele uygula (maas.apply_journal_entry ile aynı sonucu verir)
+
+    Değişen personelin kimliklerini döndürür.
+    """
+    if islem["islem"] == "ay_kayitlari":
+        for calisan_id, kayit in islem["kayitlar"]:
+            islem_uygula(calisanlar, {"islem": "ay_kaydi", "id": calisan_id, "kayit": kayit})
+        return {calisan_id for calisan_id, _ in islem["kayitlar"]}
+
+    calisan_id = islem["id"]
+    calisan = calisanlar.get(calisan_id)
+    if islem["islem"] == "ay_kaydi":
+        yeni_kayit = islem["kayit"]
+        if calisan is None:
+            calisan = calisanlar[calisan_id] = Calisan(calisan_id)
+        i = calisan.ay_bul(yeni_kayit["ay"])
+        if i is None:
+            yeni_kayit["surum"] = 1
+            calisan.aylar.append(None)
+            i = len(calisan.aylar) - 1
+        else:
+            yeni_kayit["surum"] = calisan.aylar[i].gecerli_surum() + 1
+        calisan.aylar[i] = AyKaydi.sozlukten(calisan, yeni_kayit)
+        if i == 0:
+            calisan.normallestir()
+    elif calisan is None:
+        pass
+    elif islem["islem"] == "puantaj":
+        i = calisan.ay_bul(islem["ay"])
+        if i is not None:
+            ay = calisan.aylar[i]
+            if all(p["gun"] != islem["gun"] for p in ay.puantaj):
+                ay.puantaj.append({'gun': islem["gun"], 'durum': islem["durum"], 'saat': islem["saat"]})
+                ay.surumu_artir()
+    elif islem["islem"] == "personel":
+        if not calisan.aylar:
+            return {calisan_id}
+        hedefler = calisan.aylar
+        if islem.get("sadece_acik"):
+            hedefler = [ay for ay in calisan.aylar if ay.durum != 'KAPATILDI']
+        if len(hedefler) == len(calisan.aylar):
+            calisan.bilgileri_guncelle(islem["alanlar"])
+        else:
+            for ay in hedefler:
+                for alan, deger in islem["alanlar"].items():
+                    ay.ayarla(alan, deger)
+                ay.surumu_artir()
+            if hedefler and hedefler[0] is calisan.aylar[0] and \
+                    any(alan in _PERSONEL_ALANLARI for alan in islem["alanlar"]):
+                calisan.normallestir()
+    return {calisan_id}
+
+
+def sadece_personel_bilgisi(islem):
+    """İşlem ay kayıtlarına dokunmadan yalnızca personel bilgisini mi değiştiriyor"""
+    return (islem["islem"] == "personel" and not islem.get("sadece_acik")
+            and all(alan in CALISAN_ALANLARI for alan in islem["alanlar"]))
@@ -0,0 +1,304 @@
+"""Çalışma zamanı ölçümleri ve profil
+
+Depolama, yedekleme, hesaplama ve rapor fonksiyonları @olc ile işaretlidir;
+ölçüm açıksa her biri için çağrı sayısı, toplam ve en uzun süre, hata sayısı
+ve (verilmişse) işlenen kayıt sayısı tutulur. Okunan/yazılan bayt ve benzeri
+sayaçlar say() ile artırılır. Ölçüm varsayılan olarak kapalıdır; kapalıyken
+işaretli fonksiyonlar sadece bir bayrak kontrolü kadar yavaşlar:
+
+    MAAS_OLCUM=1 python maas.py report --ay 2025-08
+    MAAS_OLCUM=1 MAAS_OLCUM_DOSYASI=maas.prom python maas.py close --ay 2025-08 --tumu
+
+MAAS_OLCUM_DOSYASI verilirse ölçümler süreç biterken bu dosyaya yazılır;
+uzantı .prom veya .txt ise Prometheus metin biçiminde (node_exporter textfile
+toplayıcısı için), değilse JSON olarak. HTTP servisinde aynı ölçümler
+GET /metrics (Prometheus) ve GET /metrikler (JSON) ile okunur.
+
+Ayrıntılı profil için --profil (--profile) cProfile istatistiklerini dosyaya
+yazar; python -m pstats dosya ile incelenir:
+
+    python maas.py --profil maas.prof close --ay 2025-08 --tumu
+"""
+import atexit
+import cProfile
+import functools
+import inspect
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+ACIK = os.environ.get("MAAS_OLCUM") == "1"
+DOSYA = os.environ.get("MAAS_OLCUM_DOSYASI")
+PROMETHEUS_ONEKI = "maas"
+
+_kilit = threading.Lock()
+_sureler = {}  # ad -> [çağrı, toplam_sn, en_uzun_sn, hata]
+_sayaclar = {}  # ad -> değer
+_kaynaklar = {}  # ad -> {sayaç: değer} döndüren fonksiyon (modüllerin kendi sayaçları)
+
+
+def ac(durum=True):
+    """Ölçümü aç veya kapat (ortam değişkeni olmadan, örn. testlerde)"""
+    global ACIK
+    ACIK = durum
+
+
+def sifirla():
+    """Tüm süre ve sayaçları sıfırla"""
+    with _kilit:
+        _sureler.clear()
+        _sayaclar.clear()
+
+
+def say(ad, deger=1):
+    """Sayacı artır (ölçüm kapalıysa bir şey yapmaz)"""
+    if not ACIK:
+        return
+    with _kilit:
+        _sayaclar[ad] = _sayaclar.get(ad, 0) + deger
+
+
+def okundu(yol):
+    """Okunan dosyanın boyutunu dosya.okunan_bayt sayacına ekle"""
+    if ACIK:
+        try:
+            say("dosya.okunan_bayt", os.path.getsize(yol))
+        except OSError:
+            pass
+
+
+def _kaydet(ad, gecen, hata):
+    with _kilit:
+        olcum = _sureler.get(ad)
+        if olcum is None:
+            olcum = _sureler[ad] = [0, 0.0, 0.0, 0]
+        olcum[0] += 1
+        olcum[1] += gecen
+        if gecen > olcum[2]:
+            olcum[2] = gecen
+        olcum[3] += hata
+
+
+def kaynak_ekle(ad, fonksiyon):
+    """Özete eklenecek dış sayaçlar: fonksiyon {sayaç: değer} döndürür, ad.sayaç olarak görünür"""
+    _kaynaklar[ad] = fonksiyon
+
+
+@contextmanager
+def sure(ad):
+    """Bir kod bloğunun süresini ölç: with olcum.sure("rapor.tarama"): ..."""
+    if not ACIK:
+        yield
+        return
+    baslangic = time.perf_counter()
+    hata = True
+    try:
+        yield
+        hata = False
+    finally:
+        _kaydet(ad, time.perf_counter() - baslangic, hata)
+
+
+def olc(fonksiyon=None, ad=None, kayit=None):
+    """Fonksiyonun çağrı sayısını ve süresini ölçen dekoratör
+
+    ad verilmezse "modül.fonksiyon" kullanılır. kayit, sonuçtan işlenen kayıt
+    sayısını hesaplayan fonksiyondur; toplamı "ad.kayit" sayacına eklenir.
+    Eşyordamlarda beklenen süre, üreteçlerde sadece üretecin kendi çalışma
+    süresi ölçülür (üretilen öğe sayısı kayıt sayısıdır).
+
+        @olcum.olc
+        def load_data(): ...
+
+        @olcum.olc(kayit=len)
+        def acik_kayitlar(self, ay): ...
+    """
+    if fonksiyon is None:
+        return lambda f: olc(f, ad, kayit)
+    ad = ad or f"{fonksiyon.__module__}.{fonksiyon.__qualname__}"
+
+    if inspect.isgeneratorfunction(fonksiyon):
+        @functools.wraps(fonksiyon)
+        def uretec(*args, **kwargs):
+            if not ACIK:
+                return (yield from fonksiyon(*args, **kwargs))
+            ic = fonksiyon(*args, **kwargs)
+            toplam = 0.0
+            adet = 0
+            hata = False
+            try:
+                while True:
+                    baslangic = time.perf_counter()
+                    try:
+                        oge = next(ic)
+                    except StopIteration as bitis:
+                        return bitis.value
+                    except BaseException:
+                        hata = True
+                        raise
+                    finally:
+                        toplam += time.perf_counter() - baslangic
+                    adet += 1
+                    yield oge
+            finally:
+                ic.close()
+                _kaydet(ad, toplam, hata)
+                say(ad + ".kayit", adet)
+        return uretec
+
+    if inspect.iscoroutinefunction(fonksiyon):
+        @functools.wraps(fonksiyon)
+        async def esyordam(*args, **kwargs):
+            if not ACIK:
+                return await fonksiyon(*args, **kwargs)
+            baslangic = time.perf_counter()
+            hata = True
+            try:
+                sonuc = await fonksiyon(*args, **kwargs)
+                hata = False
+            finally:
+                _kaydet(ad, time.perf_counter() - baslangic, hata)
+            if kayit is not None:
+                say(ad + ".kayit", kayit(sonuc))
+            return sonuc
+        return esyordam
+
+    @functools.wraps(fonksiyon)
+    def sarmal(*args, **kwargs):
+        if not ACIK:
+            return fonksiyon(*args, **kwargs)
+        baslangic = time.perf_counter()
+        hata = True
+        try:
+            sonuc = fonksiyon(*args, **kwargs)
+            hata = False
+        finally:
+            _kaydet(ad, time.perf_counter() - baslangic, hata)
+        if kayit is not None:
+            say(ad + ".kayit", kayit(sonuc))
+        return sonuc
+    return sarmal
+
+
+def metotlari_olc(sinif):
+    """Sınıfın alt çizgiyle başlamayan tüm metotlarını @olc ile işaretleyen sınıf dekoratörü"""
+    for ad, deger in list(vars(sinif).items()):
+        if not ad.startswith("_") and inspect.isfunction(deger):
+            setattr(sinif, ad, olc(deger, f"{sinif.__module__}.{sinif.__qualname__}.{ad}"))
+    return sinif
+
+
+def ozet():
+    """Ölçümlerin JSON'a uygun özeti"""
+    with _kilit:
+        sureler = {ad: list(olcum) for ad, olcum in _sureler.items()}
+        sayaclar = dict(_sayaclar)
+    for kaynak, fonksiyon in list(_kaynaklar.items()):
+        for ad, deger in fonksiyon().items():
+            sayaclar[f"{kaynak}.{ad}"] = deger
+    return {
+        "acik": ACIK,
+        "islemler": {ad: {
+            "cagri": cagri,
+            "toplam_sn": round(toplam, 6),
+            "ort_ms": round(toplam / cagri * 1000, 3) if cagri else 0,
+            "en_uzun_ms": round(en_uzun * 1000, 3),
+            "hata": hata,
+        } for ad, (cagri, toplam, en_uzun, hata) in sorted(sureler.items())},
+        "sayaclar": dict(sorted(sayaclar.items())),
+    }
+
+
+def _etiket(deger):
+    return deger.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sayi(deger):
+    # :g altı basamağa yuvarlar; büyük bayt sayaçları olduğu gibi yazılmalı
+    return str(deger) if isinstance(deger, int) else repr(float(deger))
+
+
+def prometheus_metni():
+    """Ölçümler Prometheus metin biçiminde (0.0.4)"""
+    veri = ozet()
+    on = PROMETHEUS_ONEKI
+    satirlar = []
+    metrikler = (
+        ("islem_cagri_total", "counter", "İşaretli fonksiyonun çağrı sayısı", "cagri", 1),
+        ("islem_sure_saniye_total", "counter", "İşaretli fonksiyonda geçen toplam süre", "toplam_sn", 1),
+        ("islem_en_uzun_saniye", "gauge", "İşaretli fonksiyonun en uzun çağrısı", "en_uzun_ms", 0.001),
+        ("islem_hata_total", "counter", "İşaretli fonksiyonun hata ile biten çağrı sayısı", "hata", 1),
+    )
+    for ad, tur, aciklama, alan, carpan in metrikler:
+        satirlar.append(f"# HELP {on}_{ad} {aciklama}")
+        satirlar.append(f"# TYPE {on}_{ad} {tur}")
+        for islem, olcum in veri["islemler"].items():
+            satirlar.append(f'{on}_{ad}{{islem="{_etiket(islem)}"}} {_sayi(olcum[alan] * carpan)}')
+    satirlar.append(f"# HELP {on}_sayac_total Okunan/yazılan bayt, kayıt ve önbellek sayaçları")
+    satirlar.append(f"# TYPE {on}_sayac_total counter")
+    for ad, deger in veri["sayaclar"].items():
+        satirlar.append(f'{on}_sayac_total{{ad="{_etiket(ad)}"}} {_sayi(deger)}')
+    return "\n".join(satirlar) + "\n"
+
+
+def dosyaya_yaz(yol=None):
+    """Ölçümleri dosyaya yaz (.prom/.txt: Prometheus metni, diğerleri JSON)"""
+    import json
+
+    from guvenli_yazim import atomik_yaz
+
+    yol = yol or DOSYA
+    if yol.endswith((".prom", ".txt")):
+        icerik = prometheus_metni()
+    else:
+        icerik = json.dumps(ozet(), ensure_ascii=False, indent=2) + "\n"
+    with atomik_yaz(yol) as f:
+        f.write(icerik)
+
+
+def profil_ayir(argv):
+    """Komut satırının başındaki --profil/--profile DOSYA seçeneğini ayır: (dosya veya None, kalan)"""
+    if argv and argv[0].split("=", 1)[0] in ("--profil", "--profile"):
+        if "=" in argv[0]:
+            return argv[0].split("=", 1)[1], argv[1:]
+        if len(argv) > 1:
+            return argv[1], argv[2:]
+    return None, argv
+
+
+def profille(yol, fonksiyon, *args, **kwargs):
+    """Fonksiyonu cProfile altında çalıştır, istatistikleri (hata veya çıkışta da) dosyaya yaz
+
+    Çalışma sırasında başlatılan iş parçacıkları (depolama havuzu, HTTP işçileri)
+    ayrı profillenir ve sonuçlar tek dosyada birleştirilir.
+    """
+    profiller = [cProfile.Profile()]
+    kilit = threading.Lock()
+
+    def is_parcacigi_profili(*_):
+        # Yeni iş parçacığının ilk olayında çağrılır; kendi profilini başlatıp yerine geçer
+        profil = cProfile.Profile()
+        with kilit:
+            profiller.append(profil)
+        profil.enable()
+
+    threading.setprofile(is_parcacigi_profili)
+    profiller[0].enable()
+    try:
+        return fonksiyon(*args, **kwargs)
+    finally:
+        profiller[0].disable()
+        threading.setprofile(None)
+        with kilit:
+            istatistik = pstats.Stats(profiller[0])
+            for profil in profiller[1:]:
+                istatistik.add(profil)
+        istatistik.dump_stats(yol)
+        print(f"Profil {yol} dosyasına yazıldı (python -m pstats {yol})", file=sys.stderr)
+
+
+if ACIK and DOSYA:
+    atexit.register(dosyaya_yaz, DOSYA)
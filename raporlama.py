@@ -0,0 +1,192 @@
+"""Çok aylı raporlama motoru
+
+Bir ay aralığının (çeyrek, yıl, yılbaşından bugüne) toplamları; personel, ay
+ve durum (kapatılmış/açık) alanlarının herhangi bir birleşimine göre gruplanır.
+Kayıtlar deponun ay indeksinden (depo.ay_kayitlari) ay ay okunur ve tek
+geçişte toplanır:
+
+    motor = raporlama.motor(depo)
+    satirlar, toplam = motor.rapor(raporlama.donem_aylari("2025-Q1"), grupla=("calisan", "ay"))
+
+Para alanları (brüt hariç) sadece kapatılmış kayıtların hesaplamasından,
+gün sayıları kapatılmış kayıtlarda hesaplamadan, açık kayıtlarda o ana kadar
+girilmiş puantajdan alınır.
+
+Bir ayın kayıt başına katkıları ay parçası olarak önbelleğe alınır. Tüm
+kayıtları kapatılmış ay değişmediği sürece yeniden okunmaz; parçanın hâlâ
+geçerli olduğu ayın materyalize özetiyle (depo.ay_ozeti) karşılaştırılarak
+anlaşılır. Böylece yılbaşından bugüne raporda sadece açık aylar yeniden
+hesaplanır.
+"""
+import weakref
+from datetime import datetime
+
+import hesaplama
+import olcum
+import takvim
+
+GRUPLAR = ("calisan", "ay", "durum")
+ALANLAR = (
+    "kayit", "kapali", "acik",
+    "toplam_brut_maas", "toplam_net_maas", "toplam_kesinti",
+    "izinli_kesinti", "devamsiz_kesinti", "saatlik_kesinti",
+    "calisilan_gun", "yarim_gun", "izinli_gun", "devamsiz_gun", "resmi_tatil_gun", "saatlik_kesinti_toplam",
+)
+_PARA_ALANLARI = ("izinli_kesinti", "devamsiz_kesinti", "saatlik_kesinti")
+_TUTAR_ALANLARI = frozenset(ALANLAR[3:9])
+_GUN_ALANLARI = ("calisilan_gun", "yarim_gun", "izinli_gun", "devamsiz_gun", "resmi_tatil_gun",
+                 "saatlik_kesinti_toplam")
+# Puantaj kodunun sayıldığı gün alanının sırası (_GUN_ALANLARI içinde)
+_KOD_SIRASI = {"C": 0, "Y": 1, "I": 2, "D": 3, "R": 4}
+
+ONBELLEK_AY_SAYISI = 240  # Motor başına saklanan kapatılmış ay parçası sayısı
+
+_motorlar = weakref.WeakKeyDictionary()  # depo -> RaporMotoru
+olcum.kaynak_ekle("raporlama.ay_parcasi", lambda: {
+    "isabet": sum(m.isabet for m in list(_motorlar.values())),
+    "iska": sum(m.iska for m in list(_motorlar.values())),
+})
+
+
+def ay_araligi(bas, son):
+    """bas ve son dahil "YYYY-MM" ayları listesi"""
+    yil, ay = takvim.ay_coz(bas)
+    son_yil, son_ay = takvim.ay_coz(son)
+    aylar = []
+    while (yil, ay) <= (son_yil, son_ay):
+        aylar.append(f"{yil:04d}-{ay:02d}")
+        yil, ay = (yil + 1, 1) if ay == 12 else (yil, ay + 1)
+    return aylar
+
+
+def donem_aylari(donem, bugun=None):
+    """Dönemin ayları: "2025" (yıl), "2025-Q2" (çeyrek), "ytd" (yılbaşından bu aya) veya "2025-03"
+
+    Geçersiz dönemde ValueError verir.
+    """
+    bugun = bugun or datetime.now()
+    if donem.lower() == "ytd":
+        return ay_araligi(f"{bugun.year:04d}-01", f"{bugun.year:04d}-{bugun.month:02d}")
+    if len(donem) == 4 and donem.isdigit():
+        return ay_araligi(f"{donem}-01", f"{donem}-12")
+    yil, _, ceyrek = donem.partition("-")
+    if ceyrek[:1] in ("Q", "q") and ceyrek[1:] in ("1", "2", "3", "4") and yil.isdigit():
+        ilk = (int(ceyrek[1:]) - 1) * 3 + 1
+        return ay_araligi(f"{yil}-{ilk:02d}", f"{yil}-{ilk + 2:02d}")
+    if takvim.gecerli_ay_mi(donem):
+        return [donem]
+    raise ValueError(f"Geçersiz dönem: {donem} (örn: 2025, 2025-Q2, ytd, 2025-03)")
+
+
+def kayit_katkisi(kayit):
+    """Ay kaydının ALANLAR sırasıyla rapor katkısı"""
+    kapali = kayit.get("durum") == "KAPATILDI"
+    hesap = kayit.get("hesaplama")
+    if kapali and hesap:
+        paralar = tuple(hesap[alan] for alan in _PARA_ALANLARI)
+        gunler = tuple(hesap[alan] for alan in _GUN_ALANLARI)
+        net_maas = hesap["net_maas"]
+    else:
+        # Açık ayda gün sayıları şimdiye kadar girilmiş puantajdan sayılır
+        paralar = (0, 0, 0)
+        net_maas = 0
+        max_gun = hesaplama.son_gun(kayit)[0]
+        sayimlar = [0] * len(_GUN_ALANLARI)
+        for p in kayit["puantaj"]:
+            if p["gun"] > max_gun:
+                continue
+            if p["durum"] == "S":
+                sayimlar[5] += p["saat"]
+            elif p["durum"] in _KOD_SIRASI:
+                sayimlar[_KOD_SIRASI[p["durum"]]] += 1
+        gunler = tuple(sayimlar)
+    return ((1, int(kapali), int(not kapali), kayit["brut_maas"], net_maas, sum(paralar))
+            + paralar + gunler)
+
+
+def _ekle(hedef, katki):
+    for i, deger in enumerate(katki):
+        hedef[i] += deger
+
+
+class RaporMotoru:
+    """Depo üzerinde aralık raporları; kapatılmış ayların parçalarını önbellekte tutar"""
+
+    def __init__(self, depo, onbellek_ay_sayisi=ONBELLEK_AY_SAYISI):
+        self.depo = depo
+        self.onbellek_ay_sayisi = onbellek_ay_sayisi
+        self._parcalar = {}  # ay -> (ay özeti, parça); ekleme sırası en eski kullanımdan yeniye
+        self.isabet = self.iska = 0
+
+    @olcum.olc
+    def ay_parcasi(self, ay):
+        """Ayın kayıt başına katkıları: [(calisan_id, kapali, katki), ...]"""
+        ozet = self.depo.ay_ozeti(ay)
+        onbellekte = self._parcalar.pop(ay, None)
+        if onbellekte is not None and onbellekte[0] == ozet:
+            self._parcalar[ay] = onbellekte
+            self.isabet += 1
+            return onbellekte[1]
+
+        self.iska += 1
+        parca = []
+        for kayit in self.depo.ay_kayitlari(ay):
+            katki = kayit_katkisi(kayit)
+            parca.append((kayit["id"], bool(katki[1]), katki))
+        # Açık kaydı kalmamış ay değişmez; sonraki raporlar için saklanır
+        if ozet["personel"] and not ozet["acik"]:
+            self._parcalar[ay] = (ozet, parca)
+            while len(self._parcalar) > self.onbellek_ay_sayisi:
+                del self._parcalar[next(iter(self._parcalar))]
+        return parca
+
+    @olcum.olc
+    def rapor(self, aylar, grupla=("calisan",)):
+        """Ayların toplamlarını gruplara göre hesapla
+
+        grupla, GRUPLAR alanlarından oluşan bir dizidir (boşsa sadece genel
+        toplam). Her satır grup alanlarını (calisan için ad_soyad da) ve
+        ALANLAR toplamlarını içerir; satırlar grup anahtarına göre sıralıdır.
+        (satirlar, toplam) döndürür.
+        """
+        for alan in grupla:
+            if alan not in GRUPLAR:
+                raise ValueError(f"Geçersiz grup alanı: {alan} ({', '.join(GRUPLAR)})")
+        gruplar = {}  # grup anahtarı -> toplamlar
+        toplam = [0] * len(ALANLAR)
+        for ay in aylar:
+            for calisan_id, kapali, katki in self.ay_parcasi(ay):
+                degerler = {"calisan": calisan_id, "ay": ay, "durum": "KAPATILDI" if kapali else "KAPATILMAMIŞ"}
+                anahtar = tuple(degerler[alan] for alan in grupla)
+                hedef = gruplar.get(anahtar)
+                if hedef is None:
+                    hedef = gruplar[anahtar] = [0] * len(ALANLAR)
+                _ekle(hedef, katki)
+                _ekle(toplam, katki)
+
+        # Ad değişikliği ay özetini değiştirmediğinden adlar parçalarda değil, güncel listeden alınır
+        adlar = {}
+        if "calisan" in grupla:
+            adlar = {calisan_id: ad_soyad for calisan_id, ad_soyad, _ in self.depo.personel_listesi()}
+        satirlar = []
+        for anahtar in sorted(gruplar):
+            satir = dict(zip(grupla, anahtar))
+            if "calisan" in satir:
+                satir["ad_soyad"] = adlar.get(satir["calisan"])
+            satir.update(_yuvarla(gruplar[anahtar]))
+            satirlar.append(satir)
+        return satirlar, _yuvarla(toplam)
+
+
+def _yuvarla(toplamlar):
+    """Toplamları ALANLAR adlarıyla sözlüğe çevir; tutarlar kuruşa yuvarlanır"""
+    return {alan: round(float(deger), 2) if alan in _TUTAR_ALANLARI else deger
+            for alan, deger in zip(ALANLAR, toplamlar)}
+
+
+def motor(depo):
+    """Depoya ait rapor motoru (aynı depo için önbellek paylaşılır)"""
+    rapor_motoru = _motorlar.get(depo)
+    if rapor_motoru is None:
+        rapor_motoru = _motorlar[depo] = RaporMotoru(depo)
+    return rapor_motoru
@@ -0,0 +1,93 @@
+"""JSON serileştirme katmanı
+
+Kuruluysa orjson, o yoksa msgspec, ikisi de yoksa standart json modülü
+kullanılır; hepsi aynı JSON'u üretir (ASCII dışı karakterler kaçışsız
+UTF-8; yalnızca üslü sayıların yazımı 1e-7 / 1e-07 gibi farklı olabilir).
+Seçim MAAS_JSON_BACKEND ortam değişkeniyle ("orjson", "msgspec", "json")
+zorlanabilir.
+
+dumps her zaman bytes döndürür, loads bytes veya str kabul eder. Çözme
+hataları kütüphaneden bağımsız olarak ValueError'dur.
+"""
+import json
+import os
+
+KUTUPHANELER = ("orjson", "msgspec", "json")
+
+KUTUPHANE = None  # Seçili kütüphanenin adı
+_dumps = _loads = None
+
+
+def _json_dumps(nesne, girintili=False, sirali=False, default=None):
+    if girintili:
+        metin = json.dumps(nesne, ensure_ascii=False, indent=2, sort_keys=sirali, default=default)
+    else:
+        metin = json.dumps(nesne, ensure_ascii=False, separators=(",", ":"), sort_keys=sirali, default=default)
+    return metin.encode("utf-8")
+
+
+def _orjson():
+    import orjson
+
+    def dumps(nesne, girintili=False, sirali=False, default=None):
+        secenekler = (orjson.OPT_INDENT_2 if girintili else 0) | (orjson.OPT_SORT_KEYS if sirali else 0)
+        return orjson.dumps(nesne, default=default, option=secenekler)
+
+    # orjson.JSONDecodeError, ValueError'dan türetilmiştir
+    return dumps, orjson.loads
+
+
+def _msgspec():
+    import msgspec
+
+    kodlayicilar = {}  # (default, sirali) -> Encoder
+    cozucu = msgspec.json.Decoder()
+
+    def dumps(nesne, girintili=False, sirali=False, default=None):
+        kodlayici = kodlayicilar.get((default, sirali))
+        if kodlayici is None:
+            kodlayici = kodlayicilar[(default, sirali)] = msgspec.json.Encoder(
+                enc_hook=default, order="sorted" if sirali else None)
+        veri = kodlayici.encode(nesne)
+        return msgspec.json.format(veri, indent=2) if girintili else veri
+
+    def loads(veri):
+        try:
+            return cozucu.decode(veri)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return dumps, loads
+
+
+def kutuphane_sec(ad=None):
+    """Kullanılacak kütüphaneyi seç (ad verilmezse kurulu olan en hızlısı), adını döndür"""
+    global KUTUPHANE, _dumps, _loads
+    adaylar = (ad,) if ad else KUTUPHANELER
+    for aday in adaylar:
+        if aday not in KUTUPHANELER:
+            raise ValueError(f"Bilinmeyen JSON kütüphanesi: {aday}")
+        if aday == "json":
+            _dumps, _loads = _json_dumps, json.loads
+        else:
+            try:
+                _dumps, _loads = _orjson() if aday == "orjson" else _msgspec()
+            except ImportError:
+                if ad:
+                    raise
+                continue
+        KUTUPHANE = aday
+        return aday
+
+
+def dumps(nesne, girintili=False, sirali=False, default=None):
+    """Nesneyi UTF-8 JSON olarak bytes'a çevir (girintili: indent=2, sirali: anahtarlar sıralı)"""
+    return _dumps(nesne, girintili, sirali, default)
+
+
+def loads(veri):
+    """bytes/str JSON'u çöz"""
+    return _loads(veri)
+
+
+kutuphane_sec(os.environ.get("MAAS_JSON_BACKEND") or None)
@@ -0,0 +1,415 @@
+"""SQLite tabanlı puantaj deposu
+
+Personel, ay kayıtları, günlük puantaj ve hesaplama sonuçları ayrı tablolarda
+tutulur; ay kayıtları (calisan_id, ay) ve ay üzerinden indekslidir. Menü
+fonksiyonları tüm dosyayı okuyup yazmak yerine tek kayıtlık sorgu ve
+güncellemeler yapar.
+
+JSON dosyasından geçiş için (dosyanın yanındaki günlükte bekleyen girişler de
+aktarılır):
+
+    python sqlite_depo.py [puantaj_kayitlari.json] [puantaj_kayitlari.db]
+"""
+import os
+import sqlite3
+import sys
+
+import akis_json
+import olcum
+from hesaplama import HESAPLAMA_ALANLARI, OZET_ALANLARI, ozet_katkisi, ozet_kurus, ozet_tl, ozete_ekle
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS personel (
+    calisan_id TEXT PRIMARY KEY,
+    ad_soyad TEXT NOT NULL,
+    aktif INTEGER NOT NULL DEFAULT 1,
+    isten_cikma_tarihi TEXT
+);
+CREATE TABLE IF NOT EXISTS ay_kaydi (
+    calisan_id TEXT NOT NULL REFERENCES personel(calisan_id),
+    ay TEXT NOT NULL,
+    brut_maas REAL NOT NULL,
+    ay_gun INTEGER NOT NULL,
+    durum TEXT NOT NULL DEFAULT 'KAPATILMAMIŞ',
+    kapatma_tarihi TEXT,
+    PRIMARY KEY (calisan_id, ay)
+);
+CREATE INDEX IF NOT EXISTS ix_ay_kaydi_ay ON ay_kaydi(ay);
+CREATE TABLE IF NOT EXISTS puantaj (
+    calisan_id TEXT NOT NULL,
+    ay TEXT NOT NULL,
+    gun INTEGER NOT NULL,
+    durum TEXT NOT NULL,
+    saat INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (calisan_id, ay, gun)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_puantaj_ay ON puantaj(ay);
+CREATE TABLE IF NOT EXISTS hesaplama (
+    calisan_id TEXT NOT NULL,
+    ay TEXT NOT NULL,
+    {hesaplama_kolonlari},
+    PRIMARY KEY (calisan_id, ay)
+);
+CREATE INDEX IF NOT EXISTS ix_hesaplama_ay ON hesaplama(ay);
+CREATE TABLE IF NOT EXISTS ay_ozeti (
+    ay TEXT PRIMARY KEY,
+    personel INTEGER NOT NULL,
+    kapali INTEGER NOT NULL,
+    acik INTEGER NOT NULL,
+    toplam_brut_maas REAL NOT NULL,
+    toplam_kesinti REAL NOT NULL,
+    toplam_net_maas REAL NOT NULL
+);
+""".format(hesaplama_kolonlari=",\n    ".join(f"{alan} REAL" for alan in HESAPLAMA_ALANLARI))
+
+# Özet katkısı için gereken alanlar; hesaplaması olmayan kayıtta kesinti ve net NULL gelir
+_KATKI_SORGUSU = """
+SELECT a.calisan_id, a.ay, a.brut_maas, a.durum, h.izinli_kesinti, h.devamsiz_kesinti, h.saatlik_kesinti, h.net_maas
+FROM ay_kaydi a LEFT JOIN hesaplama h ON h.calisan_id = a.calisan_id AND h.ay = a.ay
+"""
+
+_AY_KAYDI_SORGUSU = """
+SELECT a.calisan_id, p.ad_soyad, a.ay, a.brut_maas, a.ay_gun, a.durum, p.aktif,
+       p.isten_cikma_tarihi, a.kapatma_tarihi
+FROM ay_kaydi a JOIN personel p ON p.calisan_id = a.calisan_id
+"""
+
+
+def _sayi(deger):
+    """REAL kolondan gelen tam sayıları int olarak döndür"""
+    if isinstance(deger, float) and deger.is_integer():
+        return int(deger)
+    return deger
+
+
+@olcum.metotlari_olc
+class SqliteDepo:
+    """SQLite veritabanı üzerinde puantaj deposu"""
+
+    def __init__(self, db_yolu, paylasimli=False):
+        """paylasimli: bağlantı birden çok iş parçacığından (aynı anda biri) kullanılacak"""
+        self.db_yolu = db_yolu
+        self.baglanti = sqlite3.connect(db_yolu, check_same_thread=not paylasimli)
+        self.baglanti.execute("PRAGMA journal_mode=WAL")
+        self.baglanti.execute("PRAGMA foreign_keys=ON")
+        self.baglanti.executescript(SEMA)
+        # Özet tablosu sonradan eklendiği için eski veritabanlarında bir kez doldurulur
+        if (self.baglanti.execute("SELECT 1 FROM ay_kaydi LIMIT 1").fetchone()
+                and not self.baglanti.execute("SELECT 1 FROM ay_ozeti LIMIT 1").fetchone()):
+            self.ozetleri_yeniden_olustur()
+
+    def kapat(self):
+        """Veritabanı bağlantısını kapat"""
+        self.baglanti.close()
+
+    # --- Okuma ---
+
+    def _kayitlari_olustur(self, kosul, parametreler):
+        """Koşula uyan ay kayıtlarını eski sözlük yapısında getir"""
+        satirlar = self.baglanti.execute(
+            _AY_KAYDI_SORGUSU + f" WHERE {kosul} ORDER BY p.rowid, a.rowid", parametreler).fetchall()
+        if not satirlar:
+            return []
+
+        puantajlar = {}
+        for calisan_id, ay, gun, durum, saat in self.baglanti.execute(
+                f"SELECT calisan_id, ay, gun, durum, saat FROM puantaj a WHERE {kosul} ORDER BY gun",
+                parametreler):
+            puantajlar.setdefault((calisan_id, ay), []).append({'gun': gun, 'durum': durum, 'saat': saat})
+
+        hesaplamalar = {}
+        for satir in self.baglanti.execute(
+                f"SELECT calisan_id, ay, {', '.join(HESAPLAMA_ALANLARI)} FROM hesaplama a WHERE {kosul}",
+                parametreler):
+            hesaplamalar[(satir[0], satir[1])] = {alan: _sayi(deger)
+                                                  for alan, deger in zip(HESAPLAMA_ALANLARI, satir[2:])}
+
+        kayitlar = []
+        for (calisan_id, ad_soyad, ay, brut_maas, ay_gun, durum, aktif,
+             isten_cikma_tarihi, kapatma_tarihi) in satirlar:
+            kayit = {
+                "id": calisan_id,
+                "ad_soyad": ad_soyad,
+                "ay": ay,
+                "brut_maas": _sayi(brut_maas),
+                "ay_gun": ay_gun,
+                "puantaj": puantajlar.get((calisan_id, ay), []),
+                "hesaplama": hesaplamalar.get((calisan_id, ay), {}),
+                "durum": durum,
+                "aktif": bool(aktif),
+                "isten_cikma_tarihi": isten_cikma_tarihi
+            }
+            if kapatma_tarihi:
+                kayit["kapatma_tarihi"] = kapatma_tarihi
+            kayitlar.append(kayit)
+        return kayitlar
+
+    def personel_listesi(self):
+        """(calisan_id, ad_soyad, aktif) listesini kayıt sırasıyla getir"""
+        return [(calisan_id, ad_soyad, bool(aktif)) for calisan_id, ad_soyad, aktif in self.baglanti.execute(
+            "SELECT calisan_id, ad_soyad, aktif FROM personel ORDER BY rowid")]
+
+    def personel_kayitlari(self, calisan_id):
+        """Personelin tüm ay kayıtlarını getir"""
+        return self._kayitlari_olustur("a.calisan_id = ?", (calisan_id,))
+
+    def ay_kaydi(self, calisan_id, ay):
+        """Personelin belirtilen aydaki kaydını getir"""
+        kayitlar = self._kayitlari_olustur("a.calisan_id = ? AND a.ay = ?", (calisan_id, ay))
+        return kayitlar[0] if kayitlar else None
+
+    def ay_kayitlari(self, ay):
+        """Belirtilen aya ait tüm personel kayıtlarını getir"""
+        return self._kayitlari_olustur("a.ay = ?", (ay,))
+
+    def acik_kayitlar(self, ay):
+        """Belirtilen ayın kapatılmamış kayıtlarını getir"""
+        # Koşul puantaj ve hesaplama tablolarına da uygulandığından durum ay_kaydi'ndan okunur
+        return self._kayitlari_olustur(
+            "a.ay = ? AND EXISTS (SELECT 1 FROM ay_kaydi k WHERE k.calisan_id = a.calisan_id AND k.ay = a.ay"
+            " AND k.durum != 'KAPATILDI')", (ay,))
+
+    def personel_akisi(self):
+        """(calisan_id, kayitlar) çiftlerini personel personel getir"""
+        for calisan_id, _, _ in self.personel_listesi():
+            yield calisan_id, self.personel_kayitlari(calisan_id)
+
+    def tumu(self):
+        """Tüm verileri eski JSON yapısında getir"""
+        data = {calisan_id: [] for calisan_id, _, _ in self.personel_listesi()}
+        for kayit in self._kayitlari_olustur("1 = 1", ()):
+            data[kayit["id"]].append(kayit)
+        return data
+
+    def ay_ozeti(self, ay):
+        """Ayın materyalize özetini getir (personel, kapalı/açık sayısı ve toplamlar)"""
+        satir = self.baglanti.execute(
+            f"SELECT {', '.join(OZET_ALANLARI)} FROM ay_ozeti WHERE ay = ?", (ay,)).fetchone()
+        return {alan: _sayi(deger) for alan, deger in zip(OZET_ALANLARI, satir or [0] * len(OZET_ALANLARI))}
+
+    # --- Aylık özet ---
+
+    def _katkilar(self, kosul, parametreler):
+        """Koşula uyan ay kayıtlarının özet katkılarını {(calisan_id, ay): katki} olarak getir"""
+        katkilar = {}
+        for calisan_id, ay, brut_maas, durum, izinli, devamsiz, saatlik, net_maas in self.baglanti.execute(
+                _KATKI_SORGUSU + f" WHERE {kosul}", parametreler):
+            hesap = None
+            if net_maas is not None:
+                hesap = {"izinli_kesinti": izinli, "devamsiz_kesinti": devamsiz,
+                         "saatlik_kesinti": saatlik, "net_maas": net_maas}
+            katkilar[(calisan_id, ay)] = ozet_katkisi({"durum": durum, "brut_maas": brut_maas, "hesaplama": hesap})
+        return katkilar
+
+    def _ozetleri_guncelle(self, onceki, sonraki):
+        """Değişen kayıtların eski katkısını çıkarıp yenisini ekle (açık transaction içinde)
+
+        Tablodaki TL tutarları kuruşa çevrilip tam sayıyla toplanır; böylece
+        art arda güncellemeler baştan hesaplanan özetten sapmaz.
+        """
+        ozetler = {}
+        for anahtar in set(onceki) | set(sonraki):
+            ay = anahtar[1]
+            if ay not in ozetler:
+                satir = self.baglanti.execute(
+                    f"SELECT {', '.join(OZET_ALANLARI)} FROM ay_ozeti WHERE ay = ?", (ay,)).fetchone()
+                ozetler[ay] = ozet_kurus(dict(zip(OZET_ALANLARI, satir or [0] * len(OZET_ALANLARI))))
+            if anahtar in onceki:
+                ozete_ekle(ozetler[ay], onceki[anahtar], -1)
+            if anahtar in sonraki:
+                ozete_ekle(ozetler[ay], sonraki[anahtar])
+
+        for ay, ozet in ozetler.items():
+            if ozet["personel"]:
+                ozet = ozet_tl(ozet)
+                self.baglanti.execute(
+                    f"INSERT OR REPLACE INTO ay_ozeti (ay, {', '.join(OZET_ALANLARI)}) "
+                    f"VALUES (?, {', '.join('?' * len(OZET_ALANLARI))})",
+                    (ay,) + tuple(ozet[alan] for alan in OZET_ALANLARI))
+            else:
+                self.baglanti.execute("DELETE FROM ay_ozeti WHERE ay = ?", (ay,))
+
+    def _ozetleri_yaz(self, yeni):
+        """Özet tablosunu verilen (kuruşla tutulan) özetlerle değiştir (açık transaction içinde)"""
+        yeni = {ay: ozet_tl(ozet) for ay, ozet in yeni.items()}
+        self.baglanti.execute("DELETE FROM ay_ozeti")
+        self.baglanti.executemany(
+            f"INSERT INTO ay_ozeti (ay, {', '.join(OZET_ALANLARI)}) "
+            f"VALUES (?, {', '.join('?' * len(OZET_ALANLARI))})",
+            [(ay,) + tuple(ozet[alan] for alan in OZET_ALANLARI) for ay, ozet in yeni.items()])
+
+    def _ozetleri_hesapla(self):
+        """Tüm ayların özetini kayıtlardan baştan hesapla"""
+        yeni = {}
+        for (_, ay), katki in self._katkilar("1 = 1", ()).items():
+            ozete_ekle(yeni.setdefault(ay, dict.fromkeys(OZET_ALANLARI, 0)), katki)
+        return yeni
+
+    def ozetleri_yeniden_olustur(self):
+        """Özet tablosunu kayıtlardan baştan hesapla; tutarsız bulunan ayları getir"""
+        yeni = self._ozetleri_hesapla()
+        eski = {}
+        for satir in self.baglanti.execute(f"SELECT ay, {', '.join(OZET_ALANLARI)} FROM ay_ozeti"):
+            eski[satir[0]] = ozet_kurus(dict(zip(OZET_ALANLARI, satir[1:])))
+        farkli = sorted(ay for ay in set(yeni) | set(eski) if yeni.get(ay) != eski.get(ay))
+
+        with self.baglanti:
+            self._ozetleri_yaz(yeni)
+        return farkli
+
+    # --- Yazma ---
+
+    def _ay_kaydi_yaz(self, calisan_id, kayit, ozet=True):
+        """Tek ay kaydını (puantaj ve hesaplama dahil) transaction içinde yaz"""
+        b = self.baglanti
+        if ozet:
+            onceki = self._katkilar("a.calisan_id = ? AND a.ay = ?", (calisan_id, kayit["ay"]))
+        b.execute(
+            "INSERT INTO personel (calisan_id, ad_soyad, aktif, isten_cikma_tarihi) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(calisan_id) DO UPDATE SET ad_soyad = excluded.ad_soyad, aktif = excluded.aktif, "
+            "isten_cikma_tarihi = excluded.isten_cikma_tarihi",
+            (calisan_id, kayit["ad_soyad"], int(kayit.get("aktif", True)), kayit.get("isten_cikma_tarihi")))
+        b.execute(
+            "INSERT INTO ay_kaydi (calisan_id, ay, brut_maas, ay_gun, durum, kapatma_tarihi) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(calisan_id, ay) DO UPDATE SET "
+            "brut_maas = excluded.brut_maas, ay_gun = excluded.ay_gun, durum = excluded.durum, "
+            "kapatma_tarihi = excluded.kapatma_tarihi",
+            (calisan_id, kayit["ay"], kayit["brut_maas"], kayit["ay_gun"],
+             kayit.get("durum", "KAPATILMAMIŞ"), kayit.get("kapatma_tarihi")))
+
+        b.execute("DELETE FROM puantaj WHERE calisan_id = ? AND ay = ?", (calisan_id, kayit["ay"]))
+        b.executemany(
+            "INSERT OR REPLACE INTO puantaj (calisan_id, ay, gun, durum, saat) VALUES (?, ?, ?, ?, ?)",
+            [(calisan_id, kayit["ay"], p["gun"], p["durum"], p["saat"]) for p in kayit["puantaj"]])
+
+        b.execute("DELETE FROM hesaplama WHERE calisan_id = ? AND ay = ?", (calisan_id, kayit["ay"]))
+        if kayit.get("hesaplama"):
+            b.execute(
+                f"INSERT INTO hesaplama (calisan_id, ay, {', '.join(HESAPLAMA_ALANLARI)}) "
+                f"VALUES (?, ?, {', '.join('?' * len(HESAPLAMA_ALANLARI))})",
+                (calisan_id, kayit["ay"]) + tuple(kayit["hesaplama"].get(alan) for alan in HESAPLAMA_ALANLARI))
+        if ozet:
+            self._ozetleri_guncelle(onceki, self._katkilar("a.calisan_id = ? AND a.ay = ?",
+                                                           (calisan_id, kayit["ay"])))
+
+    def ay_kaydi_yaz(self, calisan_id, kayit):
+        """Ay kaydını ekle veya güncelle"""
+        try:
+            with self.baglanti:
+                self._ay_kaydi_yaz(calisan_id, kayit)
+            return True
+        except sqlite3.Error as e:
+            print(f"Veri kaydedilirken hata oluştu: {e}")
+            return False
+
+    def ay_kayitlarini_yaz(self, kayitlar):
+        """Birden çok ay kaydını tek transaction içinde yaz ([(calisan_id, kayit), ...])"""
+        try:
+            with self.baglanti:
+                for calisan_id, kayit in kayitlar:
+                    self._ay_kaydi_yaz(calisan_id, kayit)
+            return True
+        except sqlite3.Error as e:
+            print(f"Veri kaydedilirken hata oluştu: {e}")
+            return False
+
+    def puantaj_ekle(self, calisan_id, ay, girdi):
+        """Tek günlük puantaj girişini ekle (gün girilmişse mevcut giriş korunur)
+
+        Ay kaydı yoksa ValueError verir.
+        """
+        try:
+            with self.baglanti:
+                if self.baglanti.execute("SELECT 1 FROM ay_kaydi WHERE calisan_id = ? AND ay = ?",
+                                         (calisan_id, ay)).fetchone() is None:
+                    raise ValueError(f"{calisan_id} - {ay} ay kaydı bulunamadı")
+                self.baglanti.execute(
+                    "INSERT OR IGNORE INTO puantaj (calisan_id, ay, gun, durum, saat) VALUES (?, ?, ?, ?, ?)",
+                    (calisan_id, ay, girdi["gun"], girdi["durum"], girdi["saat"]))
+            return True
+        except sqlite3.Error as e:
+            print(f"Veri kaydedilirken hata oluştu: {e}")
+            return False
+
+    def personel_guncelle(self, calisan_id, alanlar, sadece_acik=False):
+        """Personelin tüm (veya sadece kapatılmamış) aylarındaki alanları güncelle"""
+        personel_alanlari = {k: v for k, v in alanlar.items() if k in ("ad_soyad", "aktif", "isten_cikma_tarihi")}
+        ay_alanlari = {k: v for k, v in alanlar.items() if k not in personel_alanlari}
+        try:
+            with self.baglanti:
+                if personel_alanlari:
+                    self.baglanti.execute(
+                        f"UPDATE personel SET {', '.join(f'{k} = ?' for k in personel_alanlari)} "
+                        "WHERE calisan_id = ?",
+                        tuple(int(v) if k == "aktif" else v for k, v in personel_alanlari.items()) + (calisan_id,))
+                if ay_alanlari:
+                    kosul = " AND durum != 'KAPATILDI'" if sadece_acik else ""
+                    onceki = self._katkilar("a.calisan_id = ?", (calisan_id,))
+                    self.baglanti.execute(
+                        f"UPDATE ay_kaydi SET {', '.join(f'{k} = ?' for k in ay_alanlari)} "
+                        f"WHERE calisan_id = ?{kosul}",
+                        tuple(ay_alanlari.values()) + (calisan_id,))
+                    self._ozetleri_guncelle(onceki, self._katkilar("a.calisan_id = ?", (calisan_id,)))
+            return True
+        except sqlite3.Error as e:
+            print(f"Veri kaydedilirken hata oluştu: {e}")
+            return False
+
+    def hepsini_yaz(self, data):
+        """Tüm verileri tek transaction içinde değiştir (geçiş ve geri yükleme için)"""
+        with self.baglanti:
+            for tablo in ("hesaplama", "puantaj", "ay_kaydi", "personel"):
+                self.baglanti.execute(f"DELETE FROM {tablo}")
+            for calisan_id, kayitlar in data.items():
+                for kayit in kayitlar:
+                    # Özetler kayıt kayıt güncellenmek yerine sonda bir kez hesaplanır
+                    self._ay_kaydi_yaz(calisan_id, kayit, ozet=False)
+                if kayitlar:
+                    # Personel bilgisi eski yapıda olduğu gibi ilk aydan alınır
+                    self.baglanti.execute(
+                        "UPDATE personel SET ad_soyad = ?, aktif = ?, isten_cikma_tarihi = ? WHERE calisan_id = ?",
+                        (kayitlar[0]["ad_soyad"], int(kayitlar[0].get("aktif", True)),
+                         kayitlar[0].get("isten_cikma_tarihi"), calisan_id))
+            self._ozetleri_yaz(self._ozetleri_hesapla())
+
+
+def json_verisini_oku(json_yolu, gunluk_yolu=None):
+    """JSON veri dosyasını günlükte bekleyen girişleriyle birlikte oku
+
+    Günlük verilmezse JSON dosyasının yanındaki günlük kullanılır. Kullanıcıya
+    soru sorulmaz; dosya okunamazsa ValueError veya IOError yükseltilir.
+    """
+    import maas
+
+    if gunluk_yolu is None:
+        gunluk_yolu = os.path.join(os.path.dirname(json_yolu), os.path.basename(maas.JOURNAL_FILE))
+    if not os.path.exists(json_yolu) and not os.path.exists(gunluk_yolu):
+        raise FileNotFoundError(f"Veri dosyası bulunamadı: {json_yolu}")
+
+    data = dict(akis_json.oku(json_yolu)) if os.path.exists(json_yolu) else {}
+    for islem in maas.read_journal(gunluk_yolu):
+        maas.apply_journal_entry(data, islem)
+    return data
+
+
+def json_to_sqlite(json_yolu, db_yolu, gunluk_yolu=None):
+    """JSON veri dosyasını (bekleyen günlük girişleriyle) SQLite veritabanına aktar"""
+    data = json_verisini_oku(json_yolu, gunluk_yolu)
+
+    depo = SqliteDepo(db_yolu)
+    try:
+        depo.hepsini_yaz(data)
+    finally:
+        depo.kapat()
+    return sum(len(kayitlar) for kayitlar in data.values())
+
+
+if __name__ == "__main__":
+    kaynak = sys.argv[1] if len(sys.argv) > 1 else "puantaj_kayitlari.json"
+    hedef = sys.argv[2] if len(sys.argv) > 2 else "puantaj_kayitlari.db"
+    try:
+        adet = json_to_sqlite(kaynak, hedef)
+    except (ValueError, IOError, sqlite3.Error) as e:
+        print(f"HATA: {kaynak} aktarılamadı: {e}")
+        sys.exit(1)
+    print(f"{adet} ay kaydı {kaynak} dosyasından {hedef} veritabanına aktarıldı.")
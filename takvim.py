@@ -0,0 +1,180 @@
+"""Ay takvimi servisi
+
+"YYYY-MM" ay metinleri ve "YYYY-MM-DD" tarihleri bir kez çözülür; ayın gün
+sayısı, günlerin haftanın hangi günü olduğu, hafta sonu işaretleri ve resmi
+tatilleri ay başına bir kez hesaplanıp sınırlı (LRU) önbellekte tutulur.
+Giriş döngüsü ve hesaplama her gün için strptime/datetime kurmak yerine bu
+vektörleri kullanır.
+
+Resmi tatil tablosu tatilleri_ayarla ile değiştirilebilir; anahtarlar her yıl
+tekrarlanan tatiller için "AA-GG", tek yıla özgü tatiller (dini bayramlar
+gibi) için "YYYY-AA-GG" biçimindedir.
+
+Şirket takvim politikası (hafta sonu ve resmi tatillerin eksik günlere hangi
+kodla ön doldurulacağı) çalışma klasöründeki takvim_politikasi.json dosyasından
+ilk kullanımda okunur; dosya yoksa varsayılan politika geçerlidir:
+
+    {"haftasonu": "C", "tatil": "R", "haftasonu_gunleri": [5, 6], "giriste_doldur": true,
+     "tatiller": {"2025-03-30": "Ramazan Bayramı", "05-19": null}}
+
+haftasonu ve tatil doldurulacak kodlardır (null: doldurulmaz), haftasonu_gunleri
+0=Pazartesi ... 6=Pazar biçimindedir. giriste_doldur ile menüden puantaj
+girişinde eksik günler sorulmadan önce doldurulur. Dosyadaki tatiller varsayılan
+tabloya eklenir; null değer varsayılan tatili kaldırır.
+"""
+import calendar
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+
+ONBELLEK_BOYUTU = 256  # Önbellekte tutulan ay / tarih sayısı
+POLITIKA_DOSYASI = "takvim_politikasi.json"
+DOLDURMA_KODLARI = frozenset("CIR")  # Ön doldurmada kullanılabilecek (saatsiz) kodlar
+
+# Her yıl aynı tarihteki resmi tatiller; dini bayramlar yıla göre eklenir
+VARSAYILAN_TATILLER = {
+    "01-01": "Yılbaşı",
+    "04-23": "Ulusal Egemenlik ve Çocuk Bayramı",
+    "05-01": "Emek ve Dayanışma Günü",
+    "05-19": "Atatürk'ü Anma, Gençlik ve Spor Bayramı",
+    "07-15": "Demokrasi ve Milli Birlik Günü",
+    "08-30": "Zafer Bayramı",
+    "10-29": "Cumhuriyet Bayramı",
+}
+
+VARSAYILAN_POLITIKA = {
+    "haftasonu": "C",
+    "tatil": "R",
+    "haftasonu_gunleri": (5, 6),  # 5=Cumartesi, 6=Pazar
+    "giriste_doldur": False,
+}
+
+_politika = None
+
+
+class AyTakvimi:
+    """Bir ayın önceden hesaplanmış takvimi (gün vektörleri 1. günden başlar)"""
+    __slots__ = ("ay", "yil", "ay_no", "gun_sayisi", "hafta_gunleri", "haftasonu", "tatiller",
+                 "doldurma_kodlari")
+
+    def __init__(self, ay, yil, ay_no):
+        ayarlar = politika()
+        tatil_tablosu = ayarlar["tatiller"]
+        self.ay = ay
+        self.yil = yil
+        self.ay_no = ay_no
+        ilk_gun, self.gun_sayisi = calendar.monthrange(yil, ay_no)
+        # Haftanın günü (0=Pazartesi) ve hafta sonu işareti, gun - 1 sırasıyla
+        self.hafta_gunleri = tuple((ilk_gun + i) % 7 for i in range(self.gun_sayisi))
+        self.haftasonu = tuple(gun in ayarlar["haftasonu_gunleri"] for gun in self.hafta_gunleri)
+        self.tatiller = {}  # gun -> tatil adı
+        for gun in range(1, self.gun_sayisi + 1):
+            ad = (tatil_tablosu.get(f"{yil:04d}-{ay_no:02d}-{gun:02d}")
+                  or tatil_tablosu.get(f"{ay_no:02d}-{gun:02d}"))
+            if ad:
+                self.tatiller[gun] = ad
+        # Politikaya göre eksik günlere yazılacak kod (None: doldurulmaz); tatil hafta sonundan önceliklidir
+        self.doldurma_kodlari = tuple(
+            ayarlar["tatil"] if gun in self.tatiller and ayarlar["tatil"]
+            else ayarlar["haftasonu"] if self.haftasonu[gun - 1] else None
+            for gun in range(1, self.gun_sayisi + 1))
+
+    def gun_adi(self, gun):
+        """Günün kısa adı (yerel ayara göre, strftime('%a') ile aynı)"""
+        return calendar.day_abbr[self.hafta_gunleri[gun - 1]]
+
+    def haftasonu_mu(self, gun):
+        return self.haftasonu[gun - 1]
+
+    def tatil_mi(self, gun):
+        return gun in self.tatiller
+
+    def __repr__(self):
+        return f"AyTakvimi({self.ay!r}, {self.gun_sayisi} gün, {len(self.tatiller)} tatil)"
+
+
+@lru_cache(maxsize=ONBELLEK_BOYUTU)
+def ay_coz(ay):
+    """Ay metnini (yil, ay_no) olarak çöz; geçersizse ValueError"""
+    ay_dt = datetime.strptime(ay + "-01", "%Y-%m-%d")
+    return ay_dt.year, ay_dt.month
+
+
+@lru_cache(maxsize=ONBELLEK_BOYUTU)
+def tarih_coz(tarih):
+    """Tarih metnini ("YYYY-MM-DD") datetime olarak çöz; geçersizse ValueError"""
+    return datetime.strptime(tarih, "%Y-%m-%d")
+
+
+def gecerli_ay_mi(ay):
+    """Ay metni "YYYY-MM" biçiminde geçerli mi"""
+    try:
+        ay_coz(ay)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+@lru_cache(maxsize=ONBELLEK_BOYUTU)
+def ay_takvimi(ay):
+    """Ayın takvimini getir (aynı ay için aynı nesne döner); geçersiz ayda ValueError"""
+    return AyTakvimi(ay, *ay_coz(ay))
+
+
+def ay_gun_sayisi(ay):
+    """Ayın gün sayısı (takvim politikasından bağımsız); geçersiz ayda ValueError"""
+    return calendar.monthrange(*ay_coz(ay))[1]
+
+
+def tatilleri_ayarla(tablo):
+    """Resmi tatil tablosunu değiştir ({"AA-GG" veya "YYYY-AA-GG": ad}) ve önbelleği temizle"""
+    politika()["tatiller"] = dict(tablo)
+    ay_takvimi.cache_clear()
+
+
+def tatil_tablosu():
+    """Geçerli resmi tatil tablosunun kopyası"""
+    return dict(politika()["tatiller"])
+
+
+def politika():
+    """Geçerli takvim politikası (ilk çağrıda POLITIKA_DOSYASI'ndan yüklenir)"""
+    if _politika is None:
+        politika_yukle()
+    return _politika
+
+
+def politika_yukle(yol=POLITIKA_DOSYASI):
+    """Takvim politikasını dosyadan yükle (dosya yoksa varsayılan) ve önbelleği temizle
+
+    Geçersiz dosyada ValueError verir.
+    """
+    global _politika
+    dosya = {}
+    if yol and os.path.exists(yol):
+        with open(yol, encoding="utf-8") as f:
+            dosya = json.load(f)
+        if not isinstance(dosya, dict):
+            raise ValueError(f"{yol}: politika bir JSON nesnesi olmalı")
+
+    yeni = dict(VARSAYILAN_POLITIKA)
+    yeni.update((alan, dosya[alan]) for alan in VARSAYILAN_POLITIKA if alan in dosya)
+    for alan in ("haftasonu", "tatil"):
+        if yeni[alan] is not None and yeni[alan] not in DOLDURMA_KODLARI:
+            raise ValueError(f"{yol}: {alan} kodu {', '.join(sorted(DOLDURMA_KODLARI))} veya null olmalı")
+    if not all(isinstance(gun, int) and 0 <= gun <= 6 for gun in yeni["haftasonu_gunleri"]):
+        raise ValueError(f"{yol}: haftasonu_gunleri 0 (Pazartesi) - 6 (Pazar) arası olmalı")
+    yeni["haftasonu_gunleri"] = frozenset(yeni["haftasonu_gunleri"])
+
+    tatiller = dict(VARSAYILAN_TATILLER)
+    for tarih, ad in (dosya.get("tatiller") or {}).items():
+        if ad is None:
+            tatiller.pop(tarih, None)
+        else:
+            tatiller[tarih] = ad
+    yeni["tatiller"] = tatiller
+
+    _politika = yeni
+    ay_takvimi.cache_clear()
+    return _politika
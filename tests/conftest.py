@@ -0,0 +1,66 @@
+"""Testler için ortak ayarlar
+
+Modüller depo kökünden içe aktarılır. Her test boş bir geçici çalışma
+klasöründe çalışır; veri dosyaları, günlük ve yedekler orada oluşur.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import maas  # noqa: E402
+import takvim  # noqa: E402
+
+BICIMLER = ("json", "kolon", "sqlite")
+
+
+def yeni_kayit(calisan_id, ay, kodlar=None, brut_maas=30000, ad_soyad=None):
+    """Test için ay kaydı; kodlar verilmezse ayın tüm günleri C (Çalıştı) girilir"""
+    ay_gun = maas.get_month_days(ay)
+    if kodlar is None:
+        kodlar = "C" * ay_gun
+    return {
+        "id": calisan_id,
+        "ad_soyad": ad_soyad or f"Personel {calisan_id}",
+        "ay": ay,
+        "brut_maas": brut_maas,
+        "ay_gun": ay_gun,
+        "puantaj": [{'gun': gun, 'durum': kod, 'saat': 2 if kod == 'S' else 0}
+                    for gun, kod in enumerate(kodlar, 1)],
+        "hesaplama": {},
+        "durum": "KAPATILMAMIŞ",
+        "aktif": True,
+        "isten_cikma_tarihi": None,
+    }
+
+
+@pytest.fixture
+def calisma_klasoru(tmp_path, monkeypatch):
+    """Boş geçici çalışma klasörü (JSON biçimi, varsayılan takvim politikası)"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(maas, "STORAGE_FORMAT", "json")
+    monkeypatch.setattr(maas, "_gunluk", None)
+    monkeypatch.setattr(takvim, "_politika", None)
+    takvim.ay_takvimi.cache_clear()
+    yield tmp_path
+    if maas._gunluk is not None:
+        maas._gunluk.kapat()
+    takvim.ay_takvimi.cache_clear()
+
+
+@pytest.fixture(params=BICIMLER)
+def bicim(request, calisma_klasoru, monkeypatch):
+    """Testi her depolama biçiminde ayrı çalıştır"""
+    monkeypatch.setattr(maas, "STORAGE_FORMAT", request.param)
+    return request.param
+
+
+@pytest.fixture
+def depo(bicim):
+    """Seçili biçimde boş depo"""
+    depo = maas.get_depo()
+    yield depo
+    if hasattr(depo, "kapat"):
+        depo.kapat()
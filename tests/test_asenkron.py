@@ -0,0 +1,50 @@
+"""asyncio depolama arayüzü: senkron load_data/save_data ile aynı sonuç"""
+import asyncio
+
+import pytest
+
+import maas
+from conftest import yeni_kayit
+
+
+def _veri():
+    return {"1": [yeni_kayit("1", "2025-01"), yeni_kayit("1", "2025-02", "CID")],
+            "2": [yeni_kayit("2", "2025-02", "YS")]}
+
+
+def test_async_kayit_senkron_yuklenir(bicim):
+    assert asyncio.run(maas.save_data_async(_veri()))
+
+    assert maas.load_data() == asyncio.run(maas.load_data_async()) == _veri()
+    assert maas.list_backups()
+
+
+def test_senkron_kayit_ve_gunluk_async_yuklenir(bicim):
+    assert maas.save_data(_veri())
+    assert maas.append_journal({"islem": "puantaj", "id": "2", "ay": "2025-02", "gun": 3, "durum": "C", "saat": 0})
+    assert maas.append_journal({"islem": "ay_kaydi", "id": "3", "kayit": yeni_kayit("3", "2025-03", "")})
+
+    data = asyncio.run(maas.load_data_async())
+
+    assert data == maas.load_data()
+    assert [p["durum"] for p in data["2"][0]["puantaj"]] == ["Y", "S", "C"]
+    assert list(data) == ["1", "2", "3"]
+
+
+def test_ayni_donguden_kayitlar_sirayla_yapilir(bicim):
+    birinci = _veri()
+    ikinci = dict(_veri(), **{"4": [yeni_kayit("4", "2025-02", "")]})
+
+    async def kaydet():
+        return await asyncio.gather(maas.save_data_async(birinci), maas.save_data_async(ikinci))
+
+    assert asyncio.run(kaydet()) == [True, True]
+    assert maas.load_data() == ikinci
+
+
+def test_olay_dongusu_icinden_senkron_cagri_reddedilir(calisma_klasoru):
+    async def cagir():
+        maas.load_data()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cagir())
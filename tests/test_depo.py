@@ -0,0 +1,84 @@
+"""Depo arayüzü: her depolama biçiminde aynı davranış"""
+import pytest
+
+import hesaplama
+import maas
+from conftest import yeni_kayit
+
+AY = "2025-02"
+
+
+def test_acik_kayitlar_sadece_kapatilmamislari_getirir(depo):
+    kapali = yeni_kayit("1", AY)
+    kapali.update(hesaplama=hesaplama.hesapla(kapali), durum="KAPATILDI", kapatma_tarihi="2025-03-01 09:00:00")
+    assert depo.ay_kayitlarini_yaz([("1", kapali), ("2", yeni_kayit("2", AY, "CIDC"))])
+
+    acik = depo.acik_kayitlar(AY)
+
+    assert [kayit["id"] for kayit in acik] == ["2"]
+    # Puantajdaki gün kodları (durum sütunu) kaydın durumuyla karıştırılmaz
+    assert [p["durum"] for p in acik[0]["puantaj"]] == list("CIDC")
+
+
+def test_ay_toplu_kapat(depo):
+    assert depo.ay_kayitlarini_yaz([("1", yeni_kayit("1", AY)), ("2", yeni_kayit("2", AY, "CC"))])
+
+    kapatilanlar, atlananlar = maas.ay_toplu_kapat(AY, depo)
+
+    assert [kayit["id"] for kayit in kapatilanlar] == ["1"]
+    assert [atlanan["id"] for atlanan in atlananlar] == ["2"]
+    kayit = depo.ay_kaydi("1", AY)
+    assert kayit["durum"] == "KAPATILDI"
+    assert kayit["hesaplama"]["net_maas"] == 30000
+    assert [kayit["id"] for kayit in depo.acik_kayitlar(AY)] == ["2"]
+
+
+def test_puantaj_on_doldur(depo):
+    assert depo.ay_kaydi_yaz("1", yeni_kayit("1", AY, ""))
+
+    # Şubat 2025: 8 hafta sonu günü, resmi tatil yok
+    assert maas.puantaj_on_doldur([AY], depo) == (1, 8)
+    assert {p["gun"] for p in depo.ay_kaydi("1", AY)["puantaj"]} == {1, 2, 8, 9, 15, 16, 22, 23}
+
+
+def test_artimli_ay_ozeti_bastan_hesaplamayla_ayni(depo):
+    kodlar = ("CCCCCCCCCCCCCCCCCCCCCCCCCCCC", "CCYCCCCICCCCCDCCCCSCCCCCCRCC", "CICICICICDCDCDCSCSCSYYYCCCCC")
+    kayitlar = [(str(i), yeni_kayit(str(i), AY, kodlar[i % 3], brut_maas=17000 + i * 1234.5678))
+                for i in range(40)]
+    assert depo.ay_kayitlarini_yaz(kayitlar)
+
+    # Kayıtlar tek tek kapatılıp açılır ve maaşları değiştirilir; her yazımda
+    # özetten eski katkı çıkarılıp yenisi eklenir
+    for tur in range(3):
+        for calisan_id, _ in kayitlar:
+            kayit = depo.ay_kaydi(calisan_id, AY)
+            kayit["brut_maas"] = kayit["brut_maas"] * 1.0731 + tur / 3
+            kayit.update(hesaplama=hesaplama.hesapla(kayit), durum="KAPATILDI")
+            assert depo.ay_kaydi_yaz(calisan_id, kayit)
+        assert maas.ay_toplu_kapat(AY, depo)[0] == []
+
+    ozet = depo.ay_ozeti(AY)
+    assert depo.ozetleri_yeniden_olustur() == []
+    assert depo.ay_ozeti(AY) == ozet
+    assert ozet["toplam_net_maas"] == round(sum(k["hesaplama"]["net_maas"] for k in depo.ay_kayitlari(AY)), 2)
+
+
+def test_ay_kaydi_yazimi_isten_cikisi_korur(depo):
+    assert depo.ay_kaydi_yaz("1", yeni_kayit("1", "2025-01"))
+    assert depo.ay_kaydi_yaz("1", dict(yeni_kayit("1", AY, "CC"), aktif=False, isten_cikma_tarihi="2025-02-02"))
+
+    kayit = depo.ay_kaydi("1", AY)
+    assert (kayit["aktif"], kayit["isten_cikma_tarihi"]) == (False, "2025-02-02")
+
+
+def test_ay_kaydi_olmayan_aya_puantaj_girilemez(depo):
+    assert depo.ay_kaydi_yaz("1", yeni_kayit("1", AY, ""))
+
+    with pytest.raises(ValueError):
+        depo.puantaj_ekle("1", "2025-03", {"gun": 1, "durum": "C", "saat": 0})
+    with pytest.raises(ValueError):
+        depo.puantaj_ekle("2", AY, {"gun": 1, "durum": "C", "saat": 0})
+
+    assert depo.puantaj_ekle("1", AY, {"gun": 1, "durum": "C", "saat": 0})
+    assert [kayit["ay"] for kayit in depo.personel_kayitlari("1")] == [AY]
+    assert depo.ay_kaydi("1", AY)["puantaj"] == [{"gun": 1, "durum": "C", "saat": 0}]
@@ -0,0 +1,74 @@
+"""Dışa aktarma: XLSX çalışma kitabı ve CSV dosyası açılıp okunabilir"""
+import csv
+import zipfile
+from xml.etree import ElementTree
+
+import disa_aktarma
+import hesaplama
+from conftest import yeni_kayit
+
+NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def _ogeler():
+    kapali = yeni_kayit("1", "2025-02", ad_soyad="Ayşe <Çelik> & Oğlu")
+    kapali.update(hesaplama=hesaplama.hesapla(kapali), durum="KAPATILDI")
+    return [("1", [kapali]), ("2", [yeni_kayit("2", "2025-02", "CS"), yeni_kayit("2", "2025-03", "")])]
+
+
+def _hucre_degeri(hucre):
+    deger = hucre.find("x:is/x:t" if hucre.get("t") == "inlineStr" else "x:v", NS)
+    return None if deger is None else deger.text
+
+
+def _sayfa_satirlari(arsiv, ad):
+    """Sayfa XML'ini ayrıştırıp hücre metinlerini satır satır getir (boş hücre None)"""
+    kok = ElementTree.fromstring(arsiv.read(ad))
+    return [[_hucre_degeri(hucre) for hucre in satir] for satir in kok.iterfind("x:sheetData/x:row", NS)]
+
+
+def test_xlsx_acilir_ve_sayfa_ayristirilir(calisma_klasoru):
+    assert disa_aktarma.disa_aktar(_ogeler(), "bordro.xlsx", aylar=["2025-02"]) == 2
+
+    with zipfile.ZipFile("bordro.xlsx") as arsiv:
+        assert arsiv.testzip() is None
+        assert {"[Content_Types].xml", "xl/workbook.xml", "xl/worksheets/sheet1.xml"} <= set(arsiv.namelist())
+        ElementTree.fromstring(arsiv.read("xl/workbook.xml"))
+        satirlar = _sayfa_satirlari(arsiv, "xl/worksheets/sheet1.xml")
+
+    sutunlar = [ad for ad, _ in disa_aktarma.BORDRO_SUTUNLARI]
+    assert satirlar[0] == sutunlar
+    assert len(satirlar) == 3
+    ilk = dict(zip(sutunlar, satirlar[1]))
+    assert (ilk["ad_soyad"], ilk["durum"], ilk["aktif"], float(ilk["net_maas"])) == \
+        ("Ayşe <Çelik> & Oğlu", "KAPATILDI", "1", 30000)
+    assert dict(zip(sutunlar, satirlar[2]))["net_maas"] is None
+
+
+def test_xlsx_satir_sinirinda_yeni_sayfa(calisma_klasoru, monkeypatch):
+    monkeypatch.setattr(disa_aktarma, "XLSX_SATIR_SINIRI", 20)
+
+    assert disa_aktarma.disa_aktar(_ogeler(), "puantaj.xlsx", icerik="puantaj") == 30
+
+    with zipfile.ZipFile("puantaj.xlsx") as arsiv:
+        sayfalar = [_sayfa_satirlari(arsiv, f"xl/worksheets/sheet{i}.xml") for i in (1, 2)]
+        adlar = [sayfa.get("name") for sayfa in ElementTree.fromstring(arsiv.read("xl/workbook.xml")).iter(
+            "{%s}sheet" % NS["x"])]
+    assert [len(sayfa) - 1 for sayfa in sayfalar] == [20, 10]
+    assert adlar == ["Puantaj 1", "Puantaj 2"]
+
+
+def test_bos_xlsx_baslikli_tek_sayfa(calisma_klasoru):
+    assert disa_aktarma.disa_aktar([], "bos.xlsx") == 0
+
+    with zipfile.ZipFile("bos.xlsx") as arsiv:
+        assert len(_sayfa_satirlari(arsiv, "xl/worksheets/sheet1.xml")) == 1
+
+
+def test_csv(calisma_klasoru):
+    assert disa_aktarma.disa_aktar(_ogeler(), "puantaj.csv", icerik="puantaj", aylar=["2025-02"]) == 30
+
+    with open("puantaj.csv", encoding="utf-8-sig", newline="") as f:
+        satirlar = list(csv.reader(f))
+    assert satirlar[0] == [ad for ad, _ in disa_aktarma.PUANTAJ_SUTUNLARI]
+    assert satirlar[-1] == ["2", "Personel 2", "2025-02", "2", "S", "2"]
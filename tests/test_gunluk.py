@@ -0,0 +1,81 @@
+"""Günlük (write-ahead journal): çökme sonrası yeniden oynatma aynı duruma ulaşır"""
+import pytest
+
+import maas
+from conftest import yeni_kayit
+
+AY = "2025-02"
+
+
+def _islemler(depo):
+    """Ana dosyayı yeniden yazmadan günlüğe eklenen işlemler"""
+    assert depo.ay_kaydi_yaz("1", yeni_kayit("1", AY, "CC"))
+    assert depo.ay_kayitlarini_yaz([("2", yeni_kayit("2", AY, "")), ("3", yeni_kayit("3", AY, "C"))])
+    for gun, kod in enumerate("CIDYC", 3):
+        assert depo.puantaj_ekle("1", AY, {"gun": gun, "durum": kod, "saat": 0})
+    assert depo.puantaj_ekle("2", AY, {"gun": 1, "durum": "S", "saat": 3})
+    assert depo.personel_guncelle("1", {"ad_soyad": "Yeni Ad"})
+    assert depo.personel_guncelle("3", {"brut_maas": 41000}, sadece_acik=True)
+    assert depo.personel_guncelle("2", {"aktif": False, "isten_cikma_tarihi": "2025-02-14"})
+
+
+@pytest.fixture(params=("json", "kolon"))
+def dosya_bicimi(request, calisma_klasoru, monkeypatch):
+    monkeypatch.setattr(maas, "STORAGE_FORMAT", request.param)
+    # Başlangıç durumu ana dosyada, sonraki değişiklikler sadece günlükte
+    maas.write_snapshot({"9": [yeni_kayit("9", "2025-01")]})
+    return request.param
+
+
+def test_cokme_sonrasi_gunluk_ayni_durumu_kurar(dosya_bicimi):
+    depo = maas.DosyaDepo()
+    _islemler(depo)
+    beklenen = depo.tumu()
+    assert maas.journal_size() > 0
+
+    # Süreç kapanmadan (ana dosya yazılmadan) yeni süreç verileri yükler
+    maas.journal_writer().kapat()
+    assert maas.load_data() == beklenen
+    assert maas.DosyaDepo().tumu() == beklenen
+    assert dict(maas.personel_akisi()) == beklenen
+
+
+def test_yarim_kalan_son_satir_atlanir(dosya_bicimi, capsys):
+    depo = maas.DosyaDepo()
+    _islemler(depo)
+    beklenen = depo.tumu()
+    maas.journal_writer().kapat()
+
+    # Yazımı ortasında kesilmiş kayıt
+    with open(maas.JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write('{"islem": "puantaj", "id": "1", "ay": "2025-02", "gun": 8, "dur')
+
+    assert maas.load_data() == beklenen
+    assert "yarım kalmış" in capsys.readouterr().out
+
+
+def test_sikistirma_sonrasi_durum_ayni(dosya_bicimi):
+    depo = maas.DosyaDepo()
+    _islemler(depo)
+    beklenen = depo.tumu()
+
+    assert maas.compact_journal(beklenen)
+
+    assert maas.journal_size() == 0
+    assert maas.load_data() == beklenen
+
+
+def test_ana_dosya_yazimi_kesilirse_eski_dosya_ve_gunluk_kalir(dosya_bicimi, monkeypatch):
+    depo = maas.DosyaDepo()
+    _islemler(depo)
+    beklenen = depo.tumu()
+
+    def kesilen_yazim(data):
+        raise IOError("disk dolu")
+
+    with monkeypatch.context() as yama:
+        yama.setattr(maas, "write_snapshot", kesilen_yazim)
+        assert not maas.save_data(beklenen)
+
+    assert maas.journal_size() > 0
+    assert maas.load_data() == beklenen
@@ -0,0 +1,79 @@
+"""Çökmeye dayanıklı yazım: atomik dosya yazımı ve grup kaydı günlüğü"""
+import gc
+import os
+import subprocess
+import sys
+import threading
+import weakref
+
+import pytest
+
+from guvenli_yazim import GrupGunluk, atomik_yaz
+
+
+def test_atomik_yaz_hata_olursa_eski_dosya_kalir(calisma_klasoru):
+    with atomik_yaz("veri.json") as f:
+        f.write("eski")
+
+    with pytest.raises(RuntimeError):
+        with atomik_yaz("veri.json") as f:
+            f.write("yarım")
+            raise RuntimeError
+
+    assert open("veri.json", encoding="utf-8").read() == "eski"
+    assert os.listdir(calisma_klasoru) == ["veri.json"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX dosya izinleri")
+def test_atomik_yaz_izinleri_korur(calisma_klasoru):
+    with atomik_yaz("veri.json") as f:
+        f.write("1")
+    os.chmod("veri.json", 0o640)
+
+    with atomik_yaz("veri.json") as f:
+        f.write("2")
+
+    assert os.stat("veri.json").st_mode & 0o777 == 0o640
+
+
+def test_ayni_dosyaya_eszamanli_atomik_yazim(calisma_klasoru):
+    hatalar = []
+
+    def yaz(numara):
+        try:
+            for _ in range(50):
+                with atomik_yaz("veri.json") as f:
+                    f.write(str(numara) * 1000)
+        except Exception as e:
+            hatalar.append(e)
+
+    is_parcaciklari = [threading.Thread(target=yaz, args=(numara,)) for numara in range(4)]
+    for is_parcacigi in is_parcaciklari:
+        is_parcacigi.start()
+    for is_parcacigi in is_parcaciklari:
+        is_parcacigi.join()
+
+    assert hatalar == []
+    icerik = open("veri.json", encoding="utf-8").read()
+    assert len(icerik) == 1000 and len(set(icerik)) == 1
+    assert os.listdir(calisma_klasoru) == ["veri.json"]
+
+
+def test_kapatilan_gunluk_bellekte_tutulmaz(calisma_klasoru):
+    gunluk = GrupGunluk("gunluk.jsonl")
+    gunluk.ekle("1\n")
+    gunluk.kapat()
+    referans = weakref.ref(gunluk)
+    del gunluk
+    gc.collect()
+
+    assert referans() is None
+
+
+def test_surec_kapanirken_bekleyen_eklemeler_yazilir(calisma_klasoru):
+    kod = ("import sys; sys.path.insert(0, sys.argv[1]); import guvenli_yazim; "
+           "g = guvenli_yazim.GrupGunluk('gunluk.jsonl', pencere=60); g.ekle('1\\n'); g.ekle('2\\n')")
+    kok = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", kod, kok], check=True)
+
+    assert open("gunluk.jsonl", encoding="utf-8").read() == "1\n2\n"
@@ -0,0 +1,236 @@
+"""Hesaplama motoru: tekli, toplu ve paralel hesaplama ilk sürümdeki kapatma hesabıyla aynı sonucu verir"""
+import random
+
+import pytest
+
+import hesaplama
+import kolon_depo
+
+AYLAR = (("2025-01", 31), ("2025-02", 28), ("2024-02", 29), ("2025-04", 30))
+
+
+def eski_kapatma_hesabi(kayit):
+    """İlk sürümde ay kapatılırken kayda yazılan hesaplama (karşılaştırma için aynen korunmuştur)"""
+    isten_cikis_tarihi = kayit.get("isten_cikma_tarihi")
+    max_gun = kayit["ay_gun"]
+    if isten_cikis_tarihi and isten_cikis_tarihi[:7] == kayit["ay"]:
+        max_gun = int(isten_cikis_tarihi[8:10])
+    puantaj_filtreli = [p for p in kayit["puantaj"] if p['gun'] <= max_gun]
+
+    net_tutar_gunluk = kayit["brut_maas"] / kayit["ay_gun"]
+    net_tutar_saatlik = net_tutar_gunluk / 9
+
+    calisilan_gun = izinli_gun = devamsiz_gun = yarim_gun = saatlik_kesinti_toplam = resmi_tatil_gun = 0
+    yarim_gun_maas = 0
+    for p in puantaj_filtreli:
+        kod = p['durum']
+        if kod == 'C':
+            calisilan_gun += 1
+        elif kod == 'I':
+            izinli_gun += 1
+        elif kod == 'D':
+            devamsiz_gun += 1
+        elif kod == 'Y':
+            yarim_gun += 1
+            yarim_gun_maas += net_tutar_gunluk / 2
+        elif kod == 'S':
+            saatlik_kesinti_toplam += p['saat']
+        elif kod == 'R':
+            resmi_tatil_gun += 1
+
+    izinli_kesinti = izinli_gun * net_tutar_gunluk
+    devamsiz_kesinti = devamsiz_gun * net_tutar_gunluk * 2
+    saatlik_kesinti = saatlik_kesinti_toplam * net_tutar_saatlik
+    toplam_maas = (calisilan_gun * net_tutar_gunluk) + yarim_gun_maas + (resmi_tatil_gun * net_tutar_gunluk)
+    net_maas = toplam_maas - izinli_kesinti - devamsiz_kesinti - saatlik_kesinti
+    return {
+        "calisilan_gun": calisilan_gun,
+        "yarim_gun": yarim_gun,
+        "izinli_gun": izinli_gun,
+        "devamsiz_gun": devamsiz_gun,
+        "resmi_tatil_gun": resmi_tatil_gun,
+        "yarim_gun_maas": round(yarim_gun_maas, 2),
+        "izinli_kesinti": round(izinli_kesinti, 2),
+        "devamsiz_kesinti": round(devamsiz_kesinti, 2),
+        "saatlik_kesinti_toplam": saatlik_kesinti_toplam,
+        "saatlik_kesinti": round(saatlik_kesinti, 2),
+        "resmi_tatil_maas": round(resmi_tatil_gun * net_tutar_gunluk, 2),
+        "toplam_maas": round(toplam_maas, 2),
+        "net_maas": round(max(0, net_maas), 2)
+    }
+
+
+def rastgele_kayitlar(adet, tohum=7):
+    """Kuruşlu brüt maaşlı, her kodun geçtiği tekrarlanabilir ay kayıtları (personel başına 4 ay)"""
+    rastgele = random.Random(tohum)
+    kayitlar = []
+    for i in range(adet):
+        ay, ay_gun = AYLAR[i % len(AYLAR)]
+        puantaj = []
+        for gun in range(1, ay_gun + 1):
+            kod = rastgele.choice("CCCCIDYYSR")
+            puantaj.append({'gun': gun, 'durum': kod, 'saat': rastgele.randint(1, 12) if kod == 'S' else 0})
+        kayitlar.append({
+            "id": str(i // len(AYLAR)),
+            "ay": ay,
+            "ay_gun": ay_gun,
+            "brut_maas": round(rastgele.uniform(17000, 120000), 2),
+            "puantaj": puantaj,
+            "isten_cikma_tarihi": f"{ay}-{rastgele.randint(1, ay_gun):02d}" if i % 7 == 0 else None,
+        })
+    return kayitlar
+
+
+def test_hesapla_eski_kapatma_hesabiyla_ayni():
+    kayitlar = rastgele_kayitlar(20000)
+
+    assert [hesaplama.hesapla(kayit) for kayit in kayitlar] == [eski_kapatma_hesabi(kayit) for kayit in kayitlar]
+
+
+def test_toplu_hesapla_eski_kapatma_hesabiyla_ayni():
+    kayitlar = rastgele_kayitlar(20000)
+
+    assert hesaplama.toplu_hesapla(kayitlar) == [eski_kapatma_hesabi(kayit) for kayit in kayitlar]
+
+
+def tekrarli_kayitlar():
+    """Aynı günün birden çok girildiği kayıtlar"""
+    kayit = {"id": "1", "ay": "2025-02", "ay_gun": 28, "brut_maas": 28000, "isten_cikma_tarihi": None,
+             "puantaj": [{'gun': 1, 'durum': 'C', 'saat': 0}, {'gun': 1, 'durum': 'C', 'saat': 0}]}
+    ustune = dict(kayit, puantaj=[{'gun': 2, 'durum': 'S', 'saat': 3}, {'gun': 2, 'durum': 'D', 'saat': 0},
+                                  {'gun': 3, 'durum': 'Y', 'saat': 0}, {'gun': 3, 'durum': 'S', 'saat': 4}])
+    return [kayit, ustune]
+
+
+def test_ayni_gunun_son_girisi_gecerli():
+    kayit, ustune = tekrarli_kayitlar()
+
+    assert hesaplama.hesapla(kayit)["toplam_maas"] == 1000
+    sonuc = hesaplama.hesapla(ustune)
+    assert (sonuc["devamsiz_gun"], sonuc["yarim_gun"], sonuc["saatlik_kesinti_toplam"]) == (1, 0, 4)
+
+
+@pytest.mark.skipif(hesaplama.np is None, reason="NumPy kurulu değil")
+def test_numpy_toplu_hesapla_tekli_hesaplamayla_ayni():
+    kayitlar = rastgele_kayitlar(2000) + tekrarli_kayitlar()
+
+    assert hesaplama.toplu_hesapla(kayitlar) == [hesaplama.hesapla(kayit) for kayit in kayitlar]
+
+
+def nisan_kaydi(kodlar, isten_cikma_tarihi=None):
+    """30 günlük ay, günlük ücret 1000 TL, saatlik 1000/9 TL"""
+    return {"id": "1", "ay": "2025-04", "ay_gun": 30, "brut_maas": 30000, "isten_cikma_tarihi": isten_cikma_tarihi,
+            "puantaj": [{'gun': gun, 'durum': kod, 'saat': 3 if kod == 'S' else 0}
+                        for gun, kod in enumerate(kodlar, 1)]}
+
+
+@pytest.mark.parametrize("kod, beklenen", [
+    ("C", {"calisilan_gun": 30, "toplam_maas": 30000, "net_maas": 30000}),
+    ("I", {"izinli_gun": 1, "izinli_kesinti": 1000, "toplam_maas": 29000, "net_maas": 28000}),
+    ("D", {"devamsiz_gun": 1, "devamsiz_kesinti": 2000, "toplam_maas": 29000, "net_maas": 27000}),
+    ("Y", {"yarim_gun": 1, "yarim_gun_maas": 500, "toplam_maas": 29500, "net_maas": 29500}),
+    ("S", {"saatlik_kesinti_toplam": 3, "saatlik_kesinti": 333.33, "toplam_maas": 29000, "net_maas": 28666.67}),
+    ("R", {"resmi_tatil_gun": 1, "resmi_tatil_maas": 1000, "toplam_maas": 30000, "net_maas": 30000}),
+])
+def test_durum_kodlari(kod, beklenen):
+    kayit = nisan_kaydi("C" * 29 + kod)
+
+    sonuc = hesaplama.hesapla(kayit)
+
+    assert sonuc == eski_kapatma_hesabi(kayit)
+    assert {alan: sonuc[alan] for alan in beklenen} == beklenen
+    if kod != "C":
+        assert sonuc["calisilan_gun"] == 29
+
+
+def test_isten_cikis_ayinda_cikis_gunune_kadar_hesaplanir():
+    kayit = nisan_kaydi("C" * 10 + "D" * 20, isten_cikma_tarihi="2025-04-10")
+
+    sonuc = hesaplama.hesapla(kayit)
+
+    assert (sonuc["calisilan_gun"], sonuc["devamsiz_gun"], sonuc["net_maas"]) == (10, 0, 10000)
+    assert sonuc == eski_kapatma_hesabi(kayit)
+    # Çıkış başka bir aydaysa puantajın tamamı dikkate alınır
+    assert hesaplama.hesapla(dict(kayit, isten_cikma_tarihi="2025-05-10"))["devamsiz_gun"] == 20
+
+
+def test_devamsiz_gun_cezasi_iki_gunluk_ucret():
+    kayit = nisan_kaydi("C" * 27 + "DDD")
+
+    sonuc = hesaplama.hesapla(kayit)
+
+    assert (sonuc["devamsiz_kesinti"], sonuc["net_maas"]) == (6000, 21000)
+    assert hesaplama.hesapla(kayit, {"devamsiz_carpani": 1})["devamsiz_kesinti"] == 3000
+
+
+def test_net_maas_sifirin_altina_inmez():
+    kayit = nisan_kaydi("C" * 10 + "D" * 20)
+
+    sonuc = hesaplama.hesapla(kayit)
+
+    assert (sonuc["toplam_maas"], sonuc["devamsiz_kesinti"], sonuc["net_maas"]) == (10000, 40000, 0)
+    assert sonuc == eski_kapatma_hesabi(kayit)
+
+
+@pytest.mark.parametrize("isci_sayisi, parca_boyutu", [(2, 7), (3, 50), (1, 7)])
+def test_paralel_hesapla_sirayla_tekli_hesaplamayla_ayni(isci_sayisi, parca_boyutu):
+    kayitlar = rastgele_kayitlar(203) + tekrarli_kayitlar()
+
+    sonuclar = hesaplama.paralel_hesapla(kayitlar, isci_sayisi=isci_sayisi, parca_boyutu=parca_boyutu)
+
+    assert sonuclar == [hesaplama.hesapla(kayit) for kayit in kayitlar]
+
+
+def test_paralel_hesapla_kolon_puantaji():
+    kayitlar = rastgele_kayitlar(40)
+    for kayit in kayitlar:
+        kayit["puantaj"] = kolon_depo.PuantajDizisi(kayit["puantaj"])
+
+    sonuclar = hesaplama.paralel_hesapla(kayitlar, isci_sayisi=2, parca_boyutu=9)
+
+    assert sonuclar == [hesaplama.hesapla(kayit) for kayit in kayitlar]
+
+
+def test_kodlanmis_parca_hesabi():
+    kayitlar = rastgele_kayitlar(12)  # 3 personel x 4 ay
+    kodlar = [hesaplama._kodla(kayit, hesaplama.son_gun(kayit)[0]) for kayit in kayitlar]
+
+    sonuclar = hesaplama._parca_hesapla(kodlar, hesaplama.kurallari_al())
+
+    assert [dict(zip(hesaplama.HESAPLAMA_ALANLARI, sonuc)) for sonuc in sonuclar] == \
+        [hesaplama.hesapla(kayit) for kayit in kayitlar]
+
+
+@pytest.fixture
+def bos_onizleme(monkeypatch):
+    monkeypatch.setattr(hesaplama, "_onizlemeler", {})
+    monkeypatch.setattr(hesaplama, "onizleme_sayaci", {"isabet": 0, "iska": 0})
+    return hesaplama.onizleme_sayaci
+
+
+def test_onizleme_onbellegi(bos_onizleme):
+    kayit = nisan_kaydi("C" * 10)
+
+    ilk = hesaplama.onizle(kayit)
+    ilk["net_maas"] = -1  # Dönen sözlük önbellekteki sonucu değiştirmez
+    assert hesaplama.onizle(dict(kayit, puantaj=list(kayit["puantaj"]))) == hesaplama.hesapla(kayit)
+    assert bos_onizleme == {"isabet": 1, "iska": 1}
+
+    kayit["puantaj"].append({'gun': 11, 'durum': 'D', 'saat': 0})
+    assert hesaplama.onizle(kayit) == hesaplama.hesapla(kayit)
+    assert hesaplama.onizle(kayit, {"devamsiz_carpani": 1}) == hesaplama.hesapla(kayit, {"devamsiz_carpani": 1})
+    assert hesaplama.onizle(dict(kayit, brut_maas=31000))["toplam_maas"] == 10333.33
+    assert bos_onizleme == {"isabet": 1, "iska": 4}
+
+
+def test_onizleme_onbellegi_sinirli(bos_onizleme, monkeypatch):
+    monkeypatch.setattr(hesaplama, "ONIZLEME_ONBELLEK_BOYUTU", 2)
+    kayitlar = [nisan_kaydi("C" * gun) for gun in (1, 2, 3)]
+
+    for kayit in kayitlar:
+        hesaplama.onizle(kayit)
+    hesaplama.onizle(kayitlar[2])
+    hesaplama.onizle(kayitlar[0])
+
+    assert len(hesaplama._onizlemeler) == 2
+    assert bos_onizleme == {"isabet": 1, "iska": 4}
@@ -0,0 +1,92 @@
+"""HTTP servisi: boş bir porttaki sunucuya gerçek istekler"""
+import http.client
+import json
+import logging
+import threading
+from urllib.parse import quote
+
+import pytest
+
+import http_servisi
+import maas
+
+
+@pytest.fixture
+def sunucu(calisma_klasoru, monkeypatch):
+    monkeypatch.setattr(maas, "JOURNAL_GROUP_COMMIT_WINDOW", 0)
+    sunucu = http_servisi.sunucu_olustur(port=0, isci_sayisi=2, grup_ms=0)
+    is_parcacigi = threading.Thread(target=sunucu.serve_forever, args=(0.05,), daemon=True)
+    is_parcacigi.start()
+    yield sunucu
+    sunucu.shutdown()
+    sunucu.server_close()
+    is_parcacigi.join()
+
+
+def istek(sunucu, yontem, yol, govde=None):
+    baglanti = http.client.HTTPConnection(*sunucu.server_address, timeout=10)
+    try:
+        baglanti.request(yontem, yol, body=None if govde is None else json.dumps(govde),
+                         headers={"Content-Type": "application/json"})
+        yanit = baglanti.getresponse()
+        return yanit.status, json.loads(yanit.read())
+    finally:
+        baglanti.close()
+
+
+def test_yuzde_kodlu_kimlik(sunucu):
+    calisan_id = "Ş 1/2"
+    durum, _ = istek(sunucu, "POST", "/puantaj", {"id": calisan_id, "ay": "2025-02", "gun": "1-2", "kod": "C",
+                                                  "ad_soyad": "Şule Işık", "brut_maas": 28000})
+    assert durum == 200
+
+    durum, kayitlar = istek(sunucu, "GET", "/personel/" + quote(calisan_id, safe=""))
+
+    assert durum == 200
+    assert [(kayit["id"], kayit["ay"], len(kayit["puantaj"])) for kayit in kayitlar] == [(calisan_id, "2025-02", 2)]
+    assert istek(sunucu, "GET", "/personel/%FF")[0] == 400
+
+
+def test_yardimci_ciktilari_stdout_yerine_logginge_gider(sunucu, capsys, caplog):
+    istek(sunucu, "POST", "/puantaj", {"id": "1", "ay": "2025-02", "gun": "1-28", "kod": "C",
+                                       "ad_soyad": "Personel 1", "brut_maas": 28000})
+    capsys.readouterr()
+
+    with caplog.at_level(logging.INFO, logger="http_servisi"):
+        durum, sonuc = istek(sunucu, "POST", "/kapat", {"ay": "2025-02", "tumu": True})
+
+    assert durum == 200 and [satir["durum"] for satir in sonuc] == ["KAPATILDI"]
+    assert capsys.readouterr().out == ""
+    assert "2025-02 ayı toplu kapatma sonucu:" in caplog.messages
+
+
+def test_puantaj_kapatma_ve_rapor(sunucu):
+    assert istek(sunucu, "POST", "/puantaj", {"id": "1", "ay": "2025-02", "gun": "1-27", "kod": "C",
+                                              "ad_soyad": "Personel 1", "brut_maas": 28000}) == \
+        (200, {"eklenen": 27, "mevcut": 0, "yeni_ay": 1})
+    assert istek(sunucu, "POST", "/puantaj", {"id": "1", "ay": "2025-02", "gun": [28], "kod": "S", "saat": 9}) == \
+        (200, {"eklenen": 1, "mevcut": 0, "yeni_ay": 0})
+    assert istek(sunucu, "GET", "/personel") == (200, [{"id": "1", "ad_soyad": "Personel 1", "aktif": True}])
+
+    durum, sonuc = istek(sunucu, "POST", "/kapat", {"ay": "2025-02", "id": "1"})
+    assert durum == 200 and sonuc["net_maas"] == 26000
+
+    durum, kayit = istek(sunucu, "GET", "/personel/1?ay=2025-02")
+    assert durum == 200 and kayit[0]["durum"] == "KAPATILDI"
+    durum, rapor = istek(sunucu, "GET", "/rapor/2025-02")
+    assert durum == 200 and rapor["toplamlar"]["toplam_net_maas"] == 26000
+    durum, metrikler = istek(sunucu, "GET", "/metrikler")
+    assert durum == 200 and metrikler["rotalar"]["POST /puantaj"]["adet"] == 2
+
+
+@pytest.mark.parametrize("yontem, yol, govde, beklenen", [
+    ("GET", "/yok", None, 404),
+    ("POST", "/personel", {}, 404),
+    ("POST", "/puantaj", {"id": "1"}, 400),
+    ("POST", "/kapat", {"ay": "2025-13", "tumu": True}, 400),
+    ("GET", "/personel/9", None, 400),
+])
+def test_hatali_istekler(sunucu, yontem, yol, govde, beklenen):
+    durum, yanit = istek(sunucu, yontem, yol, govde)
+
+    assert durum == beklenen and "hata" in yanit
@@ -0,0 +1,85 @@
+"""Toplu puantaj içe aktarma: doğrulama kuralları ve tek işlemle yazım"""
+import hesaplama
+import ice_aktarma
+import maas
+from conftest import yeni_kayit
+
+
+def _hazirla(depo):
+    kapali = yeni_kayit("1", "2025-01")
+    kapali.update(hesaplama=hesaplama.hesapla(kapali), durum="KAPATILDI")
+    assert depo.ay_kayitlarini_yaz([
+        ("1", kapali),
+        ("1", yeni_kayit("1", "2025-02", "CC")),
+        ("2", dict(yeni_kayit("2", "2025-02", ""), aktif=False, isten_cikma_tarihi="2025-02-10")),
+    ])
+
+
+def _satirlar(*satirlar):
+    return [(i,) + satir for i, satir in enumerate(satirlar, 1)]
+
+
+def test_hatali_satirlar_reddedilir_ve_hicbir_sey_yazilmaz(depo):
+    _hazirla(depo)
+    onceki = depo.tumu()
+
+    sonuc = ice_aktarma.ice_aktar(depo, _satirlar(
+        ("1", "2025-02-03", "C", ""),  # geçerli
+        ("1", "2025-02-30", "C", ""),
+        ("1", "2025/02/04", "C", ""),
+        ("1", "2025-13-01", "C", ""),
+        ("1", "2025-02-05", "X", ""),
+        ("1", "2025-02-06", "S", ""),
+        ("1", "2025-02-06", "S", "13"),
+        ("1", "2025-02-07", "C", "2"),
+        ("9", "2025-02-03", "C", ""),
+        ("2", "2025-02-11", "C", ""),
+        ("1", "2025-01-15", "C", ""),
+        (None, None, None, None),
+    ))
+
+    assert sonuc["okunan"] == 12
+    assert sonuc["eklenen"] == 1
+    assert sonuc["hata_sayisi"] == 11
+    assert not sonuc["yazildi"]
+    mesajlar = "\n".join(sonuc["hatalar"])
+    for beklenen in ("2. satır: geçersiz tarih", "3. satır: geçersiz tarih", "4. satır: geçersiz tarih",
+                     "5. satır: geçersiz kod: X", "6. satır: S kodu için saat", "7. satır: S kodu için saat",
+                     "8. satır: saat sadece S kodunda", "9. satır: kayıtlı personel değil: 9",
+                     "10. satır: işten çıkış tarihinden (2025-02-10) sonra", "11. satır: 2025-01 ayı kapatılmış",
+                     "12. satır: satır okunamadı"):
+        assert beklenen in mesajlar
+    assert depo.tumu() == onceki
+
+
+def test_hatalari_atla_ile_gecerli_satirlar_yazilir(depo):
+    _hazirla(depo)
+
+    sonuc = ice_aktarma.ice_aktar(depo, _satirlar(
+        ("1", "2025-02-01", "D", ""),  # girilmiş gün korunur
+        ("1", "2025-02-03", "s", "2"),
+        ("1", "2025-03-01", "C", ""),  # yeni ay kaydı
+        ("1", "2025-02-05", "X", ""),
+        ("2", "2025-02-10", "I", "0"),
+    ), hatalari_atla=True)
+
+    assert (sonuc["eklenen"], sonuc["mevcut"], sonuc["yeni_ay"], sonuc["hata_sayisi"]) == (3, 1, 1, 1)
+    assert sonuc["yazildi"]
+    assert depo.ay_kaydi("1", "2025-02")["puantaj"] == [
+        {"gun": 1, "durum": "C", "saat": 0}, {"gun": 2, "durum": "C", "saat": 0},
+        {"gun": 3, "durum": "S", "saat": 2}]
+    mart = depo.ay_kaydi("1", "2025-03")
+    assert (mart["ay_gun"], mart["brut_maas"], mart["durum"]) == (31, 30000, "KAPATILMAMIŞ")
+    assert depo.ay_kaydi("2", "2025-02")["puantaj"] == [{"gun": 10, "durum": "I", "saat": 0}]
+
+
+def test_dosya_okuma(tmp_path):
+    csv_yolu = tmp_path / "puantaj.csv"
+    csv_yolu.write_text("calisan_id,tarih,kod,saat\n1,2025-02-03,C,\n\n2,2025-02-04,S,3\n", encoding="utf-8")
+    jsonl_yolu = tmp_path / "puantaj.jsonl"
+    jsonl_yolu.write_text('{"id": "1", "date": "2025-02-03", "code": "C"}\nbozuk\n[1]\n', encoding="utf-8")
+
+    assert list(ice_aktarma.satirlari_oku(str(csv_yolu))) == [
+        (2, "1", "2025-02-03", "C", ""), (4, "2", "2025-02-04", "S", "3")]
+    assert list(ice_aktarma.satirlari_oku(str(jsonl_yolu))) == [
+        (1, "1", "2025-02-03", "C", ""), (2, None, None, None, None), (3, None, None, None, None)]
@@ -0,0 +1,52 @@
+"""Kolon deposu: yazılıp okunan kayıtlar aynı kalır, bozuk dosya reddedilir"""
+import pytest
+
+import kolon_depo
+from conftest import yeni_kayit
+
+
+def _veri():
+    return {
+        "1": [yeni_kayit("1", "2025-01", "CIDYSR"), yeni_kayit("1", "2025-02", "")],
+        "2": [yeni_kayit("2", "2025-01", "C" * 31)],
+        "3": [],
+    }
+
+
+def test_yazilan_veri_ayni_okunur(calisma_klasoru):
+    data = _veri()
+    kolon_depo.yaz(data, "veri.bin")
+
+    okunan = kolon_depo.oku("veri.bin")
+
+    assert list(okunan) == ["1", "2", "3"]
+    for calisan_id, kayitlar in data.items():
+        assert len(okunan[calisan_id]) == len(kayitlar)
+        for beklenen, kayit in zip(kayitlar, okunan[calisan_id]):
+            assert isinstance(kayit["puantaj"], kolon_depo.PuantajDizisi)
+            assert kayit["puantaj"] == beklenen["puantaj"]
+            assert {k: v for k, v in kayit.items() if k != "puantaj"} == \
+                {k: v for k, v in beklenen.items() if k != "puantaj"}
+
+
+def test_okunan_puantajlar_birbirinden_bagimsiz(calisma_klasoru):
+    kolon_depo.yaz(_veri(), "veri.bin")
+    okunan = kolon_depo.oku("veri.bin")
+
+    okunan["1"][1]["puantaj"].append({"gun": 1, "durum": "D", "saat": 0})
+
+    assert okunan["1"][1]["puantaj"].tolist() == [{"gun": 1, "durum": "D", "saat": 0}]
+    assert okunan["1"][0]["puantaj"][0] == {"gun": 1, "durum": "C", "saat": 0}
+    assert len(okunan["2"][0]["puantaj"]) == 31
+
+
+@pytest.mark.parametrize("kes", [3, 9, 20, -1])
+def test_yarim_dosya_reddedilir(calisma_klasoru, kes):
+    kolon_depo.yaz(_veri(), "veri.bin")
+    with open("veri.bin", "rb") as f:
+        icerik = f.read()
+    with open("veri.bin", "wb") as f:
+        f.write(icerik[:kes])
+
+    with pytest.raises(ValueError):
+        kolon_depo.oku("veri.bin")
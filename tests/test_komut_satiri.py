@@ -0,0 +1,51 @@
+"""Menüsüz komut satırı: yazım sırası ve depo kullanımı"""
+import json
+
+import pytest
+
+import komut_satiri
+import maas
+from conftest import yeni_kayit
+
+
+def _calistir(capsys, *argv):
+    kod = komut_satiri.calistir(list(argv))
+    return kod, capsys.readouterr().out
+
+
+def test_enter_yeni_personel_gecersiz_gunde_hicbir_sey_yazmaz(bicim, capsys):
+    kod, _ = _calistir(capsys, "enter", "--id", "7", "--ay", "2025-02", "--gun", "27-30", "--kod", "C",
+                       "--ad-soyad", "Ali Veli", "--brut-maas", "30000")
+
+    assert kod == 1
+    depo = maas.get_depo()
+    assert depo.personel_listesi() == []
+    assert depo.personel_kayitlari("7") == []
+
+
+def test_enter_yeni_personel_kaydi_gunlerle_birlikte_yazilir(bicim, capsys):
+    kod, cikti = _calistir(capsys, "enter", "--id", "7", "--ay", "2025-02", "--gun", "1-3", "--kod", "C",
+                           "--ad-soyad", "Ali Veli", "--brut-maas", "30000")
+
+    assert kod == 0
+    assert json.loads(cikti) == {"eklenen": 3, "mevcut": 0, "yeni_ay": 1}
+    kayit = maas.get_depo().ay_kaydi("7", "2025-02")
+    assert (kayit["ad_soyad"], kayit["brut_maas"], kayit["ay_gun"]) == ("Ali Veli", 30000, 28)
+    assert [p["gun"] for p in kayit["puantaj"]] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("argv", [
+    ("close", "--ay", "2025-02", "--tumu"),
+    ("report", "--ay", "2025-02", "--akis"),
+    ("export", "bordro.csv"),
+])
+def test_akisli_komutlar_depoyu_yuklemez(calisma_klasoru, capsys, monkeypatch, argv):
+    maas.write_snapshot({"1": [yeni_kayit("1", "2025-02")]})
+
+    def yuklenmemeli(*_):
+        raise AssertionError("akışlı komut depoyu yükledi")
+
+    monkeypatch.setattr(maas, "get_depo", yuklenmemeli)
+    kod, _ = _calistir(capsys, *argv)
+
+    assert kod == 0
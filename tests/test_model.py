@@ -0,0 +1,63 @@
+"""Normalize model: eski biçimle kayıpsız dönüşüm ve günlük işlemlerinin aynı sonucu vermesi"""
+import copy
+
+import pytest
+
+import maas
+import model
+from conftest import yeni_kayit
+
+
+def _veri():
+    """Model dönüşümünün kenar durumlarını içeren veri"""
+    ilk = yeni_kayit("1", "2025-01", "CCI")
+    ikinci = yeni_kayit("1", "2025-02", "CD", ad_soyad="Eski Ad")  # personel bilgisinden farklı ay
+    ikinci.update(durum="KAPATILDI", kapatma_tarihi="2025-03-01 09:00:00", surum=3, aciklama="ek alan")
+    eksik = {"id": "2", "ay": "2025-01", "brut_maas": 20000, "ay_gun": 31, "puantaj": [], "hesaplama": {},
+             "durum": "KAPATILMAMIŞ"}  # aktif ve isten_cikma_tarihi yok
+    pasif = dict(yeni_kayit("3", "2025-01", "C"), aktif=False, isten_cikma_tarihi="2025-01-01")
+    return {"1": [ilk, ikinci], "2": [eksik], "3": [pasif], "4": []}
+
+
+def test_sozluk_model_sozluk_donusumu_kayipsizdir():
+    data = _veri()
+    beklenen = copy.deepcopy(data)
+
+    calisanlar = model.calisanlara_donustur(data)
+
+    assert model.eski_bicime_donustur(calisanlar) == beklenen
+    for calisan_id, kayitlar in beklenen.items():
+        assert calisanlar[calisan_id].kayitlar() == kayitlar
+        for kayit, ay in zip(kayitlar, calisanlar[calisan_id].aylar):
+            assert ay.sozluk() == kayit
+            # Tekrar dönüştürülen kayıt da aynıdır (bool/int gibi türler korunur)
+            assert model.AyKaydi.sozlukten(calisanlar[calisan_id], ay.sozluk()).sozluk() == kayit
+
+
+ISLEMLER = [
+    {"islem": "puantaj", "id": "1", "ay": "2025-01", "gun": 4, "durum": "S", "saat": 2},
+    {"islem": "puantaj", "id": "1", "ay": "2025-01", "gun": 4, "durum": "C", "saat": 0},  # girilmiş gün
+    {"islem": "puantaj", "id": "9", "ay": "2025-01", "gun": 1, "durum": "C", "saat": 0},  # olmayan personel
+    {"islem": "personel", "id": "1", "alanlar": {"ad_soyad": "Yeni Ad"}},
+    {"islem": "personel", "id": "1", "alanlar": {"brut_maas": 35000}, "sadece_acik": True},
+    {"islem": "personel", "id": "1", "alanlar": {"aktif": False, "isten_cikma_tarihi": "2025-02-10"}},
+    {"islem": "personel", "id": "2", "alanlar": {"ad_soyad": "Ayşe", "aktif": True}, "sadece_acik": True},
+    {"islem": "personel", "id": "4", "alanlar": {"ad_soyad": "Kayıtsız"}},
+    {"islem": "ay_kaydi", "id": "1", "kayit": dict(yeni_kayit("1", "2025-01", "CCICC"), ad_soyad="İlk Ay")},
+    {"islem": "ay_kaydi", "id": "5", "kayit": yeni_kayit("5", "2025-03", "")},
+    {"islem": "ay_kayitlari", "kayitlar": [("2", yeni_kayit("2", "2025-02", "CC")),
+                                           ("3", dict(yeni_kayit("3", "2025-01", "CI"), aktif=False))]},
+    {"islem": "personel", "id": "3", "alanlar": {"aktif": True, "isten_cikma_tarihi": None}},
+]
+
+
+@pytest.mark.parametrize("adet", range(1, len(ISLEMLER) + 1))
+def test_islem_uygula_apply_journal_entry_ile_ayni(adet):
+    data = _veri()
+    calisanlar = model.calisanlara_donustur(copy.deepcopy(data))
+
+    for islem in ISLEMLER[:adet]:
+        maas.apply_journal_entry(data, copy.deepcopy(islem))
+        model.islem_uygula(calisanlar, copy.deepcopy(islem))
+
+    assert model.eski_bicime_donustur(calisanlar) == data
@@ -0,0 +1,66 @@
+"""Ölçümler: Prometheus metin biçimi"""
+import re
+
+import pytest
+
+import olcum
+
+ORNEK = re.compile(r'(?P<ad>[a-zA-Z_:][a-zA-Z0-9_:]*)\{(?P<etiket>[a-z_]+)="(?P<deger>(?:[^"\\\n]|\\[\\"n])*)"\} '
+                   r'(?P<sayi>-?[0-9.]+(?:e[+-]?[0-9]+)?)')
+
+
+@pytest.fixture
+def olcum_acik(monkeypatch):
+    monkeypatch.setattr(olcum, "ACIK", True)
+    monkeypatch.setattr(olcum, "_sureler", {})
+    monkeypatch.setattr(olcum, "_sayaclar", {})
+    monkeypatch.setattr(olcum, "_kaynaklar", {})
+
+
+def test_prometheus_metni_bicimi(olcum_acik):
+    @olcum.olc(ad='deneme."tırnaklı"\\islem')
+    def islem(hata):
+        if hata:
+            raise ValueError
+        return 1
+
+    islem(False)
+    with pytest.raises(ValueError):
+        islem(True)
+    olcum.say("dosya.okunan_bayt", 123456789)
+    olcum.kaynak_ekle("onbellek", lambda: {"isabet": 2})
+
+    metin = olcum.prometheus_metni()
+
+    assert metin.endswith("\n")
+    turler = {}
+    ornekler = {}
+    for satir in metin.rstrip("\n").split("\n"):
+        if satir.startswith("# HELP "):
+            assert len(satir.split(" ", 3)) == 4
+        elif satir.startswith("# TYPE "):
+            _, _, ad, tur = satir.split(" ")
+            turler[ad] = tur
+        else:
+            eslesme = ORNEK.fullmatch(satir)
+            assert eslesme, satir
+            assert eslesme["ad"] in turler  # TYPE satırı örneklerden önce gelir
+            ornekler[(eslesme["ad"], eslesme["deger"])] = float(eslesme["sayi"])
+
+    assert turler == {"maas_islem_cagri_total": "counter", "maas_islem_sure_saniye_total": "counter",
+                      "maas_islem_en_uzun_saniye": "gauge", "maas_islem_hata_total": "counter",
+                      "maas_sayac_total": "counter"}
+    etiket = 'deneme.\\"tırnaklı\\"\\\\islem'
+    assert ornekler[("maas_islem_cagri_total", etiket)] == 2
+    assert ornekler[("maas_islem_hata_total", etiket)] == 1
+    assert ornekler[("maas_sayac_total", "dosya.okunan_bayt")] == 123456789
+    assert ornekler[("maas_sayac_total", "onbellek.isabet")] == 2
+
+
+def test_kapaliyken_olculmez(monkeypatch):
+    monkeypatch.setattr(olcum, "ACIK", False)
+    monkeypatch.setattr(olcum, "_sureler", {})
+
+    olcum.olc(lambda: None, ad="kapali")()
+
+    assert "kapali" not in olcum.ozet()["islemler"]
@@ -0,0 +1,121 @@
+"""Aynı dosyaları kullanan birden çok oturum: kayıt anında birleştirme ve çakışma"""
+import pytest
+
+import hesaplama
+import maas
+from conftest import yeni_kayit
+
+AY = "2025-02"
+
+
+@pytest.fixture
+def oturumlar(calisma_klasoru):
+    """Aynı veriyi yüklemiş iki oturum"""
+    maas.write_snapshot({"1": [yeni_kayit("1", AY, "CC")]})
+    return maas.DosyaDepo(), maas.DosyaDepo()
+
+
+def _gun_ekle(depo, kod):
+    kayit = depo.ay_kaydi("1", AY)
+    kayit["puantaj"] = kayit["puantaj"] + [{"gun": len(kayit["puantaj"]) + 1, "durum": kod, "saat": 0}]
+    return kayit
+
+
+def test_farkli_alan_degisiklikleri_birlesir(oturumlar):
+    a, b = oturumlar
+    a_kaydi = dict(a.ay_kaydi("1", AY), brut_maas=40000)
+    b_kaydi = dict(b.ay_kaydi("1", AY), ad_soyad="Yeni Ad")
+
+    assert a.ay_kaydi_yaz("1", a_kaydi)
+    assert b.ay_kaydi_yaz("1", b_kaydi)
+
+    kayit = maas.DosyaDepo().ay_kaydi("1", AY)
+    assert (kayit["brut_maas"], kayit["ad_soyad"]) == (40000, "Yeni Ad")
+    assert kayit == a.ay_kaydi("1", AY) == b.ay_kaydi("1", AY)
+
+
+def test_iki_oturumun_ekledigi_gunler_birlesir(oturumlar):
+    a, b = oturumlar
+    a_kaydi = a.ay_kaydi("1", AY)
+    a_kaydi["puantaj"] = a_kaydi["puantaj"] + [{"gun": 3, "durum": "C", "saat": 0}]
+    b_kaydi = b.ay_kaydi("1", AY)
+    b_kaydi["puantaj"] = b_kaydi["puantaj"] + [{"gun": 4, "durum": "I", "saat": 0}]
+
+    assert a.ay_kaydi_yaz("1", a_kaydi)
+    assert b.ay_kaydi_yaz("1", b_kaydi)
+
+    assert [p["gun"] for p in maas.DosyaDepo().ay_kaydi("1", AY)["puantaj"]] == [1, 2, 3, 4]
+
+
+def test_ayni_alan_farkli_degistirilirse_cakisir(oturumlar, capsys):
+    a, b = oturumlar
+    a_kaydi = dict(a.ay_kaydi("1", AY), brut_maas=40000)
+    b_kaydi = dict(b.ay_kaydi("1", AY), brut_maas=45000)
+    assert a.ay_kaydi_yaz("1", a_kaydi)
+
+    assert not b.ay_kaydi_yaz("1", b_kaydi)
+
+    assert "başka bir kullanıcı" in capsys.readouterr().out
+    assert maas.DosyaDepo().ay_kaydi("1", AY)["brut_maas"] == 40000
+
+
+def test_ayni_gun_farkli_kodla_girilirse_cakisir(oturumlar):
+    a, b = oturumlar
+    a_kaydi, b_kaydi = _gun_ekle(a, "C"), _gun_ekle(b, "D")
+    assert a.ay_kaydi_yaz("1", a_kaydi)
+
+    assert not b.ay_kaydi_yaz("1", b_kaydi)
+    assert [p["durum"] for p in maas.DosyaDepo().ay_kaydi("1", AY)["puantaj"]] == ["C", "C", "C"]
+
+
+def test_eski_puantajla_yapilan_hesaplama_cakisir(oturumlar):
+    a, b = oturumlar
+    b_kaydi = b.ay_kaydi("1", AY)
+    assert a.ay_kaydi_yaz("1", _gun_ekle(a, "D"))
+
+    b_kaydi.update(hesaplama=hesaplama.hesapla(b_kaydi), durum="KAPATILDI")
+    assert not b.ay_kaydi_yaz("1", b_kaydi)
+    assert maas.DosyaDepo().ay_kaydi("1", AY)["durum"] == "KAPATILMAMIŞ"
+
+
+def test_toplu_yazimda_cakisma_hicbir_kaydi_yazmaz(oturumlar):
+    a, b = oturumlar
+    a_kaydi = dict(a.ay_kaydi("1", AY), brut_maas=40000)
+    b_kaydi = dict(b.ay_kaydi("1", AY), brut_maas=1)
+    assert a.ay_kaydi_yaz("1", a_kaydi)
+
+    assert not b.ay_kayitlarini_yaz([("2", yeni_kayit("2", AY)), ("1", b_kaydi)])
+    assert maas.DosyaDepo().personel_kayitlari("2") == []
+
+
+def test_ayni_gunun_girisi_korunur(oturumlar, capsys):
+    a, b = oturumlar
+    assert a.puantaj_ekle("1", AY, {"gun": 3, "durum": "C", "saat": 0})
+
+    assert b.puantaj_ekle("1", AY, {"gun": 3, "durum": "D", "saat": 0})
+
+    assert "mevcut giriş korundu" in capsys.readouterr().out
+    assert maas.DosyaDepo().ay_kaydi("1", AY)["puantaj"][2]["durum"] == "C"
+
+
+def test_ayni_ay_iki_oturumda_acilirsa_mevcut_kayit_kullanilir(calisma_klasoru):
+    a, b, c = maas.DosyaDepo(), maas.DosyaDepo(), maas.DosyaDepo()
+    assert a.ay_kaydi_yaz("1", yeni_kayit("1", AY, "C"))
+
+    # Boş yeni kayıt mevcut kaydın üzerine yazılmaz; puantajlı olan çakışır
+    assert b.ay_kaydi_yaz("1", yeni_kayit("1", AY, ""))
+    assert not c.ay_kaydi_yaz("1", yeni_kayit("1", AY, "D"))
+    assert [p["durum"] for p in maas.DosyaDepo().ay_kaydi("1", AY)["puantaj"]] == ["C"]
+
+
+def test_merge_ay_kaydi():
+    taban = dict(yeni_kayit("1", AY, "CC"), surum=1)
+    guncel = dict(taban, brut_maas=40000, puantaj=taban["puantaj"] + [{"gun": 3, "durum": "I", "saat": 0}],
+                  surum=2)
+    yeni = dict(taban, ad_soyad="Yeni Ad", puantaj=taban["puantaj"] + [{"gun": 4, "durum": "C", "saat": 0}])
+
+    birlesik = maas.merge_ay_kaydi(taban, yeni, guncel)
+
+    assert (birlesik["brut_maas"], birlesik["ad_soyad"], birlesik["surum"]) == (40000, "Yeni Ad", 2)
+    assert [p["gun"] for p in birlesik["puantaj"]] == [1, 2, 3, 4]
+    assert maas.merge_ay_kaydi(taban, dict(yeni, brut_maas=1), guncel) is None
@@ -0,0 +1,61 @@
+"""Çok aylı rapor motoru: kapatılmış ay parçalarının önbelleği"""
+import pytest
+
+import hesaplama
+import raporlama
+from conftest import yeni_kayit
+
+
+def _kapali(calisan_id, ay, brut_maas=30000):
+    kayit = yeni_kayit(calisan_id, ay, brut_maas=brut_maas)
+    kayit.update(hesaplama=hesaplama.hesapla(kayit), durum="KAPATILDI", kapatma_tarihi="2025-03-01 09:00:00")
+    return kayit
+
+
+def test_kapali_ay_onbellekten_gelir_ozet_degisince_yeniden_okunur(depo):
+    assert depo.ay_kayitlarini_yaz([("1", _kapali("1", "2025-01")), ("2", _kapali("2", "2025-01", 62000)),
+                                    ("1", yeni_kayit("1", "2025-02", "CC"))])
+    motor = raporlama.RaporMotoru(depo)
+
+    _, toplam = motor.rapor(["2025-01", "2025-02"])
+    assert (motor.isabet, motor.iska) == (0, 2)
+    assert toplam["toplam_net_maas"] == 92000
+
+    _, toplam = motor.rapor(["2025-01", "2025-02"])
+    # Açık kaydı olan ay önbelleğe alınmaz
+    assert (motor.isabet, motor.iska) == (1, 3)
+    assert toplam["toplam_net_maas"] == 92000
+
+    # Kapatılmış kayıt değişince ay özeti değişir, parça yeniden okunur
+    assert depo.ay_kaydi_yaz("2", _kapali("2", "2025-01", 31000))
+    _, toplam = motor.rapor(["2025-01"])
+    assert (motor.isabet, motor.iska) == (1, 4)
+    assert toplam["toplam_net_maas"] == 61000
+
+
+def test_ad_degisikligi_onbellekteki_ayda_da_gorunur(depo):
+    assert depo.ay_kaydi_yaz("1", _kapali("1", "2025-01"))
+    motor = raporlama.motor(depo)
+    motor.rapor(["2025-01"])
+
+    assert depo.personel_guncelle("1", {"ad_soyad": "Yeni Ad"})
+    satirlar, _ = motor.rapor(["2025-01"])
+
+    assert motor.isabet == 1
+    assert [satir["ad_soyad"] for satir in satirlar] == ["Yeni Ad"]
+
+
+def test_onbellek_sinirli(depo):
+    assert depo.ay_kayitlarini_yaz([("1", _kapali("1", f"2024-{ay:02d}")) for ay in range(1, 5)])
+    motor = raporlama.RaporMotoru(depo, onbellek_ay_sayisi=2)
+
+    motor.rapor(raporlama.ay_araligi("2024-01", "2024-04"))
+
+    assert list(motor._parcalar) == ["2024-03", "2024-04"]
+
+
+def test_donem_aylari():
+    assert raporlama.donem_aylari("2025-Q4") == ["2025-10", "2025-11", "2025-12"]
+    assert len(raporlama.donem_aylari("2024")) == 12
+    with pytest.raises(ValueError):
+        raporlama.donem_aylari("2025-Q5")
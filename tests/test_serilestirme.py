@@ -0,0 +1,56 @@
+"""JSON serileştirme: her kütüphane standart json ile aynı baytları üretir"""
+import pytest
+
+import kolon_depo
+import serilestirme
+
+NESNE = {
+    "id": "42",
+    "ad_soyad": "Şükrü Çağlayan Öztürk",
+    "brut_maas": 31250.75,
+    "ay_gun": 31,
+    "aktif": True,
+    "isten_cikma_tarihi": None,
+    "hesaplama": {"net_maas": 29876.5, "saatlik_kesinti": 0.01, "yarim_gun": 0},
+    "puantaj": kolon_depo.PuantajDizisi([{"gun": 2, "durum": "S", "saat": 3}, {"gun": 1, "durum": "C", "saat": 0}]),
+    "bos": [{}, []],
+    "kacis": "tırnak \" ters \\ satır\nsekme\t",
+}
+
+
+@pytest.fixture
+def kutuphane():
+    onceki = serilestirme.KUTUPHANE
+    yield serilestirme.kutuphane_sec
+    serilestirme.kutuphane_sec(onceki)
+
+
+def _dumps(kutuphane_sec, ad, **secenekler):
+    kutuphane_sec(ad)
+    return serilestirme.dumps(NESNE, default=kolon_depo.json_default, **secenekler)
+
+
+@pytest.mark.parametrize("ad", ["orjson", "msgspec"])
+@pytest.mark.parametrize("girintili", [False, True])
+@pytest.mark.parametrize("sirali", [False, True])
+def test_kutuphaneler_ayni_baytlari_uretir(kutuphane, ad, girintili, sirali):
+    pytest.importorskip(ad)
+
+    beklenen = _dumps(kutuphane, "json", girintili=girintili, sirali=sirali)
+
+    assert _dumps(kutuphane, ad, girintili=girintili, sirali=sirali) == beklenen
+    assert serilestirme.loads(beklenen) == serilestirme.loads(beklenen.decode("utf-8"))
+
+
+@pytest.mark.parametrize("ad", serilestirme.KUTUPHANELER)
+def test_cozme_hatasi_value_error(kutuphane, ad):
+    pytest.importorskip(ad)
+    kutuphane(ad)
+
+    with pytest.raises(ValueError):
+        serilestirme.loads(b'{"yarim": ')
+
+
+def test_bilinmeyen_kutuphane(kutuphane):
+    with pytest.raises(ValueError):
+        kutuphane("simplejson")
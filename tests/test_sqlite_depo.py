@@ -0,0 +1,45 @@
+"""JSON dosyasından SQLite veritabanına geçiş"""
+import builtins
+import json
+
+import pytest
+
+import maas
+import sqlite_depo
+from conftest import yeni_kayit
+
+
+def _soru_sorma(monkeypatch):
+    def sor(*args):
+        raise AssertionError("geçiş sırasında kullanıcıya soru soruldu")
+    monkeypatch.setattr(builtins, "input", sor)
+
+
+def test_json_gunlukle_birlikte_aktarilir(calisma_klasoru, monkeypatch):
+    _soru_sorma(monkeypatch)
+    (calisma_klasoru / "eski").mkdir()
+    with open("eski/veri.json", "w", encoding="utf-8") as f:
+        json.dump({"1": [yeni_kayit("1", "2025-02", "C")]}, f)
+    with open("eski/puantaj_kayitlari.journal", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"islem": "puantaj", "id": "1", "ay": "2025-02", "gun": 2, "durum": "I", "saat": 0}) + "\n")
+
+    assert sqlite_depo.json_to_sqlite("eski/veri.json", "veri.db") == 1
+
+    # Ana dosyanın ve günlüğün global yolları değişmez
+    assert (maas.DATA_FILE, maas.STORAGE_FORMAT) == ("puantaj_kayitlari.json", "json")
+    depo = sqlite_depo.SqliteDepo("veri.db")
+    try:
+        assert [p["durum"] for p in depo.ay_kaydi("1", "2025-02")["puantaj"]] == ["C", "I"]
+    finally:
+        depo.kapat()
+
+
+@pytest.mark.parametrize("icerik", [None, "{bozuk"])
+def test_okunamayan_json_hata_verir(calisma_klasoru, monkeypatch, icerik):
+    _soru_sorma(monkeypatch)
+    if icerik is not None:
+        with open("veri.json", "w", encoding="utf-8") as f:
+            f.write(icerik)
+
+    with pytest.raises((ValueError, IOError)):
+        sqlite_depo.json_to_sqlite("veri.json", "veri.db")
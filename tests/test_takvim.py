@@ -0,0 +1,49 @@
+"""Takvim servisi: ay uzunlukları, artık yıllar, hafta günleri ve tatiller"""
+import calendar
+
+import pytest
+
+import maas
+import takvim
+
+
+@pytest.mark.parametrize("ay, gun_sayisi", [
+    ("2025-01", 31), ("2025-02", 28), ("2025-04", 30), ("2025-12", 31),
+    ("2024-02", 29), ("2000-02", 29), ("1900-02", 28), ("2100-02", 28),
+])
+def test_ay_gun_sayisi(calisma_klasoru, ay, gun_sayisi):
+    assert takvim.ay_gun_sayisi(ay) == gun_sayisi
+    assert takvim.ay_takvimi(ay).gun_sayisi == gun_sayisi
+    assert maas.get_month_days(ay) == gun_sayisi
+
+
+def test_bir_yilin_tum_aylari(calisma_klasoru):
+    for yil in (2023, 2024):
+        for ay_no in range(1, 13):
+            ay = f"{yil}-{ay_no:02d}"
+            assert takvim.ay_gun_sayisi(ay) == calendar.monthrange(yil, ay_no)[1]
+
+
+@pytest.mark.parametrize("ay", ["2025-13", "2025-00", "2025-2-1", "25-01", "", "2025/01"])
+def test_gecersiz_ay(calisma_klasoru, ay):
+    assert not takvim.gecerli_ay_mi(ay)
+    with pytest.raises(ValueError):
+        takvim.ay_gun_sayisi(ay)
+
+
+def test_hafta_gunleri_ve_tatiller(calisma_klasoru):
+    mayis = takvim.ay_takvimi("2025-05")
+
+    assert mayis.hafta_gunleri[0] == 3  # 1 Mayıs 2025 Perşembe
+    assert [gun for gun in range(1, 32) if mayis.haftasonu_mu(gun)][:2] == [3, 4]
+    assert mayis.tatil_mi(1) and mayis.tatil_mi(19) and not mayis.tatil_mi(2)
+    assert takvim.ay_takvimi("2025-05") is mayis
+
+
+def test_ay_uzunlugu_politikadan_bagimsiz(calisma_klasoru):
+    with open(takvim.POLITIKA_DOSYASI, "w", encoding="utf-8") as f:
+        f.write("{bozuk")
+
+    assert takvim.ay_gun_sayisi("2024-02") == 29
+    with pytest.raises(ValueError):
+        takvim.ay_takvimi("2024-02")
@@ -0,0 +1,53 @@
+"""Yedek deposu: parçalı yedekler ve eski tam kopya yedeklerin içeri alınması"""
+import json
+import os
+
+import maas
+from conftest import yeni_kayit
+
+
+def test_eski_yedekler_iceri_alinir_ve_sonraki_yedek_alinir(calisma_klasoru):
+    eski = {"1": [yeni_kayit("1", "2025-01")], "2": [yeni_kayit("2", "2025-01", "CI")]}
+    os.makedirs(maas.BACKUP_FOLDER)
+    eski_yol = os.path.join(maas.BACKUP_FOLDER, "puantaj_backup_20250101_120000.json")
+    with open(eski_yol, "w", encoding="utf-8") as f:
+        json.dump(eski, f)
+    maas.write_snapshot({"1": [yeni_kayit("1", "2025-02")]})
+
+    assert maas.create_backup()
+
+    yedekler = maas.list_backups()
+    assert [yedek["zaman"] for yedek in yedekler[1:]] == ["2025-01-01 12:00:00"]
+    assert not os.path.exists(eski_yol)
+    assert maas.read_backup(yedekler[1]) == eski
+    assert maas.read_backup(yedekler[0]) == {"1": [yeni_kayit("1", "2025-02")]}
+
+
+def test_ayni_icerik_tekrar_yedeklenmez(calisma_klasoru):
+    maas.write_snapshot({"1": [yeni_kayit("1", "2025-02")]})
+
+    assert maas.create_backup()
+    assert maas.create_backup()
+
+    assert len(maas.list_backups()) == 1
+
+
+def _yedek_al(klasor, numara):
+    os.chdir(klasor)
+    for tur in range(5):
+        assert maas.create_backup({str(numara): [yeni_kayit(str(numara), "2025-02", "C" * (tur + 1))]})
+
+
+def test_eszamanli_yedekler_dizinden_kaybolmaz(calisma_klasoru, monkeypatch):
+    import multiprocessing
+
+    monkeypatch.setitem(maas.BACKUP_RETENTION, "son", 100)
+    baglam = multiprocessing.get_context("spawn" if os.name == "nt" else "fork")
+    surecler = [baglam.Process(target=_yedek_al, args=(str(calisma_klasoru), numara)) for numara in range(4)]
+    for surec in surecler:
+        surec.start()
+    for surec in surecler:
+        surec.join()
+
+    assert [surec.exitcode for surec in surecler] == [0] * 4
+    assert len(maas.list_backups()) == 20